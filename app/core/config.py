@@ -1,8 +1,6 @@
-from decouple import config
+from decouple import Csv, config
 from typing import Optional
 import os
-import google.generativeai as genai
-import openai
 
 # Pydantic BaseSettings를 사용하는 것이 표준이지만, 
 # 여기서는 기존 Django 프로젝트의 decouple 사용 패턴을 유지하며 클래스로 설정값을 모읍니다.
@@ -22,28 +20,88 @@ class Settings:
     # --- 데이터베이스 설정 (마일스톤 1.3에서 사용 예정) ---
     # 기존 SQLite를 임시로 사용하거나 PostgreSQL 연결 문자열을 준비합니다.
     DATABASE_URL: str = config("DATABASE_URL", default="sqlite:///./test.db")
+    # 실행되는 SQL을 콘솔에 출력할지 여부 (운영에서는 끄는 것을 권장)
+    DB_ECHO: bool = config("DB_ECHO", default=False, cast=bool)
+    # PostgreSQL(asyncpg) 커넥션 풀 설정
+    DB_POOL_SIZE: int = config("DB_POOL_SIZE", default=10, cast=int)
+    DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", default=20, cast=int)
+    DB_POOL_TIMEOUT: float = config("DB_POOL_TIMEOUT", default=10.0, cast=float)
+    DB_POOL_RECYCLE: int = config("DB_POOL_RECYCLE", default=1800, cast=int)
+    # write-behind 저장 큐: 한 번에 커밋할 최대 레코드 수, 첫 레코드 이후 최대 대기 시간(ms)
+    DB_WRITE_BATCH_SIZE: int = config("DB_WRITE_BATCH_SIZE", default=64, cast=int)
+    DB_WRITE_MAX_DELAY_MS: float = config("DB_WRITE_MAX_DELAY_MS", default=50.0, cast=float)
+    # 유사 이미지 검색: 이 개수 이상이면 IVF 분할 검색 사용 (0이면 항상 전수 비교), 검색할 분할 수
+    SIMILARITY_IVF_MIN_SIZE: int = config("SIMILARITY_IVF_MIN_SIZE", default=20000, cast=int)
+    SIMILARITY_IVF_NPROBE: int = config("SIMILARITY_IVF_NPROBE", default=8, cast=int)
+    # 근접 중복 사진: dHash(64비트) 해밍 거리가 이 값 이하이면 기존 사진의 캡션/일기를 재사용 (음수면 사용 안 함)
+    PHASH_MAX_DISTANCE: int = config("PHASH_MAX_DISTANCE", default=6, cast=int)
+    # 1인 비트(또는 0인 비트)가 이 값 미만인 해시는 단색/저대비 사진이므로 근접 중복을 찾지 않음
+    PHASH_MIN_INFORMATIVE_BITS: int = config("PHASH_MIN_INFORMATIVE_BITS", default=8, cast=int)
+    # 일기/태그까지 재사용하는 해밍 거리 (캡션 재사용 기준보다 엄격하게)
+    PHASH_DIARY_MAX_DISTANCE: int = config("PHASH_DIARY_MAX_DISTANCE", default=2, cast=int)
+    # 일별/월별 일기 집계의 날짜 기준 시간대 (저장 시각은 UTC)
+    DIARY_TIMEZONE: str = config("DIARY_TIMEZONE", default="Asia/Seoul")
+    # SQLite PRAGMA 설정: 잠금 대기 시간(ms), 메모리 매핑 크기(바이트)
+    SQLITE_BUSY_TIMEOUT_MS: int = config("SQLITE_BUSY_TIMEOUT_MS", default=5000, cast=int)
+    SQLITE_MMAP_SIZE: int = config("SQLITE_MMAP_SIZE", default=268435456, cast=int)
 
+    # --- LLM 제공자 및 라우팅 설정 ---
+    # base URL을 바꾸면 로컬 스텁 서버 등 호환 엔드포인트로 요청을 보낼 수 있습니다.
+    CHATGPT_MODEL: str = config("CHATGPT_MODEL", default="gpt-3.5-turbo")
+    GEMINI_MODEL: str = config("GEMINI_MODEL", default="gemini-1.5-flash")
+    OPENAI_BASE_URL: Optional[str] = config("OPENAI_BASE_URL", default=None)
+    GEMINI_BASE_URL: str = config(
+        "GEMINI_BASE_URL", default="https://generativelanguage.googleapis.com"
+    )
+    # 요청 1건당 LLM 호출 전체(헤징 포함)에 허용하는 최대 시간(초)
+    LLM_DEADLINE_SECONDS: float = config("LLM_DEADLINE_SECONDS", default=20.0, cast=float)
+    # 첫 요청이 이 시간(표본이 쌓이면 최근 p95)을 넘기면 다른 제공자로 헤지 요청을 보냅니다.
+    LLM_HEDGE_DEFAULT_DELAY: float = config("LLM_HEDGE_DEFAULT_DELAY", default=4.0, cast=float)
+    LLM_HEDGE_MIN_DELAY: float = config("LLM_HEDGE_MIN_DELAY", default=0.5, cast=float)
+    LLM_HEDGE_MAX_DELAY: float = config("LLM_HEDGE_MAX_DELAY", default=10.0, cast=float)
+    # 캡션 개선 프롬프트 버전 (app/services/prompts.py 레지스트리). 생략 시 최신 버전
+    REFINE_PROMPT_VERSION: Optional[str] = config("REFINE_PROMPT_VERSION", default=None)
+    # 대량 생성(앨범 가져오기/백필) 시 한 요청에 묶을 항목 수, 동시 요청 수, 배치 1건의 데드라인(초)
+    LLM_BATCH_SIZE: int = config("LLM_BATCH_SIZE", default=8, cast=int)
+    LLM_BATCH_CONCURRENCY: int = config("LLM_BATCH_CONCURRENCY", default=4, cast=int)
+    LLM_BATCH_DEADLINE_SECONDS: float = config("LLM_BATCH_DEADLINE_SECONDS", default=60.0, cast=float)
+    # BLIP 캡션(영어) → 한국어 번역 방식
+    # "openvino": 로컬 번역 모델(captioning_module/translator.py), "llm": ChatGPT 호출, "none": 번역하지 않음
+    TRANSLATION_BACKEND: str = config("TRANSLATION_BACKEND", default="none")
+    # /diary/에 conditional_captions=true로 요청하면 기본 캡션과 함께 생성할 BLIP 조건부 캡션 접두어 (쉼표 구분)
+    # 비전 인코더는 한 번만 실행하지만 접두어마다 디코더 배치 행이 늘어나므로 기본으로는 만들지 않습니다.
+    BLIP_CONDITIONAL_PROMPTS: list = config(
+        "BLIP_CONDITIONAL_PROMPTS", default="the mood is,people in the photo are", cast=Csv()
+    )
+    # 요청 1건의 종단 간 마감 시간(초). 클라이언트는 X-Request-Deadline-Ms 헤더로 더 짧게 줄 수 있습니다.
+    REQUEST_DEADLINE_SECONDS: float = config("REQUEST_DEADLINE_SECONDS", default=30.0, cast=float)
+    # 서킷 브레이커: 연속 실패(또는 느린 호출) 횟수 임계값, 느린 호출 기준(초), open 유지 시간(초)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = config("LLM_BREAKER_FAILURE_THRESHOLD", default=5, cast=int)
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = config("LLM_BREAKER_SLOW_CALL_SECONDS", default=15.0, cast=float)
+    LLM_BREAKER_RESET_SECONDS: float = config("LLM_BREAKER_RESET_SECONDS", default=30.0, cast=float)
+    # 지연/오류율 통계를 유지할 최근 호출 개수
+    LLM_STATS_WINDOW: int = config("LLM_STATS_WINDOW", default=50, cast=int)
 
-# 설정 인스턴스 생성
-settings = Settings()
+    # --- LLM HTTP 커넥션 풀 설정 ---
+    # 모든 LLM 클라이언트(OpenAI, Gemini)가 하나의 풀을 공유합니다. HTTP/2는 'h2' 패키지가 필요합니다.
+    LLM_HTTP2: bool = config("LLM_HTTP2", default=True, cast=bool)
+    LLM_HTTP_MAX_CONNECTIONS: int = config("LLM_HTTP_MAX_CONNECTIONS", default=100, cast=int)
+    LLM_HTTP_MAX_KEEPALIVE: int = config("LLM_HTTP_MAX_KEEPALIVE", default=20, cast=int)
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = config("LLM_HTTP_KEEPALIVE_EXPIRY", default=120.0, cast=float)
+    LLM_HTTP_CONNECT_TIMEOUT: float = config("LLM_HTTP_CONNECT_TIMEOUT", default=5.0, cast=float)
+    LLM_HTTP_READ_TIMEOUT: float = config("LLM_HTTP_READ_TIMEOUT", default=60.0, cast=float)
+    # 서버 시작 시 호스트별로 미리 열어 둘 연결 수 (HTTP/2에서는 1개로 충분)
+    LLM_HTTP_WARM_CONNECTIONS: int = config("LLM_HTTP_WARM_CONNECTIONS", default=2, cast=int)
+    # 유휴 연결이 끊기지 않도록 주기적으로 보내는 keep-alive 요청 간격(초). 0이면 사용하지 않음
+    LLM_HTTP_KEEPALIVE_INTERVAL: float = config("LLM_HTTP_KEEPALIVE_INTERVAL", default=30.0, cast=float)
 
-# --- LLM 클라이언트 초기화 (초기화 로직도 core에 포함) ---
-# 기존 views.py의 초기화 로직을 그대로 옮겨옵니다.
-try:
-    if settings.GEMINI_API_KEY:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        print("Gemini API configured successfully.")
-    else:
-        print("Warning: GEMINI_API_KEY not found.")
-except Exception as e:
-    print(f"Error configuring Gemini API: {e}")
 
-try:
-    if settings.CHATGPT_API_KEY:
-        openai.api_key = settings.CHATGPT_API_KEY
-        print("ChatGPT API configured successfully.")
-    else:
-        print("Warning: CHATGPT_API_KEY not found.")
-except Exception as e:
-    print(f"Error configuring ChatGPT API: {e}")
+# 설정 인스턴스 생성
+settings = Settings()
 
+# --- LLM API 키 확인 ---
+# 제공자 SDK(google.generativeai, openai)는 import만으로 수백 ms와 수십 MB가 들기 때문에 여기서 import 하지 않습니다.
+# 클라이언트는 키를 직접 넘겨 만들므로(app/services/llm_service.py) 전역 SDK 설정도 필요 없습니다.
+for _name in ("GEMINI_API_KEY", "CHATGPT_API_KEY"):
+    if not getattr(settings, _name):
+        print(f"Warning: {_name} not found.")
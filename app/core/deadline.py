@@ -0,0 +1,64 @@
+# app/core/deadline.py
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# 요청 처리 전체에 허용된 마감 시각 (time.monotonic 기준). None이면 마감 없음
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# 클라이언트가 남은 시간(밀리초)을 전달할 때 사용하는 헤더
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+
+class DeadlineExceededError(Exception):
+    """요청의 종단 간(end-to-end) 마감 시간이 이미 지났을 때 발생합니다."""
+
+
+def set_request_deadline(seconds: Optional[float]):
+    """
+    현재 요청 컨텍스트에 마감 시간을 설정하고, reset에 사용할 토큰을 반환합니다.
+    """
+    deadline_at = time.monotonic() + seconds if seconds is not None else None
+    return _request_deadline.set(deadline_at)
+
+
+def reset_request_deadline(token) -> None:
+    _request_deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """현재 요청의 남은 시간(초). 마감이 설정되지 않았으면 None"""
+    deadline_at = _request_deadline.get()
+    if deadline_at is None:
+        return None
+    return deadline_at - time.monotonic()
+
+
+def budget(limit: float) -> float:
+    """
+    하위 호출(LLM 등)에 줄 타임아웃(초)을 계산합니다.
+    요청 마감까지 남은 시간과 호출별 상한(limit) 중 작은 값이며, 이미 지났으면 즉시 실패합니다.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return limit
+    if remaining <= 0:
+        raise DeadlineExceededError("요청 마감 시간이 지났습니다.")
+    return min(limit, remaining)
+
+
+def parse_deadline_header(value: Optional[str], default: float) -> float:
+    """
+    X-Request-Deadline-Ms 헤더 값을 초 단위로 변환합니다.
+    헤더가 없거나 잘못된 값이면 서버 기본값(default)을 사용하고, 기본값보다 길게는 허용하지 않습니다.
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value) / 1000
+    except ValueError:
+        return default
+    if seconds <= 0:
+        return default
+    return min(seconds, default)
@@ -0,0 +1,180 @@
+# app/core/http_pool.py
+
+import asyncio
+import importlib.util
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import httpx
+
+from app.core.config import settings
+
+# HTTP/2는 선택 의존성인 'h2' 패키지가 설치된 경우에만 활성화합니다.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _use_http2() -> bool:
+    if settings.LLM_HTTP2 and not HTTP2_AVAILABLE:
+        print("Warning: LLM_HTTP2 is enabled but 'h2' is not installed. Falling back to HTTP/1.1.")
+    return settings.LLM_HTTP2 and HTTP2_AVAILABLE
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.LLM_HTTP_READ_TIMEOUT,
+        connect=settings.LLM_HTTP_CONNECT_TIMEOUT,
+    )
+
+
+class LlmHttpPool:
+    """
+    모든 비동기 LLM 클라이언트가 공유하는 httpx 커넥션 풀입니다.
+
+    FastAPI lifespan에서 open → warm_up → start_keepalive 순으로 준비하고,
+    종료 시 close로 정리합니다. 미리 TCP/TLS(+HTTP/2) 연결을 맺어 두므로
+    첫 LLM 호출이나 유휴 후 호출이 핸드셰이크 지연을 부담하지 않습니다.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        # 호스트별 마지막 응답 수신 시각 (연결이 아직 살아 있을지 판단하는 데 사용)
+        self._last_used: Dict[str, float] = {}
+        # 진행 중인 요청별 예열 작업 (작업이 끝나기 전에 GC 되지 않도록 참조를 보관)
+        self._warmup_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 AsyncClient를 반환합니다. (없으면 생성)"""
+        return self.open()
+
+    def open(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=_use_http2(),
+                limits=_limits(),
+                timeout=_timeout(),
+                event_hooks={"response": [self._touch]},
+            )
+        return self._client
+
+    async def _touch(self, response: httpx.Response) -> None:
+        self._last_used[response.url.host] = time.monotonic()
+
+    async def ensure_warm(self, urls: Iterable[str]) -> None:
+        """
+        최근에 사용되지 않은 호스트만 골라 예열합니다.
+        요청 처리 중 다른 작업(BLIP 추론 등)과 겹쳐 실행하기 위한 용도입니다.
+        """
+        stale_after = settings.LLM_HTTP_KEEPALIVE_EXPIRY / 2
+        now = time.monotonic()
+        stale = [
+            url
+            for url in urls
+            if now - self._last_used.get(httpx.URL(url).host, 0.0) > stale_after
+        ]
+        if stale:
+            await self.warm_up(stale)
+
+    def warm_in_background(self, urls: Iterable[str]) -> asyncio.Task:
+        """
+        ensure_warm을 백그라운드 작업으로 시작합니다. 요청 처리는 이 작업을 기다리지 않으며,
+        예열이 아직 끝나지 않았으면 LLM 호출은 풀의 다른 연결(또는 새 연결)을 사용합니다.
+        """
+        task = asyncio.create_task(self.ensure_warm(list(urls)))
+        self._warmup_tasks.add(task)
+        task.add_done_callback(self._warmup_done)
+        return task
+
+    def _warmup_done(self, task: asyncio.Task) -> None:
+        self._warmup_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"LLM connection warm-up failed: {task.exception()}")
+
+    async def _ping(self, url: str) -> bool:
+        """HEAD 요청 하나로 연결을 열거나 유지합니다. 실패만 출력하고, 성공 여부를 반환합니다."""
+        try:
+            await self.open().head(url, timeout=settings.LLM_HTTP_CONNECT_TIMEOUT)
+        except httpx.HTTPError as e:
+            print(f"LLM connection to {url} failed: {e}")
+            return False
+        return True
+
+    async def warm_up(self, urls: Iterable[str]) -> None:
+        """
+        각 호스트에 가벼운 HEAD 요청을 보내 연결(TCP + TLS)을 미리 열어 둡니다.
+        응답 상태 코드는 중요하지 않으며, 실패해도 서버 기동을 막지 않습니다.
+        """
+        targets: List[str] = []
+        for url in urls:
+            targets.extend([url] * max(settings.LLM_HTTP_WARM_CONNECTIONS, 1))
+        if not targets:
+            return
+        await asyncio.gather(*(self._ping(url) for url in targets))
+        print(f"LLM HTTP pool warmed up: {sorted(set(targets))}")
+
+    def start_keepalive(self, urls: Iterable[str]) -> None:
+        """
+        keep-alive 만료 전에 주기적으로 연결을 사용해 유휴 연결이 끊기지 않게 합니다.
+        호스트당 HEAD 요청 하나만 보내고, 실패한 경우에만 출력합니다.
+        """
+        interval = settings.LLM_HTTP_KEEPALIVE_INTERVAL
+        urls = list(urls)
+        if interval <= 0 or not urls or self._keepalive_task is not None:
+            return
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.gather(*(self._ping(url) for url in urls))
+
+        self._keepalive_task = asyncio.create_task(loop())
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 프로세스 전역 풀 인스턴스 (FastAPI)
+llm_http_pool = LlmHttpPool()
+
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_sync_http_client() -> httpx.Client:
+    """
+    동기 코드(Django views.py)에서 사용하는 공유 httpx.Client를 반환합니다.
+    비동기 풀과 같은 제한/타임아웃 설정을 사용합니다.
+    """
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            http2=_use_http2(),
+            limits=_limits(),
+            timeout=_timeout(),
+        )
+    return _sync_client
+
+
+def new_async_http_client() -> httpx.AsyncClient:
+    """
+    공유 풀과 같은 제한/타임아웃/HTTP2 설정으로 새 httpx.AsyncClient를 만듭니다.
+    비동기 커넥션 풀은 이벤트 루프에 묶이므로, 루프마다 클라이언트가 필요한 곳(Django 비동기 뷰)에서 사용합니다.
+    """
+    return httpx.AsyncClient(
+        http2=_use_http2(),
+        limits=_limits(),
+        timeout=_timeout(),
+    )
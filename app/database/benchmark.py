@@ -0,0 +1,161 @@
+# app/database/benchmark.py
+"""
+저장소 프로필별 DB 쓰기/읽기 벤치마크
+
+사용법:
+    python -m app.database.benchmark                                   # 임시 SQLite 파일 (튜닝 전/후 비교)
+    python -m app.database.benchmark --url postgresql://user:pw@host/db  # PostgreSQL(asyncpg)
+    python -m app.database.benchmark --rows 2000 --concurrency 16
+
+쓰기는 행 1개당 트랜잭션 1개(create_image_data 방식)와 write-behind 큐 배치 저장 두 가지로,
+읽기는 id 단건 조회로 측정합니다.
+벤치마크가 넣은 행(file='__benchmark__')은 끝나면 삭제합니다.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.models import ImageModel
+from app.database.profiles import create_engine_for_profile, get_storage_profile
+from app.schemas.image import ImageCreate
+from app.services.crud import create_images_batch
+from app.services.write_behind import WriteBehindQueue
+
+BENCHMARK_FILE = "__benchmark__"
+
+
+def _summary(label: str, latencies: List[float], elapsed: float) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1000
+    return {
+        "label": label,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+    }
+
+
+async def _run_concurrently(count: int, concurrency: int, job) -> Tuple[List[float], float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            t0 = time.perf_counter()
+            await job(i)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(count)))
+    return latencies, time.perf_counter() - t0
+
+
+async def run_benchmark(url: str, rows: int, concurrency: int, tuned: bool) -> List[Dict[str, float]]:
+    profile = get_storage_profile(url, tuned=tuned)
+    engine = create_engine_for_profile(profile)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    ids: List[int] = []
+
+    async def write(i: int) -> None:
+        async with Session() as db:
+            image = ImageModel(
+                file=BENCHMARK_FILE,
+                refined_caption=f"벤치마크 일기 {i} " * 8,
+                blip_text="a dog running on the beach",
+                keywords="바다,강아지,산책,해변,모래,파도,여름,하늘,오후,가족",
+                file_info="benchmark",
+            )
+            db.add(image)
+            await db.commit()
+            ids.append(image.id)
+
+    async def flush(items: List[ImageCreate]) -> List[int]:
+        async with Session() as db:
+            return await create_images_batch(db, items)
+
+    queue = WriteBehindQueue(flush)
+
+    async def write_batched(i: int) -> None:
+        ids.append(
+            await queue.submit(
+                ImageCreate(
+                    file=BENCHMARK_FILE,
+                    refined_caption=f"벤치마크 일기 {i} " * 8,
+                    blip_text="a dog running on the beach",
+                    keywords="바다,강아지,산책,해변,모래,파도,여름,하늘,오후,가족",
+                    file_info="benchmark",
+                )
+            )
+        )
+
+    async def read(i: int) -> None:
+        async with Session() as db:
+            result = await db.execute(select(ImageModel).where(ImageModel.id == random.choice(ids)))
+            result.scalars().first()
+
+    try:
+        write_latencies, write_elapsed = await _run_concurrently(rows, concurrency, write)
+        queue.start()
+        batched_latencies, batched_elapsed = await _run_concurrently(rows, concurrency, write_batched)
+        await queue.close()
+        read_latencies, read_elapsed = await _run_concurrently(rows, concurrency, read)
+    finally:
+        async with Session() as db:
+            await db.execute(delete(ImageModel).where(ImageModel.file == BENCHMARK_FILE))
+            await db.commit()
+        await engine.dispose()
+
+    label = f"{profile.name} ({'tuned' if tuned else 'default'})"
+    return [
+        _summary(f"{label} write", write_latencies, write_elapsed),
+        _summary(f"{label} batched write", batched_latencies, batched_elapsed),
+        _summary(f"{label} read", read_latencies, read_elapsed),
+    ]
+
+
+def print_results(results: List[Dict[str, float]]) -> None:
+    print(f"{'workload':<36} {'ops/s':>10} {'p50(ms)':>10} {'p95(ms)':>10}")
+    for r in results:
+        print(f"{r['label']:<36} {r['ops_per_sec']:>10.1f} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f}")
+
+
+async def main_async(args) -> None:
+    results: List[Dict[str, float]] = []
+    if args.url:
+        modes = [False, True] if args.compare else [True]
+        for tuned in modes:
+            results += await run_benchmark(args.url, args.rows, args.concurrency, tuned)
+    else:
+        # SQLite는 journal_mode가 파일에 남으므로 튜닝 전/후를 서로 다른 파일로 측정합니다.
+        with tempfile.TemporaryDirectory() as tmp:
+            for tuned in (False, True):
+                url = f"sqlite:///{os.path.join(tmp, f'bench_{tuned}.db')}"
+                results += await run_benchmark(url, args.rows, args.concurrency, tuned)
+    print_results(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DB 저장소 프로필 쓰기/읽기 벤치마크")
+    parser.add_argument("--url", default=None, help="측정할 DATABASE_URL (생략 시 임시 SQLite 파일)")
+    parser.add_argument("--rows", type=int, default=500, help="쓰기/읽기 횟수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 실행 수")
+    parser.add_argument("--compare", action="store_true", help="--url 사용 시 튜닝 전/후를 함께 측정")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 # app/database/database.py
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.database.profiles import create_engine_for_profile, get_storage_profile
 import logging
 
 # 로깅 설정 (옵션)
@@ -11,16 +12,14 @@ logging.basicConfig()
 # logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
 
 # 1. 비동기 엔진 생성
-# config.py에서 정의한 DATABASE_URL(기본값: sqlite:///./test.db)을 사용합니다.
-# 비동기 처리를 위해 'sqlite' -> 'sqlite+aiosqlite'로 프로토콜을 변경합니다.
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL.replace(
-    "sqlite:///", "sqlite+aiosqlite:///"
-)
-
-# echo=True는 실행되는 SQL 쿼리를 콘솔에 출력하여 디버깅에 도움을 줍니다.
-async_engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, echo=True, future=True  # SQLAlchemy 2.0 스타일 사용
-)
+# config.py에서 정의한 DATABASE_URL(기본값: sqlite:///./test.db)로 저장소 프로필을 고릅니다.
+# - sqlite:///...    → aiosqlite + WAL/synchronous/busy_timeout/mmap PRAGMA
+# - postgresql://... → asyncpg + 커넥션 풀 튜닝
+# SQL 쿼리 로그는 DB_ECHO=True일 때만 출력합니다. (디버깅용)
+storage_profile = get_storage_profile(settings.DATABASE_URL)
+SQLALCHEMY_DATABASE_URL = storage_profile.url
+
+async_engine = create_engine_for_profile(storage_profile)
 
 # 2. 세션 로컬 생성기
 # 데이터베이스와의 상호작용을 위한 세션을 만듭니다.
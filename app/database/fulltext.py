@@ -0,0 +1,267 @@
+# app/database/fulltext.py
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 전문 검색 대상 컬럼
+FULLTEXT_COLUMNS = ("refined_caption", "blip_text", "file_info")
+
+# 한국어는 띄어쓰기 단위 토큰화가 맞지 않으므로 trigram(3글자 n-gram) 토큰화를 사용합니다.
+# trigram 색인은 3글자 이상 검색어에만 쓸 수 있어, 더 짧은 검색어(2음절 한국어 단어 등)는
+# 2글자 n-gram 테이블(images_bigrams)로 찾습니다. LIKE '%…%' 전체 스캔은 하지 않습니다.
+MIN_INDEXED_TERM_LENGTH = 3
+MAX_QUERY_TERMS = 8
+
+# images_bigrams: (2글자 조각, image_id). 문서의 모든 위치에서 2글자씩(마지막 글자는 1글자) 잘라 저장하므로
+# 2글자 검색어는 gram = 검색어, 1글자 검색어는 그 글자로 시작하는 gram 범위로 찾을 수 있습니다.
+BIGRAM_TABLE = "images_bigrams"
+# 범위 검색 상한 (가장 큰 유니코드 코드 포인트)
+_MAX_CHAR = "\U0010ffff"
+
+
+def _bigram_document(row: str, newline: str) -> str:
+    """검색 대상 컬럼을 줄바꿈으로 이어 소문자로 바꾼 SQL 식 (row: new / old / images)"""
+    columns = f" || {newline} || ".join(f"coalesce({row}.{col}, '')" for col in FULLTEXT_COLUMNS)
+    return f"lower({columns})"
+
+
+def _sqlite_bigram_insert(source: str) -> str:
+    """
+    source의 (id, 문서)로 재귀 CTE를 돌며 모든 위치의 2글자 조각을 넣는 SQL. 공백만 있는 조각은 제외합니다.
+    """
+    return f"""
+        INSERT OR IGNORE INTO {BIGRAM_TABLE}(gram, image_id)
+        WITH RECURSIVE pos(image_id, body, i) AS (
+            {source}
+            UNION ALL
+            SELECT image_id, body, i + 1 FROM pos WHERE i < length(body)
+        )
+        SELECT substr(body, i, 2), image_id FROM pos
+        WHERE trim(substr(body, i, 2), ' ' || char(10)) != ''
+    """
+
+# --- SQLite: FTS5 외부 콘텐츠(external content) 테이블 + 동기화 트리거 ---
+# 트리거는 IF NOT EXISTS로 만들면 기존 DB에 옛 본문이 남으므로, 매번 지우고 다시 만듭니다.
+SQLITE_FULLTEXT_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS images_fts USING fts5(
+        refined_caption, blip_text, file_info,
+        content='images', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    "DROP TRIGGER IF EXISTS images_fts_ai",
+    """
+    CREATE TRIGGER images_fts_ai AFTER INSERT ON images BEGIN
+        INSERT INTO images_fts(rowid, refined_caption, blip_text, file_info)
+        VALUES (new.id, new.refined_caption, new.blip_text, new.file_info);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS images_fts_ad",
+    """
+    CREATE TRIGGER images_fts_ad AFTER DELETE ON images BEGIN
+        INSERT INTO images_fts(images_fts, rowid, refined_caption, blip_text, file_info)
+        VALUES ('delete', old.id, old.refined_caption, old.blip_text, old.file_info);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS images_fts_au",
+    """
+    CREATE TRIGGER images_fts_au
+    AFTER UPDATE OF refined_caption, blip_text, file_info ON images BEGIN
+        INSERT INTO images_fts(images_fts, rowid, refined_caption, blip_text, file_info)
+        VALUES ('delete', old.id, old.refined_caption, old.blip_text, old.file_info);
+        INSERT INTO images_fts(rowid, refined_caption, blip_text, file_info)
+        VALUES (new.id, new.refined_caption, new.blip_text, new.file_info);
+    END
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {BIGRAM_TABLE} (
+        gram TEXT NOT NULL, image_id INTEGER NOT NULL, PRIMARY KEY (gram, image_id)
+    ) WITHOUT ROWID
+    """,
+    "DROP TRIGGER IF EXISTS images_bigrams_ai",
+    f"""
+    CREATE TRIGGER images_bigrams_ai AFTER INSERT ON images BEGIN
+        {_sqlite_bigram_insert(f"SELECT new.id, {_bigram_document('new', 'char(10)')}, 1")};
+    END
+    """,
+    "DROP TRIGGER IF EXISTS images_bigrams_ad",
+    f"""
+    CREATE TRIGGER images_bigrams_ad AFTER DELETE ON images BEGIN
+        DELETE FROM {BIGRAM_TABLE} WHERE image_id = old.id;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS images_bigrams_au",
+    f"""
+    CREATE TRIGGER images_bigrams_au
+    AFTER UPDATE OF refined_caption, blip_text, file_info ON images BEGIN
+        DELETE FROM {BIGRAM_TABLE} WHERE image_id = old.id;
+        {_sqlite_bigram_insert(f"SELECT new.id, {_bigram_document('new', 'char(10)')}, 1")};
+    END
+    """,
+]
+SQLITE_BIGRAM_BACKFILL = _sqlite_bigram_insert(
+    f"SELECT id, {_bigram_document('images', 'char(10)')}, 1 FROM images"
+)
+
+# --- PostgreSQL: pg_trgm GIN 표현식 인덱스 ---
+POSTGRES_DOCUMENT = (
+    "(coalesce(refined_caption, '') || ' ' || coalesce(blip_text, '') "
+    "|| ' ' || coalesce(file_info, ''))"
+)
+POSTGRES_FULLTEXT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_images_fulltext_trgm ON images USING gin ({POSTGRES_DOCUMENT} gin_trgm_ops)",
+    # 1글자 검색어의 범위 조건이 로캘 정렬에 영향받지 않도록 바이트 순서(C) 정렬을 사용합니다.
+    f"""
+    CREATE TABLE IF NOT EXISTS {BIGRAM_TABLE} (
+        gram text COLLATE "C" NOT NULL, image_id integer NOT NULL, PRIMARY KEY (gram, image_id)
+    )
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION images_bigrams_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            DELETE FROM {BIGRAM_TABLE} WHERE image_id = OLD.id;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO {BIGRAM_TABLE} (gram, image_id)
+            SELECT DISTINCT substr(d.body, i, 2), NEW.id
+            FROM (SELECT {_bigram_document('NEW', 'chr(10)')} AS body) d, generate_series(1, length(d.body)) AS i
+            WHERE btrim(substr(d.body, i, 2), ' ' || chr(10)) <> ''
+            ON CONFLICT DO NOTHING;
+        END IF;
+        RETURN NULL;
+    END $$
+    """,
+    "DROP TRIGGER IF EXISTS images_bigrams_sync ON images",
+    """
+    CREATE TRIGGER images_bigrams_sync
+    AFTER INSERT OR DELETE OR UPDATE OF refined_caption, blip_text, file_info ON images
+    FOR EACH ROW EXECUTE FUNCTION images_bigrams_sync()
+    """,
+]
+POSTGRES_BIGRAM_BACKFILL = f"""
+    INSERT INTO {BIGRAM_TABLE} (gram, image_id)
+    SELECT DISTINCT substr(d.body, i, 2), d.id
+    FROM (SELECT id, {_bigram_document('images', 'chr(10)')} AS body FROM images) d,
+         generate_series(1, length(d.body)) AS i
+    WHERE btrim(substr(d.body, i, 2), ' ' || chr(10)) <> ''
+    ON CONFLICT DO NOTHING
+"""
+
+
+async def ensure_fulltext_index(db: AsyncSession) -> None:
+    """
+    전문 검색 인덱스(와 SQLite 동기화 트리거)를 만들고, 인덱스가 비어 있으면 기존 행으로 다시 채웁니다.
+    여러 번 실행해도 안전합니다.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        bigrams_exist = (
+            await db.execute(
+                text("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": BIGRAM_TABLE},
+            )
+        ).scalar()
+        for ddl in SQLITE_FULLTEXT_DDL:
+            await db.execute(text(ddl))
+        indexed = (await db.execute(text("SELECT count(*) FROM images_fts_docsize"))).scalar()
+        total = (await db.execute(text("SELECT count(*) FROM images"))).scalar()
+        if indexed != total:
+            await db.execute(text("INSERT INTO images_fts(images_fts) VALUES ('rebuild')"))
+            print(f"Rebuilt full-text index for {total} images.")
+        if not bigrams_exist:
+            await db.execute(text(SQLITE_BIGRAM_BACKFILL))
+            print(f"Built short-term (bigram) index for {total} images.")
+    elif dialect == "postgresql":
+        bigrams_exist = (
+            await db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": BIGRAM_TABLE})
+        ).scalar()
+        for ddl in POSTGRES_FULLTEXT_DDL:
+            await db.execute(text(ddl))
+        if not bigrams_exist:
+            await db.execute(text(POSTGRES_BIGRAM_BACKFILL))
+    else:
+        print(f"Warning: full-text search is not supported for '{dialect}'.")
+        return
+    await db.commit()
+
+
+def split_query(query: str) -> Tuple[List[str], List[str]]:
+    """
+    검색어를 (trigram 색인 사용 가능한 단어, bigram 테이블로 찾는 짧은 단어)로 나눕니다. 중복은 제거합니다.
+    """
+    terms: List[str] = []
+    for term in query.split():
+        if term not in terms:
+            terms.append(term)
+    terms = terms[:MAX_QUERY_TERMS]
+    indexed = [t for t in terms if len(t) >= MIN_INDEXED_TERM_LENGTH]
+    short = [t for t in terms if len(t) < MIN_INDEXED_TERM_LENGTH]
+    return indexed, short
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _bigram_query(name: str, term: str, params: Dict[str, Any], column: str = "image_id") -> str:
+    """짧은 검색어 하나를 images_bigrams 기본 키(gram, image_id) 검색으로 바꿉니다."""
+    params[name] = term
+    if len(term) >= 2:
+        condition = f"gram = lower(:{name})"
+    else:
+        params[f"{name}_end"] = term + _MAX_CHAR
+        condition = f"gram >= lower(:{name}) AND gram < lower(:{name}_end)"
+    return f"SELECT DISTINCT {column} FROM {BIGRAM_TABLE} WHERE {condition}"
+
+
+def build_search_query(dialect: str, query: str, limit: int, offset: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    관련도 순으로 정렬된 이미지 id 목록을 반환하는 SQL과 바인딩 파라미터를 만듭니다.
+    모든 검색어를 포함하는(AND) 행만 반환합니다.
+    """
+    indexed, short = split_query(query)
+    params: Dict[str, Any] = {"limit": limit, "offset": offset}
+    # 짧은 검색어는 LIKE 대신 bigram 테이블의 기본 키로 찾습니다.
+    short_queries = [_bigram_query(f"s{i}", term, params) for i, term in enumerate(short)]
+
+    if dialect == "sqlite":
+        if not indexed:
+            # 짧은 검색어만 있으면 FTS 테이블을 거치지 않고 bigram 기본 키 검색 결과를 교집합합니다.
+            sql = (
+                " INTERSECT ".join(
+                    _bigram_query(f"s{i}", term, params, column="image_id AS id")
+                    for i, term in enumerate(short)
+                )
+                + " ORDER BY id DESC LIMIT :limit OFFSET :offset"
+            )
+            return sql, params
+        # 각 단어를 FTS5 구문(phrase)으로 감싸 연산자/특수문자를 무력화합니다.
+        params["match"] = " AND ".join('"' + t.replace('"', '""') + '"' for t in indexed)
+        conditions = ["images_fts MATCH :match"] + [f"rowid IN ({q})" for q in short_queries]
+        sql = (
+            "SELECT rowid AS id FROM images_fts WHERE "
+            + " AND ".join(conditions)
+            + " ORDER BY bm25(images_fts), rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        return sql, params
+
+    if dialect == "postgresql":
+        conditions = [f"id IN ({q})" for q in short_queries]
+        for i, term in enumerate(indexed):
+            params[f"p{i}"] = _like_pattern(term)
+            conditions.append(f"{POSTGRES_DOCUMENT} ILIKE :p{i}")
+        params["query"] = " ".join(indexed + short)
+        sql = (
+            "SELECT id FROM images WHERE "
+            + " AND ".join(conditions)
+            + f" ORDER BY word_similarity(:query, {POSTGRES_DOCUMENT}) DESC, id DESC"
+            + " LIMIT :limit OFFSET :offset"
+        )
+        return sql, params
+
+    raise ValueError(f"full-text search is not supported for '{dialect}'")
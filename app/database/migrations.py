@@ -0,0 +1,83 @@
+# app/database/migrations.py
+"""
+스키마 마이그레이션 (컬럼/인덱스 추가, 저장 형식 정리, 전문 검색 인덱스)
+
+서비스 계층 로직이 필요한 데이터 백필(태그 역색인, geohash, 일기 집계)은 app.services.backfill에 있습니다.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import AsyncSessionLocal, Base
+from app.database.fulltext import ensure_fulltext_index
+
+# normalize_sqlite_timestamps를 실행한 SQLite DB에 기록하는 PRAGMA user_version 값
+SQLITE_TIMESTAMPS_NORMALIZED_VERSION = 1
+
+
+async def ensure_columns(session_factory: sessionmaker = AsyncSessionLocal) -> None:
+    """
+    create_all은 기존 테이블에 새 컬럼을 추가하지 않으므로, 모델에 새로 정의된 (nullable) 컬럼을 ALTER TABLE로 추가합니다.
+    """
+    async with session_factory() as db:
+        conn = await db.connection()
+        existing = await conn.run_sync(
+            lambda sync_conn: {
+                table: {column["name"] for column in inspect(sync_conn).get_columns(table)}
+                for table in inspect(sync_conn).get_table_names()
+            }
+        )
+        for table in Base.metadata.sorted_tables:
+            for column in table.columns:
+                if table.name in existing and column.name not in existing[table.name]:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    await conn.execute(
+                        text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                    )
+                    print(f"Added column {table.name}.{column.name}")
+        await db.commit()
+
+
+async def ensure_indexes(session_factory: sessionmaker = AsyncSessionLocal) -> None:
+    """
+    create_all은 이미 존재하는 테이블에 새로 정의된 인덱스를 만들지 않으므로, 없는 인덱스만 추가합니다.
+    """
+    async with session_factory() as db:
+        conn = await db.connection()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+        await db.commit()
+
+
+async def normalize_sqlite_timestamps(session_factory: sessionmaker = AsyncSessionLocal) -> int:
+    """
+    이전 기본값(func.now())으로 저장된 SQLite created_at('YYYY-MM-DD HH:MM:SS')에 소수점 초('.000000')를 붙여,
+    모든 행을 SQLAlchemy가 쓰는 형식으로 맞춥니다. (형식이 섞이면 문자열 비교로 동작하는 키셋 커서가 같은 초의 행을 건너뜀)
+    전체 테이블을 훑는 UPDATE이므로 DB마다 한 번만 실행하고, 실행했음을 PRAGMA user_version에 기록합니다.
+    """
+    async with session_factory() as db:
+        if db.get_bind().dialect.name != "sqlite":
+            return 0
+        version = (await db.execute(text("PRAGMA user_version"))).scalar()
+        if version >= SQLITE_TIMESTAMPS_NORMALIZED_VERSION:
+            return 0
+        result = await db.execute(
+            text("UPDATE images SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+        )
+        await db.execute(text(f"PRAGMA user_version = {SQLITE_TIMESTAMPS_NORMALIZED_VERSION}"))
+        await db.commit()
+    if result.rowcount:
+        print(f"Normalized created_at format for {result.rowcount} images.")
+    return result.rowcount
+
+
+async def run_migrations(session_factory: sessionmaker = AsyncSessionLocal) -> None:
+    """
+    서버 시작 시(create_all 이후) 실행하는 스키마 마이그레이션 목록입니다.
+    """
+    await ensure_columns(session_factory)
+    await ensure_indexes(session_factory)
+    await normalize_sqlite_timestamps(session_factory)
+    async with session_factory() as db:
+        await ensure_fulltext_index(db)
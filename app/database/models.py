@@ -1,10 +1,32 @@
 # app/database/models.py
 
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric
-from sqlalchemy.sql import func
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    Date,
+    DateTime,
+    Numeric,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Table,
+)
 from app.database.database import Base  # database.py에서 정의한 Base 상속
 
 
+def utc_now() -> datetime:
+    """
+    created_at 기본값: 현재 UTC 시각 (naive)
+    func.now()는 SQLite에 소수점 초 없이('YYYY-MM-DD HH:MM:SS') 기록되어, 직접 지정한 시각('... .ffffff')과
+    문자열 비교 순서가 어긋나므로 SQLAlchemy가 같은 형식으로 기록하도록 Python 쪽에서 값을 만듭니다.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 # --- 1. Image 모델 (기존 Django Image 모델 대체) ---
 class ImageModel(Base):
     """
@@ -30,6 +52,91 @@ class ImageModel(Base):
     # Django는 DecimalField를 사용했지만, SQLAlchemy는 Numeric 타입을 사용합니다.
     latitude = Column(Numeric(precision=9, scale=6), nullable=True)
     longitude = Column(Numeric(precision=9, scale=6), nullable=True)
+    # 위치 검색용 geohash (위도/경도가 있을 때 저장 시 계산, B-tree 인덱스로 주변 검색)
+    geohash = Column(String(12), nullable=True, index=True)
+    # 근접 중복 사진 검출용 perceptual hash (64비트 dHash, 16진수)
+    phash = Column(String(16), nullable=True)
 
     # 생성 시각 (자동 저장)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
\ No newline at end of file
+    created_at = Column(DateTime, default=utc_now, nullable=False)
+
+    __table_args__ = (
+        # 타임라인(최신순) 키셋 페이지네이션용 복합 인덱스: ORDER BY created_at DESC, id DESC
+        Index("ix_images_created_at_id", "created_at", "id"),
+    )
+
+
+# --- 2. 키워드(태그) 모델: images.keywords 문자열을 정규화한 테이블 ---
+# 이미지 ↔ 키워드 다대다 연결 테이블 (역색인)
+# 기본키(image_id, keyword_id)는 이미지별 태그 조회에, (keyword_id, image_id) 인덱스는 태그 → 이미지 검색에 사용됩니다.
+image_keywords = Table(
+    "image_keywords",
+    Base.metadata,
+    Column("image_id", Integer, ForeignKey("images.id", ondelete="CASCADE"), primary_key=True),
+    Column("keyword_id", Integer, ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_image_keywords_keyword_id_image_id", "keyword_id", "image_id"),
+)
+
+
+class KeywordModel(Base):
+    """
+    LLM이 생성한 키워드(태그) 사전 테이블. 같은 태그는 한 행만 존재합니다.
+    """
+
+    __tablename__ = "keywords"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True, index=True)
+
+
+# --- 3. 이미지 임베딩 모델: BLIP 비전 인코더의 pooled 임베딩 (유사 이미지 검색용) ---
+class ImageEmbeddingModel(Base):
+    """
+    images 행과 1:1로 저장되는 이미지 임베딩 (float16 바이트열)
+    목록/검색 쿼리가 큰 BLOB을 읽지 않도록 images와 별도 테이블에 둡니다.
+    """
+
+    __tablename__ = "image_embeddings"
+
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), primary_key=True)
+    # 임베딩을 만든 모델 (모델이 바뀌면 다른 공간의 벡터이므로 섞지 않음)
+    model = Column(String(200), nullable=False, index=True)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float16, L2 정규화
+
+
+
+# --- 4. 일기 집계 모델: 달력/이번 달 화면용 일별·월별 요약 (저장 시 증분 갱신) ---
+class DailySummaryModel(Base):
+    """
+    하루(DIARY_TIMEZONE 기준 날짜)에 작성된 일기 수와 대표 일기(가장 최근 일기)
+    """
+
+    __tablename__ = "daily_summaries"
+
+    day = Column(String(10), primary_key=True)  # YYYY-MM-DD
+    entry_count = Column(Integer, nullable=False, default=0)
+    latest_image_id = Column(Integer, nullable=True)
+
+
+class MonthlySummaryModel(Base):
+    """
+    한 달에 작성된 일기 수와 대표 일기(가장 최근 일기)
+    """
+
+    __tablename__ = "monthly_summaries"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    entry_count = Column(Integer, nullable=False, default=0)
+    latest_image_id = Column(Integer, nullable=True)
+
+
+# 기간(일/월)별 태그 등장 횟수. (period, entry_count) 인덱스로 기간별 상위 태그를 바로 읽습니다.
+summary_keywords = Table(
+    "summary_keywords",
+    Base.metadata,
+    Column("period", String(10), primary_key=True),  # YYYY-MM-DD 또는 YYYY-MM
+    Column("keyword", String(100), primary_key=True),
+    Column("entry_count", Integer, nullable=False, default=0),
+    Index("ix_summary_keywords_period_count", "period", "entry_count"),
+)
@@ -0,0 +1,100 @@
+# app/database/profiles.py
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+
+@dataclass
+class StorageProfile:
+    """
+    DATABASE_URL로부터 결정되는 저장소 프로필입니다.
+
+    - sqlite: aiosqlite 드라이버 + 연결마다 WAL/synchronous/busy_timeout/mmap_size PRAGMA 적용
+    - postgresql: asyncpg 드라이버 + 커넥션 풀 크기/overflow/pre-ping 설정
+    """
+
+    name: str  # "sqlite" 또는 "postgresql"
+    url: str  # 비동기 드라이버가 지정된 최종 URL
+    engine_kwargs: Dict[str, Any] = field(default_factory=dict)
+    sqlite_pragmas: Dict[str, Any] = field(default_factory=dict)
+
+
+def normalize_database_url(url: str) -> str:
+    """
+    동기 드라이버 URL을 비동기 드라이버 URL로 바꿉니다. 이미 드라이버가 지정된 URL은 그대로 둡니다.
+        sqlite:///./test.db          → sqlite+aiosqlite:///./test.db
+        postgres://... / postgresql://... → postgresql+asyncpg://...
+    """
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    return {
+        # 읽기와 쓰기가 서로를 막지 않도록 WAL 모드를 사용합니다. (DB 파일에 영구 저장되는 설정)
+        "journal_mode": "WAL",
+        # WAL에서는 NORMAL이어도 손상 위험이 없고, 커밋마다 fsync 하지 않아 쓰기가 빨라집니다.
+        "synchronous": "NORMAL",
+        # 다른 연결이 쓰기 잠금을 잡고 있으면 즉시 'database is locked' 대신 이 시간(ms)만큼 기다립니다.
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # 읽기를 메모리 매핑으로 처리할 최대 크기(바이트)
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "foreign_keys": "ON",
+    }
+
+
+def get_storage_profile(url: str, tuned: bool = True) -> StorageProfile:
+    """
+    URL에 맞는 저장소 프로필을 만듭니다. tuned=False이면 PRAGMA/풀 튜닝 없이 기본값을 사용합니다. (벤치마크 비교용)
+    """
+    url = normalize_database_url(url)
+    backend = make_url(url).get_backend_name()
+    engine_kwargs: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+
+    if backend == "sqlite":
+        return StorageProfile(
+            name="sqlite",
+            url=url,
+            engine_kwargs=engine_kwargs,
+            sqlite_pragmas=sqlite_pragmas() if tuned else {},
+        )
+
+    if backend == "postgresql" and tuned:
+        engine_kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # 유휴 중 끊긴 연결을 사용 전에 감지합니다.
+            pool_pre_ping=True,
+            connect_args={"server_settings": {"application_name": "sodam-diary"}},
+        )
+    return StorageProfile(name=backend, url=url, engine_kwargs=engine_kwargs)
+
+
+def _apply_sqlite_pragmas(engine: AsyncEngine, pragmas: Dict[str, Any]) -> None:
+    # PRAGMA는 연결 단위 설정이므로 풀이 새 연결을 만들 때마다 적용합니다.
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_engine_for_profile(profile: StorageProfile) -> AsyncEngine:
+    engine = create_async_engine(profile.url, **profile.engine_kwargs)
+    if profile.sqlite_pragmas:
+        _apply_sqlite_pragmas(engine, profile.sqlite_pragmas)
+    return engine
@@ -0,0 +1,119 @@
+# app/database/summaries.py
+
+from collections import Counter
+from datetime import datetime, timezone, tzinfo
+from typing import Dict, Iterable, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.models import DailySummaryModel, MonthlySummaryModel, summary_keywords
+
+# 집계 입력 한 건: (image_id, created_at(UTC), 정규화된 태그 목록)
+SummaryEntry = Tuple[int, datetime, List[str]]
+
+
+def _load_timezone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"Warning: unknown DIARY_TIMEZONE '{name}', using UTC.")
+        return timezone.utc
+
+
+DIARY_TZ = _load_timezone(settings.DIARY_TIMEZONE)
+
+
+def period_keys(created_at: datetime, tz: tzinfo = DIARY_TZ) -> Tuple[str, str]:
+    """UTC 저장 시각을 DIARY_TIMEZONE 기준 (YYYY-MM-DD, YYYY-MM)로 바꿉니다."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    local = created_at.astimezone(tz)
+    return local.strftime("%Y-%m-%d"), local.strftime("%Y-%m")
+
+
+def aggregate_entries(
+    entries: Iterable[SummaryEntry],
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    저장된 일기 목록을 (일별 행, 월별 행, 기간별 태그 행)으로 집계합니다.
+    같은 기간은 한 행으로 합치므로, 한 번의 다중 행 UPSERT로 반영할 수 있습니다.
+    """
+    counts: Dict[str, List[int]] = {}  # period → [일기 수, 가장 최근 image_id]
+    keywords: Counter = Counter()
+    for image_id, created_at, names in entries:
+        for period in period_keys(created_at):
+            summary = counts.setdefault(period, [0, image_id])
+            summary[0] += 1
+            summary[1] = max(summary[1], image_id)
+            for name in names:
+                keywords[(period, name)] += 1
+
+    days, months = [], []
+    for period, (entry_count, latest_image_id) in sorted(counts.items()):
+        row = {"entry_count": entry_count, "latest_image_id": latest_image_id}
+        if len(period) == 10:
+            days.append({"day": period, **row})
+        else:
+            months.append({"month": period, **row})
+    keyword_rows = [
+        {"period": period, "keyword": name, "entry_count": count}
+        for (period, name), count in sorted(keywords.items())
+    ]
+    return days, months, keyword_rows
+
+
+def _upsert_counts(db: AsyncSession, table, keys: List[str]):
+    """
+    없으면 INSERT, 있으면 entry_count를 더하고 latest_image_id를 큰 값으로 바꾸는 UPSERT 문
+    (동시 저장에서도 갱신이 사라지지 않도록 DB에서 원자적으로 더합니다)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt, greatest = sqlite.insert(table), func.max
+    elif dialect == "postgresql":
+        stmt, greatest = postgresql.insert(table), func.greatest
+    else:
+        raise ValueError(f"diary summaries are not supported for '{dialect}'")
+
+    values = {"entry_count": table.c.entry_count + stmt.excluded.entry_count}
+    if "latest_image_id" in table.c:
+        values["latest_image_id"] = greatest(
+            func.coalesce(table.c.latest_image_id, 0), stmt.excluded.latest_image_id
+        )
+    return stmt.on_conflict_do_update(index_elements=keys, set_=values)
+
+
+async def apply_summary_entries(db: AsyncSession, entries: Iterable[SummaryEntry]) -> None:
+    """
+    새로 저장한 일기를 일별/월별 집계에 더합니다. 커밋은 호출자가 합니다. (일기 저장과 같은 트랜잭션)
+    """
+    days, months, keyword_rows = aggregate_entries(entries)
+    if days:
+        await db.execute(_upsert_counts(db, DailySummaryModel.__table__, ["day"]), days)
+    if months:
+        await db.execute(_upsert_counts(db, MonthlySummaryModel.__table__, ["month"]), months)
+    if keyword_rows:
+        await db.execute(_upsert_counts(db, summary_keywords, ["period", "keyword"]), keyword_rows)
+
+
+async def replace_summaries(db: AsyncSession, entries: List[SummaryEntry]) -> int:
+    """
+    집계 테이블을 비우고 entries(전체 일기)로 다시 채웁니다. 커밋은 호출자가 합니다.
+
+    Returns:
+        집계한 일기 수
+    """
+    days, months, keyword_rows = aggregate_entries(entries)
+    for table in (DailySummaryModel.__table__, MonthlySummaryModel.__table__, summary_keywords):
+        await db.execute(delete(table))
+    if days:
+        await db.execute(insert(DailySummaryModel), days)
+    if months:
+        await db.execute(insert(MonthlySummaryModel), months)
+    if keyword_rows:
+        await db.execute(insert(summary_keywords), keyword_rows)
+    return len(entries)
@@ -1,11 +1,26 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
+import asyncio
 # 🌟 변경: 기존 captioning 라우터 대신, 새로운 통합 라우터(api)를 import합니다.
 from app.routers.api import api_router 
 from app.database.database import async_engine, Base
 from app.database.models import * # 모델을 import해야 Base.metadata가 테이블을 인식
+from app.database.migrations import run_migrations
+from app.services.backfill import run_backfills
+from app.services.crud import image_write_queue, load_hash_index, load_similarity_index
+from app.database.database import AsyncSessionLocal
+from captioning_module.model_config import BLIP_EMBEDDING_MODEL
+from app.core.config import settings
+from app.core.deadline import (
+    DEADLINE_HEADER,
+    parse_deadline_header,
+    reset_request_deadline,
+    set_request_deadline,
+)
+from app.core.http_pool import llm_http_pool
+from app.services.llm_service import get_llm_warmup_urls, translate_with_openvino
 
 
 # --- 1. DB 초기화 컨텍스트 관리자 ---
@@ -26,9 +41,33 @@ async def lifespan(app: FastAPI):
     """
     # 서버 시작 시 (Startup)
     await create_db_tables()
+    # 기존 데이터를 새 테이블/인덱스 구조에 맞게 채웁니다. (여러 번 실행해도 안전)
+    await run_migrations()
+    await run_backfills()
+    # 저장된 이미지 임베딩을 유사 이미지 검색 인덱스로,
+    # 근접 중복 사진 검출용 perceptual hash도 BK-tree 인덱스로 불러옵니다.
+    async with AsyncSessionLocal() as db:
+        loaded = await load_similarity_index(db, BLIP_EMBEDDING_MODEL)
+        hashes = await load_hash_index(db)
+    print(f"Loaded {loaded} image embeddings and {hashes} perceptual hashes.")
+    # 이미지 레코드 저장을 배치로 모으는 write-behind 큐 시작
+    image_write_queue.start()
+
+    # LLM 커넥션 풀을 열고 미리 연결해 두어 첫 요청의 TLS 핸드셰이크 지연을 없앱니다.
+    llm_http_pool.open()
+    warmup_urls = get_llm_warmup_urls()
+    await llm_http_pool.warm_up(warmup_urls)
+    llm_http_pool.start_keepalive(warmup_urls)
+
+    # 로컬 번역 모델은 첫 요청 전에 미리 불러 둡니다.
+    if settings.TRANSLATION_BACKEND.lower() == "openvino":
+        await asyncio.to_thread(translate_with_openvino, "warm up")
+
     yield
     # 서버 종료 시 (Shutdown)
-    # (필요한 경우 여기에 정리 코드를 추가합니다.)
+    # 큐에 남은 레코드를 모두 커밋한 뒤 종료합니다.
+    await image_write_queue.close()
+    await llm_http_pool.close()
 
 
 # --- 2. FastAPI 인스턴스 생성 ---
@@ -39,6 +78,19 @@ app = FastAPI(
     lifespan=lifespan,  # 라이프스팬 매니저 적용
 )
 
+# 요청마다 종단 간 마감 시간을 설정합니다. LLM 호출 타임아웃은 남은 시간 안에서 정해집니다.
+@app.middleware("http")
+async def request_deadline_middleware(request: Request, call_next):
+    seconds = parse_deadline_header(
+        request.headers.get(DEADLINE_HEADER), settings.REQUEST_DEADLINE_SECONDS
+    )
+    token = set_request_deadline(seconds)
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_deadline(token)
+
+
 # --- 3. 라우터 등록 ---
 # 🌟 변경: api_router를 "/api" 경로에 등록합니다. 
 # 버전 정보(/v1)는 이미 api_router 내부에 정의되어 있습니다.
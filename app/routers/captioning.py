@@ -8,10 +8,7 @@ from typing import Optional, Dict, Any
 from captioning_module import image_captioner
 
 # 새로 작성한 로직들 (비즈니스 로직 및 DB)
-from app.services.llm_service import (
-    get_refined_caption_with_gemini_async,
-    get_refined_caption_and_keywords_with_chatgpt_async,
-)
+from app.services.llm_service import get_refined_caption_and_keywords_async
 from app.services import crud  # crud.py에서 정의한 DB 상호작용 함수
 from app.schemas.image import ImageCreate, Image  # DB 저장용 스키마, 응답용 스키마
 from app.database.database import get_db_session  # DB 세션 DI 함수
@@ -35,6 +32,9 @@ async def create_caption(
     latitude: Optional[float] = Form(None, description="위도"),
     longitude: Optional[float] = Form(None, description="경도"),
     location: Optional[str] = Form(None, description="위치 정보"),
+    llm_choice: Optional[str] = Form(
+        None, description="LLM 제공자 (chatgpt/gemini, 생략 시 자동 선택)"
+    ),
     # 2. DB 세션 의존성 주입 (FastAPI Dependency Injection)
     db: AsyncSession = Depends(get_db_session),
 ):
@@ -42,8 +42,6 @@ async def create_caption(
     이미지와 사용자 입력을 받아 캡션을 생성하고 저장하는 엔드포인트입니다.
     """
 
-    llm_choice = "chatgpt"  # 기존 views.py의 선택 유지
-
     # 1단계: 파일 읽기 및 BLIP/CLIP 분석 (I/O 작업)
     try:
         # 비동기로 파일을 읽음
@@ -73,27 +71,22 @@ async def create_caption(
     refined_caption = None # 초기화
     keywords = [] # 키워드 변수 초기화
 
-    if llm_choice == "gemini":
-        # Gemini는 기존 로직을 유지 (문자열 반환 가정)
-        refined_caption = await get_refined_caption_with_gemini_async(
-            f"이미지 설명: {blip_text}. 분위기: {clip_text}.", file_info
-        )
-    elif llm_choice == "chatgpt":
-        # ChatGPT 호출 및 딕셔너리 응답 처리
-        llm_result = await get_refined_caption_and_keywords_with_chatgpt_async(
-            f"Photo description: {blip_text}, Predicted mood: {clip_text}",
-            file_info,
-        )
-        
-        # 딕셔너리에서 값 추출 (핵심 수정)
-        refined_caption = llm_result.get("refined_caption", "LLM 결과 추출 오류")
-        keywords = llm_result.get("keywords", []) # 키워드 추출
-        
-    else:
+    if llm_choice not in (None, "chatgpt", "gemini"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid LLM choice."
         )
 
+    # 제공자 라우터 호출 (지정한 제공자가 느리면 다른 제공자로 헤지)
+    llm_result = await get_refined_caption_and_keywords_async(
+        f"Photo description: {blip_text}, Predicted mood: {clip_text}",
+        file_info,
+        provider=llm_choice,
+    )
+
+    # 딕셔너리에서 값 추출 (핵심 수정)
+    refined_caption = llm_result.get("refined_caption", "LLM 결과 추출 오류")
+    keywords = llm_result.get("keywords", []) # 키워드 추출
+
     # LLM 오류 처리 (refined_caption이 문자열이라고 가정하고 체크)
     if "LLM API 호출 실패" in refined_caption:
         raise HTTPException(
@@ -0,0 +1,355 @@
+# app/routers/v1/diaries.py
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_db_session
+from app.database.summaries import DIARY_TZ
+from app.schemas.image import (
+    DaySummary,
+    DiaryPage,
+    DiarySearchResult,
+    DiarySummary,
+    Image,
+    ImportResult,
+    MonthCalendar,
+    MonthSummary,
+    NearbyDiary,
+    NearbyResult,
+    SimilarDiary,
+    SimilarResult,
+    TagSearchResult,
+)
+from app.services import archive, crud
+
+# 저장된 일기 조회/검색 API 라우터
+router = APIRouter()
+
+
+# ----------------------------------------------------
+# A. 타임라인 API (GET /diaries/)
+# ----------------------------------------------------
+@router.get(
+    "/diaries/",
+    response_model=DiaryPage,
+    summary="저장된 일기 목록 (최신순, 커서 페이지네이션)",
+)
+async def list_diaries(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    일기를 최신순으로 반환합니다. 다음 페이지는 응답의 next_cursor로 요청합니다.
+    """
+    try:
+        rows, next_cursor = await crud.list_diary_summaries(db, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return DiaryPage(
+        items=[
+            DiarySummary(
+                id=row.id,
+                created_at=row.created_at,
+                file=row.file,
+                location=row.location,
+                tags=crud.normalize_keywords(row.keywords),
+                preview=row.preview or "",
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+# ----------------------------------------------------
+# B. 태그 검색 API (GET /diaries/tags/)
+# ----------------------------------------------------
+@router.get(
+    "/diaries/tags/",
+    response_model=TagSearchResult,
+    summary="태그(키워드)로 일기 검색",
+)
+async def search_diaries_by_tags(
+    tag: List[str] = Query(..., description="검색할 태그 (여러 개 지정 가능: ?tag=바다&tag=강아지)"),
+    match: str = Query("all", pattern="^(all|any)$", description="all: 모든 태그 포함, any: 하나라도 포함"),
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, description="이전 응답의 next_before_id"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    키워드 역색인(image_keywords)으로 태그가 달린 일기를 최신순으로 반환합니다.
+    """
+    tags = crud.normalize_keywords(",".join(tag))
+    if not tags:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="검색할 태그가 없습니다."
+        )
+
+    images = await crud.search_images_by_tags(
+        db, tags, match_all=(match == "all"), limit=limit, before_id=before_id
+    )
+    return TagSearchResult(
+        tags=tags,
+        items=[Image.model_validate(image) for image in images],
+        next_before_id=images[-1].id if len(images) == limit else None,
+    )
+
+
+# ----------------------------------------------------
+# C. 전문 검색 API (GET /diaries/search/)
+# ----------------------------------------------------
+@router.get(
+    "/diaries/search/",
+    response_model=DiarySearchResult,
+    summary="일기 내용(해설/캡션/사용자 입력) 전문 검색",
+)
+async def search_diaries(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어 (공백으로 구분, 모두 포함)"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    전문 검색 인덱스로 검색어를 모두 포함하는 일기를 관련도 순으로 반환합니다.
+    """
+    query = q.strip()
+    if not query:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="검색어가 없습니다."
+        )
+
+    # 한 개를 더 조회해 다음 페이지가 있는지 판단합니다.
+    images = await crud.search_images_fulltext(
+        db, query, limit=size + 1, offset=(page - 1) * size
+    )
+    return DiarySearchResult(
+        query=query,
+        page=page,
+        size=size,
+        items=[Image.model_validate(image) for image in images[:size]],
+        has_more=len(images) > size,
+    )
+
+
+# ----------------------------------------------------
+# D. 위치 기반 조회 API (GET /diaries/nearby/)
+# ----------------------------------------------------
+@router.get(
+    "/diaries/nearby/",
+    response_model=NearbyResult,
+    summary="이 근처의 추억: 반경 안의 일기 (가까운 순)",
+)
+async def list_nearby_diaries(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(500, gt=0, le=50000, description="검색 반경(미터)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    geohash 인덱스로 주변 후보만 조회한 뒤, 실제 거리로 걸러 가까운 순으로 반환합니다.
+    """
+    matches = await crud.find_images_near(db, latitude, longitude, radius_m, limit=limit)
+    return NearbyResult(
+        items=[
+            NearbyDiary(
+                id=row.id,
+                created_at=row.created_at,
+                file=row.file,
+                location=row.location,
+                tags=crud.normalize_keywords(row.keywords),
+                preview=row.preview or "",
+                latitude=float(row.latitude),
+                longitude=float(row.longitude),
+                distance_m=round(distance, 1),
+            )
+            for row, distance in matches
+        ]
+    )
+
+
+# ----------------------------------------------------
+# E. 유사 이미지 조회 API (GET /diaries/{image_id}/similar/)
+# ----------------------------------------------------
+@router.get(
+    "/diaries/{image_id}/similar/",
+    response_model=SimilarResult,
+    summary="이 사진과 비슷한 추억: 이미지 임베딩 유사도 순",
+)
+async def list_similar_diaries(
+    image_id: int,
+    k: int = Query(10, ge=1, le=100, description="반환할 최대 개수"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    BLIP 비전 임베딩의 코사인 유사도로 기준 사진과 비슷한 일기를 찾습니다.
+    """
+    matches = await crud.find_similar_images(db, image_id, limit=k)
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image embedding for ID {image_id} not found",
+        )
+    return SimilarResult(
+        image_id=image_id,
+        items=[
+            SimilarDiary(
+                id=row.id,
+                created_at=row.created_at,
+                file=row.file,
+                location=row.location,
+                tags=crud.normalize_keywords(row.keywords),
+                preview=row.preview or "",
+                score=round(score, 4),
+            )
+            for row, score in matches
+        ],
+    )
+
+
+# ----------------------------------------------------
+# F. 달력 / 월별 요약 API (GET /diaries/calendar/, GET /diaries/months/)
+# ----------------------------------------------------
+def _representative(representatives: Dict[int, Any], image_id: Optional[int]) -> Optional[DiarySummary]:
+    row = representatives.get(image_id)
+    if row is None:
+        return None
+    return DiarySummary(
+        id=row.id,
+        created_at=row.created_at,
+        file=row.file,
+        location=row.location,
+        tags=crud.normalize_keywords(row.keywords),
+        preview=row.preview or "",
+    )
+
+
+@router.get(
+    "/diaries/calendar/",
+    response_model=MonthCalendar,
+    summary="달력: 한 달의 일기 수/상위 태그/대표 일기 (미리 집계된 요약)",
+)
+async def get_diary_calendar(
+    month: Optional[str] = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM (생략 시 이번 달)"
+    ),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    저장 시 증분 갱신되는 일별/월별 집계 테이블에서 읽으므로, 일기 수와 관계없이 달마다 일정한 비용으로 응답합니다.
+    """
+    month = month or datetime.now(DIARY_TZ).strftime("%Y-%m")
+    calendar = await crud.get_month_calendar(db, month)
+    month_row = calendar["month"]
+    top_tags = calendar["top_tags"]
+    representatives = calendar["representatives"]
+    return MonthCalendar(
+        month=month,
+        count=month_row.entry_count if month_row is not None else 0,
+        top_tags=top_tags.get(month, []),
+        representative=_representative(
+            representatives, month_row.latest_image_id if month_row is not None else None
+        ),
+        days=[
+            DaySummary(
+                day=row.day,
+                count=row.entry_count,
+                top_tags=top_tags.get(row.day, []),
+                representative=_representative(representatives, row.latest_image_id),
+            )
+            for row in calendar["days"]
+        ],
+    )
+
+
+@router.get(
+    "/diaries/months/",
+    response_model=List[MonthSummary],
+    summary="월별 요약 목록 (최근 달부터)",
+)
+async def list_diary_months(
+    limit: int = Query(12, ge=1, le=120),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    일기가 있는 달의 요약을 최근 달부터 반환합니다.
+    """
+    summaries = await crud.list_monthly_summaries(db, limit=limit)
+    return [
+        MonthSummary(
+            month=row.month,
+            count=row.entry_count,
+            top_tags=summaries["top_tags"].get(row.month, []),
+            representative=_representative(summaries["representatives"], row.latest_image_id),
+        )
+        for row in summaries["months"]
+    ]
+
+
+# ----------------------------------------------------
+# G. 아카이브 내보내기/가져오기 API (GET /diaries/export/, POST /diaries/import/)
+# ----------------------------------------------------
+ARCHIVE_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@router.get(
+    "/diaries/export/",
+    summary="전체 일기 내보내기 (NDJSON/Parquet 스트리밍)",
+)
+async def export_diaries(
+    format: str = Query("ndjson", pattern="^(ndjson|parquet)$", description="ndjson 또는 parquet"),
+):
+    """
+    서버 측 커서로 batch 단위로 읽어 바로 전송하므로, 일기 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    try:
+        chunks = archive.stream_archive(format)
+    except RuntimeError as e:  # pyarrow 미설치
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    filename = f"sodam-diaries-{datetime.now(DIARY_TZ):%Y%m%d}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=ARCHIVE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/diaries/import/",
+    response_model=ImportResult,
+    summary="일기 가져오기 (내보내기 파일, 배치 저장)",
+)
+async def import_diaries(
+    archive_file: UploadFile = File(..., description="내보내기로 만든 .ndjson 또는 .parquet 파일"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|parquet)$", description="생략 시 확장자로 판단"),
+):
+    """
+    레코드를 batch 단위 다중 행 INSERT로 저장합니다. 형식이 잘못된 레코드는 건너뛰고 결과에 보고합니다.
+    이미 있는 일기(파일 이름, 이미지 해시, 작성 시각이 같음)는 다시 저장하지 않습니다.
+    """
+    archive_format = format or ("parquet" if (archive_file.filename or "").endswith(".parquet") else "ndjson")
+    try:
+        # 업로드 파일은 로컬 임시 파일이므로 batch 단위로 읽으며 바로 저장합니다. (전체를 메모리에 올리지 않음)
+        # 파일 읽기와 파싱은 import_records가 스레드풀에서 실행합니다.
+        if archive_format == "parquet":
+            records = archive.iter_parquet(archive_file.file)
+        else:
+            records = archive.iter_ndjson(archive_file.file)
+        result = await archive.import_records(records)
+    except RuntimeError as e:  # pyarrow 미설치
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Archive import failed: {e}"
+        )
+    return ImportResult(**result)
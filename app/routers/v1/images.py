@@ -1,20 +1,45 @@
 # app/routers/v1/images.py
 
-from fastapi import APIRouter, UploadFile, HTTPException, status, Request
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    File,
+    Form,
+    UploadFile,
+    HTTPException,
+    status,
+    Request,
+)
+from fastapi.responses import StreamingResponse
 
 # **필수 Import 추가:** CPU 바운드 작업을 위해 run_in_threadpool
 from fastapi.concurrency import run_in_threadpool
 # from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, Dict, Any, List  # List 추가
+from typing import Optional, Dict, Any, List, Literal  # List 추가
+import json
 
 # 기존 BLIP 모델 로직 (CLIP 관련 로직은 이미 삭제되었다고 가정)
-from captioning_module.image_captioner import ImageCaptioner
+from captioning_module.phash import hamming_distance, image_hash
+from captioning_module.tier_router import CaptionTierRouter
 
 # 새로 작성한 로직들 (비즈니스 로직 및 DB)
-from app.services.llm_service import get_refined_caption_and_keywords_with_chatgpt_async
+from app.services.llm_service import (
+    get_llm_warmup_urls,
+    describe_with_details,
+    get_refined_caption_and_keywords_async,
+    get_refined_captions_and_keywords_batch_async,
+    stream_refined_caption_and_keywords_with_chatgpt_async,
+)
 from app.services import crud
+from app.core.config import settings
+from app.core.http_pool import llm_http_pool
+from app.services.similarity import image_similarity_index, to_blob
 from app.schemas.image import (
+    BatchGenerateRequest,
+    BatchLlmItem,
+    BatchLlmResult,
     BlipResult,
+    DiaryResult,
     GenerateRequest,
     LlmResult,
     ImageCreate,
@@ -26,7 +51,10 @@ from app.services.llm_service import translate_to_korean_async
 # 🌟 이 파일의 라우터 인스턴스를 생성합니다.
 router = APIRouter()
 
-image_captioner = ImageCaptioner.get_image_captioner()
+# BLIP-large / BLIP-base 중 요청마다 등급을 고릅니다. (quality 파라미터 또는 부하에 따라 자동)
+caption_router = CaptionTierRouter.get_tier_router()
+CaptionQuality = Literal["auto", "quality", "fast"]
+QUALITY_DESCRIPTION = "캡션 모델 등급 (auto: 부하에 따라 자동, quality: BLIP-large, fast: BLIP-base)"
 
 # ----------------------------------------------------
 # A. Step 1: 사진 분석 API 구현 (POST /analyze/)
@@ -36,9 +64,13 @@ image_captioner = ImageCaptioner.get_image_captioner()
     response_model=BlipResult,
     summary="Step 1: 이미지 분석 및 BLIP 캡션 반환",
 )
-async def analyze_image_endpoint(image_file: UploadFile):
+async def analyze_image_endpoint(
+    image_file: UploadFile,
+    quality: CaptionQuality = Form("auto", description=QUALITY_DESCRIPTION),
+):
     """
     업로드된 사진 파일을 BLIP 모델로 분석하여 캡션(문자열)만 반환합니다.
+    응답의 model_tier는 실제로 캡션을 만든 모델 등급입니다. (근접 중복 재사용이면 None)
     """
     if image_file is None or image_file.filename is None or image_file.filename == "":
         raise HTTPException(
@@ -48,9 +80,17 @@ async def analyze_image_endpoint(image_file: UploadFile):
 
     image_data = await image_file.read()
 
+    model_tier = None
     try:
-        # run_in_threadpool을 사용하여 CPU-Bound 작업을 안전하게 실행
-        caption = await run_in_threadpool(image_captioner.get_blip_analyze, image_data)
+        # 이미 저장된 근접 중복 사진이 있으면 BLIP 추론 없이 그 캡션을 재사용합니다.
+        phash = await run_in_threadpool(image_hash, image_data)
+        duplicate = await crud.lookup_near_duplicate(phash)
+        if duplicate is not None:
+            caption = duplicate.blip_text
+        else:
+            # run_in_threadpool을 사용하여 CPU-Bound 작업을 안전하게 실행
+            with caption_router.serve(quality) as (model_tier, image_captioner):
+                caption = await run_in_threadpool(image_captioner.get_blip_analyze, image_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -62,17 +102,16 @@ async def analyze_image_endpoint(image_file: UploadFile):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Caption generation failed."
         )
 
-    # BLIP 결과(영어)를 LLM을 사용하여 한국어로 번역 (LLM 호출)
+    # BLIP 결과(영어)를 한국어로 번역 (TRANSLATION_BACKEND 설정에 따라 로컬 모델/LLM/번역 안 함)
     try:
-        # korean_caption = await translate_to_korean_async(caption)
-        korean_caption = caption
+        korean_caption = await translate_to_korean_async(caption)
     except Exception as e:
         # 번역 오류가 나더라도, 최소한 영어 캡션을 반환하여 Step 2를 진행 가능하게 함
-        print(f"Translation LLM call failed, returning English caption: {e}")
+        print(f"Translation failed, returning English caption: {e}")
         korean_caption = caption
 
     # 최종 한국어 캡션을 반환
-    return BlipResult(caption=korean_caption)
+    return BlipResult(caption=korean_caption, model_tier=model_tier)
 
 
 # ----------------------------------------------------
@@ -102,20 +141,29 @@ async def generate_llm_result(
     # 2. LLM 서비스 호출
     try:
         # 🌟 수정: BLIP 캡션(request.blip_caption)과 사용자 입력(request.user_input)만 전달
-        llm_result = await get_refined_caption_and_keywords_with_chatgpt_async(
+        # 제공자는 라우터가 지연/오류율로 선택하며, 느리면 다른 제공자로 헤지 요청을 보냅니다.
+        llm_result = await get_refined_caption_and_keywords_async(
             request.blip_caption,
-            request.user_input
+            request.user_input,
+            provider=request.llm_provider,
         )
         refined_caption = llm_result.get("refined_caption", "LLM 결과 추출 오류")
         keywords = llm_result.get("keywords", [])
+        provider = llm_result.get("provider")
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"LLM generation failed: {e}",
         )
+
+    # 제공자 실패/회로 open/마감 초과는 실패 문구로 돌아오므로 바로 503으로 응답합니다.
+    if "LLM API 호출 실패" in refined_caption:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=refined_caption
+        )
     
-    return LlmResult(diary=refined_caption, tags=keywords)
+    return LlmResult(diary=refined_caption, tags=keywords, provider=provider)
 
     # # 3. DB 저장을 위한 Pydantic 데이터 준비
     # data_to_create = ImageCreate(
@@ -142,3 +190,217 @@ async def generate_llm_result(
     #         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
     #         detail=f"데이터베이스 저장 중 오류 발생: {e}",
     #     )
+
+
+# ----------------------------------------------------
+# B-2. Step 2 대량 생성: 여러 사진의 일기/태그를 묶음 요청으로 생성 (POST /generate/batch/)
+# ----------------------------------------------------
+@router.post(
+    "/generate/batch/",
+    response_model=BatchLlmResult,
+    summary="Step 2 대량 생성: 여러 BLIP 결과를 묶어 LLM 일기/태그 일괄 생성",
+)
+async def generate_llm_results_batch(request: BatchGenerateRequest):
+    """
+    앨범 가져오기/백필용 엔드포인트입니다. 여러 항목을 LLM_BATCH_SIZE개씩 한 요청에 묶어 처리하고,
+    검증에 실패한 항목만 개별 호출로 다시 생성합니다. 결과는 요청 순서를 따릅니다.
+    끝내 생성하지 못한 항목은 diary 없이 error에 사유를 담습니다. (전체 응답은 200)
+    """
+    llm_results = await get_refined_captions_and_keywords_batch_async(
+        [(item.blip_caption, item.user_input) for item in request.items],
+        provider=request.llm_provider,
+    )
+    return BatchLlmResult(
+        results=[
+            BatchLlmItem(
+                diary=result.get("refined_caption"),
+                tags=result.get("keywords", []),
+                provider=result.get("provider"),
+                error=result.get("error"),
+            )
+            for result in llm_results
+        ]
+    )
+
+
+# ----------------------------------------------------
+# C. Step 2 (스트리밍): SSE로 일기 해설을 점진적으로 전달 (POST /generate/stream/)
+# ----------------------------------------------------
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """SSE(text/event-stream) 프레임 한 개를 만듭니다."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post(
+    "/generate/stream/",
+    summary="Step 2 (스트리밍): LLM 일기 해설을 SSE로 점진 전송",
+)
+async def generate_llm_result_stream(request: GenerateRequest):
+    """
+    /generate/ 와 같은 입력을 받되, 일기 해설을 생성되는 즉시 SSE 이벤트로 흘려보냅니다.
+
+    - event: caption → {"delta": "해설 조각"}
+    - event: done    → LlmResult 형식 {"diary": ..., "tags": [...]} (키워드는 마지막에 전달)
+    - event: error   → {"detail": "..."}
+    """
+
+    async def event_source():
+        async for event in stream_refined_caption_and_keywords_with_chatgpt_async(
+            request.blip_caption,
+            request.user_input,
+        ):
+            if event["event"] == "caption":
+                yield _format_sse("caption", {"delta": event["delta"]})
+            elif event["event"] == "done":
+                result = LlmResult(
+                    diary=event["refined_caption"], tags=event["keywords"]
+                )
+                yield _format_sse("done", result.model_dump())
+            else:
+                yield _format_sse("error", {"detail": event["detail"]})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 프록시(Nginx) 버퍼링 방지
+        },
+    )
+
+
+# ----------------------------------------------------
+# D. Step 1 + 2 통합: 사진 한 장으로 일기까지 생성 (POST /diary/)
+# ----------------------------------------------------
+@router.post(
+    "/diary/",
+    response_model=DiaryResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Step 1+2 통합: 이미지 분석과 LLM 일기/태그 생성을 한 번에 처리",
+)
+async def create_diary_endpoint(
+    background_tasks: BackgroundTasks,
+    image_file: UploadFile = File(..., description="이미지 파일"),
+    user_input: str = Form("사용자 음성 없음", description="사용자의 음성/텍스트 입력"),
+    latitude: Optional[float] = Form(None, description="위도"),
+    longitude: Optional[float] = Form(None, description="경도"),
+    location: Optional[str] = Form(None, description="위치 정보"),
+    llm_provider: Optional[str] = Form(None, description="LLM 제공자 (chatgpt/gemini)"),
+    quality: CaptionQuality = Form("auto", description=QUALITY_DESCRIPTION),
+    conditional_captions: bool = Form(
+        False, description="분위기/인물 조건부 캡션을 LLM 입력에 포함 (BLIP 디코딩 시간이 늘어남)"
+    ),
+):
+    """
+    /analyze/ → /generate/ 두 번의 왕복을 하나로 합친 엔드포인트입니다.
+
+    - BLIP 추론(스레드풀)이 도는 동안 LLM 연결 예열을 백그라운드로 진행합니다. (요청은 예열을 기다리지 않음)
+    - LLM 결과가 나오면 바로 응답하고, DB 저장은 응답 이후 백그라운드 작업으로 처리합니다.
+    - 이미 저장된 근접 중복 사진(dHash)이면 BLIP 추론을 건너뛰고 캡션을 재사용합니다.
+      해시 거리가 PHASH_DIARY_MAX_DISTANCE 이하이고 입력까지 같으면 일기/태그도 재사용합니다.
+    """
+    if image_file is None or not image_file.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No image file uploaded."
+        )
+
+    image_data = await image_file.read()
+
+    # 1. 축소 디코딩으로 dHash를 계산해, 연사처럼 거의 같은 사진이 이미 저장되어 있는지 확인합니다.
+    try:
+        phash = await run_in_threadpool(image_hash, image_data)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Image analysis failed: {e}",
+        )
+    duplicate = await crud.lookup_near_duplicate(phash)
+    # 같은 사진에 같은 입력이면 일기/태그까지 재사용하고, 입력이 다르면 캡션만 재사용해 LLM을 호출합니다.
+    # 일기는 사진마다 달라야 하므로, 캡션 재사용보다 엄격한 거리(PHASH_DIARY_MAX_DISTANCE)로 한 번 더 확인합니다.
+    reuse_diary = (
+        duplicate is not None
+        and hamming_distance(phash, duplicate.phash) <= settings.PHASH_DIARY_MAX_DISTANCE
+        and (duplicate.file_info or "") == (user_input or "")
+    )
+
+    # 2. 근접 중복이 아니면 BLIP 추론을 실행하고, 그 사이에 LLM 연결을 예열합니다.
+    # 예열은 백그라운드에서만 진행하며, 요청은 예열을 기다리지 않습니다.
+    if not reuse_diary:
+        llm_http_pool.warm_in_background(get_llm_warmup_urls())
+
+    details = None
+    model_tier = None
+    if duplicate is not None:
+        caption = duplicate.blip_text
+        embedding = image_similarity_index.get_vector(duplicate.id)
+        embedding_model = image_similarity_index.model
+    else:
+        # 캡션과 유사 이미지 검색용 임베딩을 받고, 요청한 경우에만 조건부 캡션(분위기, 인물 등)도 만듭니다.
+        # (분리 IR이 없으면 임베딩은 None이고 조건부 캡션도 만들지 않음)
+        # 임베딩 모델 이름은 등급마다 다르며, 유사도 인덱스는 BLIP-large 임베딩만 사용합니다.
+        try:
+            with caption_router.serve(quality) as (model_tier, image_captioner):
+                caption, details, embedding = await run_in_threadpool(
+                    image_captioner.get_blip_analyze_with_prompts,
+                    image_data,
+                    settings.BLIP_CONDITIONAL_PROMPTS if conditional_captions else (),
+                )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Image analysis failed: {e}",
+            )
+        embedding_model = image_captioner.embedding_model
+
+        if not caption:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Caption generation failed."
+            )
+
+    # 3. LLM 일기/태그 생성
+    if reuse_diary:
+        refined_caption = duplicate.refined_caption
+        keywords = [k.strip() for k in (duplicate.keywords or "").split(",") if k.strip()]
+        provider = None
+    else:
+        # 예열이 끝나지 않았거나 실패했어도 기다리지 않고 바로 LLM을 호출합니다.
+        llm_result = await get_refined_caption_and_keywords_async(
+            describe_with_details(caption, details), user_input, provider=llm_provider
+        )
+        refined_caption = llm_result.get("refined_caption", "LLM 결과 추출 오류")
+        keywords = llm_result.get("keywords", [])
+        provider = llm_result.get("provider")
+
+        if "LLM API 호출 실패" in refined_caption:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=refined_caption
+            )
+
+    # 4. DB 저장은 응답 경로에서 제외하고 백그라운드로 처리합니다.
+    background_tasks.add_task(
+        crud.save_image_data_in_background,
+        ImageCreate(
+            file=image_file.filename,
+            refined_caption=refined_caption,
+            blip_text=caption,
+            keywords=",".join(keywords) if keywords else None,
+            file_info=user_input,
+            latitude=latitude,
+            longitude=longitude,
+            location=location,
+            phash=phash,
+            embedding=to_blob(embedding) if embedding is not None else None,
+            embedding_model=embedding_model,
+        ),
+    )
+
+    return DiaryResult(
+        caption=caption,
+        diary=refined_caption,
+        tags=keywords,
+        provider=provider,
+        duplicate_of=duplicate.id if duplicate is not None else None,
+        model_tier=model_tier,
+    )
@@ -1,6 +1,6 @@
 # app/schemas/image.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
@@ -19,6 +19,7 @@ class BlipResult(BaseModel):
     """
 
     caption: str
+    model_tier: Optional[str] = None  # 캡션을 만든 BLIP 등급 (large/base, 근접 중복 재사용이면 None)
 
 
 # ----------------------------------------------------------------------
@@ -36,6 +37,8 @@ class GenerateRequest(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     location: Optional[str] = None
+    # 사용할 LLM 제공자 ("chatgpt" 또는 "gemini"). 생략하면 지연/오류율 기반으로 자동 선택
+    llm_provider: Optional[str] = None
 
 
 class LlmResult(BaseModel):
@@ -45,6 +48,51 @@ class LlmResult(BaseModel):
 
     diary: str
     tags: List[str]
+    provider: Optional[str] = None  # 실제로 응답한 LLM 제공자
+
+
+class BatchGenerateRequest(BaseModel):
+    """
+    대량 생성 요청 스키마: /generate/batch/ 엔드포인트 (앨범 가져오기, 백필 등)
+    """
+
+    items: List[GenerateRequest] = Field(..., min_length=1, max_length=200)
+    llm_provider: Optional[str] = None
+
+
+class BatchLlmItem(LlmResult):
+    """
+    대량 생성 결과 항목: 생성에 실패한 항목은 diary 없이 error에 사유를 담습니다.
+    """
+
+    diary: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchLlmResult(BaseModel):
+    """
+    대량 생성 응답 스키마: 요청 items와 같은 순서의 BatchLlmItem 리스트
+    """
+
+    results: List[BatchLlmItem]
+
+
+# ----------------------------------------------------------------------
+# B-2. 통합 API (/diary/) 응답 스키마 (Step 1 + Step 2를 한 번의 요청으로 처리)
+# ----------------------------------------------------------------------
+
+
+class DiaryResult(BaseModel):
+    """
+    통합 응답 스키마: BLIP 캡션과 LLM 일기 해설/태그를 함께 반환
+    """
+
+    caption: str  # BLIP 분석 결과
+    diary: str
+    tags: List[str]
+    provider: Optional[str] = None  # 실제로 응답한 LLM 제공자
+    duplicate_of: Optional[int] = None  # 캡션/일기를 재사용한 근접 중복 사진의 id
+    model_tier: Optional[str] = None  # 캡션을 만든 BLIP 등급 (large/base, 근접 중복 재사용이면 None)
 
 
 # ----------------------------------------------------------------------
@@ -76,7 +124,12 @@ class ImageCreate(ImageBase):
     데이터를 생성(INSERT)할 때 사용되는 스키마
     """
 
-    pass
+    phash: Optional[str] = None  # 근접 중복 검출용 dHash (16진수)
+    # BLIP 이미지 임베딩 (float16 바이트열). images 테이블이 아닌 image_embeddings에 저장되므로 model_dump에서 제외합니다.
+    embedding: Optional[bytes] = Field(default=None, exclude=True)
+    embedding_model: Optional[str] = Field(default=None, exclude=True)
+    # 가져오기(아카이브) 시 원래 작성 시각. 없으면 DB가 현재 시각으로 채웁니다.
+    created_at: Optional[datetime] = Field(default=None, exclude=True)
 
 
 class Image(ImageBase):
@@ -95,3 +148,134 @@ class Image(ImageBase):
         json_encoders = {
             Decimal: float,
         }
+
+
+# ----------------------------------------------------------------------
+# D. 일기 조회/검색 API (/diaries/) 응답 스키마
+# ----------------------------------------------------------------------
+
+
+class TagSearchResult(BaseModel):
+    """
+    태그 검색 응답 스키마: /diaries/tags/ 엔드포인트
+    """
+
+    tags: List[str]  # 정규화된 검색 태그
+    items: List[Image]
+    next_before_id: Optional[int] = None  # 다음 페이지 요청 시 before_id로 전달 (없으면 마지막 페이지)
+
+
+class DiarySearchResult(BaseModel):
+    """
+    전문 검색 응답 스키마: /diaries/search/ 엔드포인트 (관련도 순)
+    """
+
+    query: str
+    page: int
+    size: int
+    items: List[Image]
+    has_more: bool  # 다음 페이지 존재 여부
+
+
+class DiarySummary(BaseModel):
+    """
+    타임라인 목록 항목 스키마: 목록 화면에 필요한 필드만 포함합니다.
+    """
+
+    id: int
+    created_at: datetime
+    file: str
+    location: Optional[str] = None
+    tags: List[str]
+    preview: str  # 일기 해설 앞부분
+
+
+class DiaryPage(BaseModel):
+    """
+    타임라인 응답 스키마: /diaries/ 엔드포인트 (최신순, 커서 기반 페이지네이션)
+    """
+
+    items: List[DiarySummary]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달 (없으면 마지막 페이지)
+
+
+class NearbyDiary(DiarySummary):
+    """
+    주변 검색 항목 스키마: 목록 항목 + 기준 위치로부터의 거리
+    """
+
+    latitude: float
+    longitude: float
+    distance_m: float
+
+
+class NearbyResult(BaseModel):
+    """
+    주변 검색 응답 스키마: /diaries/nearby/ 엔드포인트 (가까운 순)
+    """
+
+    items: List[NearbyDiary]
+
+
+class SimilarDiary(DiarySummary):
+    """
+    유사 이미지 검색 항목 스키마: 목록 항목 + 코사인 유사도
+    """
+
+    score: float
+
+
+class SimilarResult(BaseModel):
+    """
+    유사 이미지 검색 응답 스키마: /diaries/{image_id}/similar/ 엔드포인트 (유사도 순)
+    """
+
+    image_id: int
+    items: List[SimilarDiary]
+
+
+
+class DaySummary(BaseModel):
+    """
+    달력 하루 칸 스키마: 일기 수, 상위 태그, 대표 일기(가장 최근 일기)
+    """
+
+    day: str  # YYYY-MM-DD (DIARY_TIMEZONE 기준)
+    count: int
+    top_tags: List[str]
+    representative: Optional[DiarySummary] = None
+
+
+class MonthSummary(BaseModel):
+    """
+    월별 요약 스키마: 일기 수, 상위 태그, 대표 일기(가장 최근 일기)
+    """
+
+    month: str  # YYYY-MM (DIARY_TIMEZONE 기준)
+    count: int
+    top_tags: List[str]
+    representative: Optional[DiarySummary] = None
+
+
+class MonthCalendar(MonthSummary):
+    """
+    달력 응답 스키마: /diaries/calendar/ 엔드포인트 (월 요약 + 일기가 있는 날짜별 요약)
+    """
+
+    days: List[DaySummary]
+
+
+class ImportIssue(BaseModel):
+    record: int  # 건너뛴 레코드의 위치 (1부터 시작)
+    detail: str
+
+
+class ImportResult(BaseModel):
+    """
+    가져오기 응답 스키마: /diaries/import/ 엔드포인트
+    """
+
+    imported: int
+    duplicates: int = 0  # 이미 있는 일기라 건너뛴 수
+    failed: int
+    errors: List[ImportIssue]  # 앞쪽 일부만 보고합니다.
@@ -0,0 +1,349 @@
+# app/services/archive.py
+"""
+일기 아카이브 내보내기/가져오기 (NDJSON, Parquet)
+
+사용법:
+    python -m app.services.archive export diaries.ndjson
+    python -m app.services.archive export diaries.parquet --format parquet
+    python -m app.services.archive import diaries.ndjson
+
+내보내기는 images 테이블을 서버 측 커서(yield_per)로 batch_size 행씩 읽어 바로 기록하므로,
+일기 수와 관계없이 메모리 사용량이 일정합니다. Parquet는 batch_size 행마다 row group 하나를 씁니다.
+가져오기는 batch_size 행씩 create_images_batch(다중 행 INSERT + 커밋 1회)로 저장하며, 이미 있는 일기는 건너뜁니다.
+Parquet 형식은 pyarrow가 설치되어 있어야 합니다. (requirements.txt의 pyarrow==17.0.0)
+"""
+
+import argparse
+import asyncio
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import AsyncSessionLocal
+from app.database.models import ImageModel
+from app.schemas.image import ImageCreate
+from app.services.crud import create_images_batch, to_utc_naive
+
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_FORMATS = ("ndjson", "parquet")
+MAX_REPORTED_ERRORS = 20
+
+# 내보내는 컬럼 (id/geohash/임베딩 등 가져올 때 다시 만들어지는 값은 제외)
+ARCHIVE_COLUMNS = (
+    "file",
+    "refined_caption",
+    "blip_text",
+    "file_info",
+    "location",
+    "keywords",
+    "latitude",
+    "longitude",
+    "phash",
+    "created_at",
+)
+
+
+def _parquet_modules():
+    """pyarrow는 Parquet를 쓸 때만 불러옵니다. (선택 의존성)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet 형식을 사용하려면 pyarrow를 설치하세요: pip install pyarrow==17.0.0") from e
+    return pa, pq
+
+
+def _to_record(row) -> Dict[str, Any]:
+    record = dict(row._mapping)
+    for key in ("latitude", "longitude"):
+        if isinstance(record[key], Decimal):
+            record[key] = float(record[key])
+    return record
+
+
+# ----------------------------------------------------
+# 내보내기
+# ----------------------------------------------------
+async def iter_archive_batches(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    images 테이블을 id 순으로 서버 측 커서로 읽어 batch_size개씩 레코드 목록을 돌려줍니다.
+    (스트리밍 응답은 요청 핸들러가 끝난 뒤에도 계속되므로, 세션을 직접 열고 닫습니다)
+    """
+    stmt = (
+        select(*(getattr(ImageModel, column) for column in ARCHIVE_COLUMNS))
+        .order_by(ImageModel.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield [_to_record(row) for row in partition]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def stream_ndjson(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """한 줄에 일기 하나(JSON)인 NDJSON을 batch_size 줄 단위로 돌려줍니다."""
+    async for records in iter_archive_batches(session_factory, batch_size):
+        yield "".join(
+            json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 스트리밍 응답으로 꺼내 가는 출력 스트림"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema(pa):
+    return pa.schema(
+        [
+            ("file", pa.string()),
+            ("refined_caption", pa.string()),
+            ("blip_text", pa.string()),
+            ("file_info", pa.string()),
+            ("location", pa.string()),
+            ("keywords", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("phash", pa.string()),
+            ("created_at", pa.timestamp("us")),
+        ]
+    )
+
+
+async def stream_parquet(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """batch_size 행마다 row group 하나를 쓰고, 쓰인 바이트를 바로 돌려주는 Parquet 스트림"""
+    pa, pq = _parquet_modules()
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for records in iter_archive_batches(session_factory, batch_size):
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()  # 파일 끝(footer)
+
+
+def stream_archive(
+    archive_format: str,
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    if archive_format == "ndjson":
+        return stream_ndjson(session_factory, batch_size)
+    if archive_format == "parquet":
+        _parquet_modules()  # 응답을 시작하기 전에 pyarrow 설치 여부를 확인합니다.
+        return stream_parquet(session_factory, batch_size)
+    raise ValueError(f"지원하지 않는 형식입니다: {archive_format} ({', '.join(ARCHIVE_FORMATS)})")
+
+
+# ----------------------------------------------------
+# 가져오기
+# ----------------------------------------------------
+def iter_ndjson(lines: Iterable[bytes]) -> Iterator[Optional[Dict[str, Any]]]:
+    """NDJSON 줄을 레코드로 읽습니다. 빈 줄은 건너뛰고, JSON이 아닌 줄은 None을 돌려줍니다."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+
+def iter_parquet(source, batch_size: int = ARCHIVE_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Parquet 파일을 row group 단위(batch_size 행)로 읽습니다."""
+    _, pq = _parquet_modules()
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def _parse_batch(
+    records: Iterator[Optional[Dict[str, Any]]], start: int, batch_size: int
+) -> Tuple[List[ImageCreate], List[Tuple[int, str]], int]:
+    """
+    레코드를 최대 batch_size개 읽어 검증합니다. (파일 읽기/JSON 파싱을 포함하므로 스레드풀에서 실행)
+
+    Returns:
+        (검증된 항목, [(위치, 사유), ...] 잘못된 레코드, 마지막으로 읽은 위치)
+    """
+    items: List[ImageCreate] = []
+    issues: List[Tuple[int, str]] = []
+    position = start
+    for record in islice(records, batch_size):
+        position += 1
+        try:
+            if record is None:
+                raise ValueError("invalid JSON object")
+            values = {key: record[key] for key in ARCHIVE_COLUMNS if record.get(key) is not None}
+            values.setdefault("blip_text", "")  # BLIP 캡션 없이 저장된 옛 행
+            items.append(ImageCreate.model_validate(values))
+        except (ValidationError, ValueError) as e:
+            issues.append((position, str(e).splitlines()[0]))
+    return items, issues, position
+
+
+def _archive_key(file: str, phash: Optional[str], created_at: datetime) -> Tuple[str, Optional[str], datetime]:
+    """같은 일기인지 판단하는 키: (파일 이름, 이미지 해시, 작성 시각)"""
+    return file, phash, created_at
+
+
+async def _existing_keys(db, items: List[ImageCreate]) -> Set[Tuple[str, Optional[str], datetime]]:
+    """작성 시각이 같은 기존 행의 키를 ix_images_created_at_id 인덱스로 조회합니다."""
+    timestamps = {to_utc_naive(item.created_at) for item in items if item.created_at is not None}
+    if not timestamps:
+        return set()
+    result = await db.execute(
+        select(ImageModel.file, ImageModel.phash, ImageModel.created_at).where(
+            ImageModel.created_at.in_(timestamps)
+        )
+    )
+    return {_archive_key(*row) for row in result.all()}
+
+
+async def import_records(
+    records: Iterable[Optional[Dict[str, Any]]],
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    레코드를 batch_size개씩 create_images_batch로 저장합니다.
+    (키워드 역색인, geohash, 일별/월별 집계도 일반 저장과 똑같이 갱신됩니다)
+    형식이 잘못된 레코드는 건너뛰고, 앞쪽 일부의 위치(1부터 시작)와 사유를 돌려줍니다.
+    파일 이름, 이미지 해시, 작성 시각이 모두 같은 일기가 이미 있으면 저장하지 않으므로,
+    같은 파일을 여러 번 가져와도 일기가 중복되지 않습니다.
+    파일 읽기와 파싱은 스레드풀에서 실행하므로 이벤트 루프를 막지 않습니다.
+
+    Returns:
+        {"imported": 저장한 수, "duplicates": 이미 있어 건너뛴 수, "failed": 잘못되어 건너뛴 수,
+         "errors": [{"record": 위치, "detail": 사유}, ...]}
+    """
+    imported = duplicates = failed = 0
+    errors: List[Dict[str, Any]] = []
+    records = iter(records)
+    position = 0
+
+    while True:
+        batch, issues, next_position = await run_in_threadpool(_parse_batch, records, position, batch_size)
+        failed += len(issues)
+        for record, detail in issues[: MAX_REPORTED_ERRORS - len(errors)]:
+            errors.append({"record": record, "detail": detail})
+        if next_position == position:
+            break
+        position = next_position
+        if not batch:
+            continue
+
+        async with session_factory() as db:
+            seen = await _existing_keys(db, batch)
+            new_items = []
+            for item in batch:
+                if item.created_at is not None:
+                    key = _archive_key(item.file, item.phash, to_utc_naive(item.created_at))
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                new_items.append(item)
+            imported += len(await create_images_batch(db, new_items))
+
+    return {"imported": imported, "duplicates": duplicates, "failed": failed, "errors": errors}
+
+
+# ----------------------------------------------------
+# CLI
+# ----------------------------------------------------
+def _guess_format(path: str, archive_format: Optional[str]) -> str:
+    if archive_format:
+        return archive_format
+    return "parquet" if path.endswith(".parquet") else "ndjson"
+
+
+async def export_to_file(path: str, archive_format: str, batch_size: int) -> None:
+    written = 0
+    with open(path, "wb") as output:
+        async for chunk in stream_archive(archive_format, batch_size=batch_size):
+            output.write(chunk)
+            written += len(chunk)
+    print(f"Exported diaries to {path} ({written} bytes).")
+
+
+async def import_from_file(path: str, archive_format: str, batch_size: int) -> Dict[str, Any]:
+    with open(path, "rb") as source:
+        records = iter_parquet(source, batch_size) if archive_format == "parquet" else iter_ndjson(source)
+        result = await import_records(records, batch_size=batch_size)
+    print(
+        f"Imported {result['imported']} diaries "
+        f"({result['duplicates']} already present, {result['failed']} skipped)."
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일기 아카이브 내보내기/가져오기")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="내보낼/가져올 파일 경로")
+    parser.add_argument("--format", choices=ARCHIVE_FORMATS, default=None, help="생략 시 확장자로 판단")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    archive_format = _guess_format(args.path, args.format)
+    if args.command == "export":
+        asyncio.run(export_to_file(args.path, archive_format, args.batch_size))
+    else:
+        asyncio.run(import_from_file(args.path, archive_format, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
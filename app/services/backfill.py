@@ -0,0 +1,177 @@
+# app/services/backfill.py
+"""
+기존 일기 데이터를 새 색인/집계 구조에 맞게 채우는 서버 시작 작업
+
+스키마 마이그레이션(app.database.migrations.run_migrations) 이후에 실행합니다.
+태그 정규화, geohash 계산 같은 서비스 계층 로직을 사용하므로 database 패키지가 아닌 이곳에 둡니다.
+
+사용법:
+    python -m app.services.backfill                      # 서버 시작 시와 같은 마이그레이션/백필 실행
+    python -m app.services.backfill --rebuild-summaries  # 일별/월별 집계를 처음부터 다시 계산
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import AsyncSessionLocal, Base, async_engine
+from app.database.migrations import run_migrations
+from app.database.models import DailySummaryModel, ImageModel, image_keywords
+from app.database.summaries import replace_summaries
+from app.services.crud import attach_keywords, compute_geohash, normalize_keywords
+
+BACKFILL_BATCH_SIZE = 500
+
+
+async def backfill_image_keywords(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """
+    keywords 문자열은 있지만 image_keywords 역색인에 연결되지 않은 기존 행을 채웁니다.
+    여러 번 실행해도 안전하며(이미 연결된 행은 건너뜀), 채운 이미지 수를 반환합니다.
+    """
+    linked = select(image_keywords.c.image_id).where(
+        image_keywords.c.image_id == ImageModel.id
+    )
+    last_id = 0
+    filled = 0
+    while True:
+        async with session_factory() as db:
+            rows = (
+                await db.execute(
+                    select(ImageModel.id, ImageModel.keywords)
+                    .where(
+                        ImageModel.id > last_id,
+                        ImageModel.keywords.is_not(None),
+                        ~linked.exists(),
+                    )
+                    .order_by(ImageModel.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+
+            for image_id, keywords in rows:
+                names = normalize_keywords(keywords)
+                if names:
+                    await attach_keywords(db, image_id, names)
+                    filled += 1
+            await db.commit()
+            last_id = rows[-1].id
+
+    if filled:
+        print(f"Backfilled keyword index for {filled} images.")
+    return filled
+
+
+async def backfill_geohash(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """
+    위도/경도는 있지만 geohash가 비어 있는 기존 행의 geohash를 채우고, 채운 행 수를 반환합니다.
+    """
+    last_id = 0
+    filled = 0
+    while True:
+        async with session_factory() as db:
+            rows = (
+                await db.execute(
+                    select(ImageModel.id, ImageModel.latitude, ImageModel.longitude)
+                    .where(
+                        ImageModel.id > last_id,
+                        ImageModel.geohash.is_(None),
+                        ImageModel.latitude.is_not(None),
+                        ImageModel.longitude.is_not(None),
+                    )
+                    .order_by(ImageModel.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+
+            for image_id, latitude, longitude in rows:
+                await db.execute(
+                    update(ImageModel)
+                    .where(ImageModel.id == image_id)
+                    .values(geohash=compute_geohash(latitude, longitude))
+                )
+            await db.commit()
+            filled += len(rows)
+            last_id = rows[-1].id
+
+    if filled:
+        print(f"Backfilled geohash for {filled} images.")
+    return filled
+
+
+async def rebuild_diary_summaries(
+    session_factory: sessionmaker = AsyncSessionLocal,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    only_if_empty: bool = False,
+) -> int:
+    """
+    images 테이블 전체로 일별/월별 집계 테이블을 다시 만들고, 집계한 일기 수를 반환합니다.
+    only_if_empty=True이면 집계가 비어 있고 일기가 있을 때만(첫 배포) 실행합니다.
+    """
+    async with session_factory() as db:
+        if only_if_empty:
+            summarized = (await db.execute(select(func.count()).select_from(DailySummaryModel))).scalar()
+            if summarized:
+                return 0
+
+        entries = []
+        result = await db.stream(
+            select(ImageModel.id, ImageModel.created_at, ImageModel.keywords)
+            .order_by(ImageModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            entries.extend(
+                (row.id, row.created_at, normalize_keywords(row.keywords)) for row in partition
+            )
+        if only_if_empty and not entries:
+            return 0
+
+        # 비우기와 다시 채우기를 한 트랜잭션에서 처리하므로, 도중에 읽는 요청은 이전 집계를 봅니다.
+        rebuilt = await replace_summaries(db, entries)
+        await db.commit()
+
+    print(f"Rebuilt diary summaries from {rebuilt} images.")
+    return rebuilt
+
+
+async def run_backfills(session_factory: sessionmaker = AsyncSessionLocal) -> None:
+    """
+    서버 시작 시(run_migrations 이후) 실행하는 데이터 백필 목록입니다. 여러 번 실행해도 안전합니다.
+    """
+    await backfill_image_keywords(session_factory)
+    await backfill_geohash(session_factory)
+    await rebuild_diary_summaries(session_factory, only_if_empty=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DB 마이그레이션 / 데이터 백필 / 집계 재계산")
+    parser.add_argument(
+        "--rebuild-summaries", action="store_true", help="images 전체로 일별/월별 집계를 다시 만듭니다."
+    )
+    args = parser.parse_args()
+
+    async def run() -> None:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await run_migrations()
+        await run_backfills()
+        if args.rebuild_summaries:
+            await rebuild_diary_summaries()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# app/services/circuit_breaker.py
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출을 시도하지 않고 즉시 실패할 때 발생합니다."""
+
+
+class CircuitBreaker:
+    """
+    LLM 제공자 호출을 감싸는 서킷 브레이커입니다.
+
+    - closed: 정상 상태. 연속 실패(또는 느린 호출)가 failure_threshold에 도달하면 open으로 전환합니다.
+    - open: reset_timeout 동안 호출을 시도하지 않고 즉시 실패시킵니다.
+    - half-open: reset_timeout이 지나면 탐색 호출을 half_open_max_calls개만 허용합니다.
+      탐색 호출이 성공하면 closed, 실패하면 다시 open으로 돌아갑니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_threshold: Optional[float] = None,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        # 이 시간(초)보다 오래 걸린 호출은 성공했더라도 실패로 집계합니다. None이면 사용하지 않음
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        # open 상태에서 reset_timeout이 지나면 half-open으로 전환합니다. (lock 안에서 호출)
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            print(f"[CircuitBreaker] '{self.name}' half-open: probing recovery")
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        print(
+            f"[CircuitBreaker] '{self.name}' opened after "
+            f"{self._consecutive_failures} consecutive failures"
+        )
+
+    def allow(self) -> bool:
+        """지금 호출을 시도해도 되는지 반환합니다. half-open에서는 탐색 호출 수를 예약합니다."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+
+    def before_call(self) -> None:
+        """호출할 수 없으면 CircuitOpenError를 발생시킵니다."""
+        if not self.allow():
+            raise CircuitOpenError(f"LLM 제공자 '{self.name}' 회로가 열려 있습니다.")
+
+    def record_success(self, latency: float = 0.0) -> None:
+        if self.slow_call_threshold is not None and latency > self.slow_call_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"[CircuitBreaker] '{self.name}' closed: provider recovered")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def release(self) -> None:
+        """
+        결과 없이 끝난 호출(헤지 경쟁에서 취소 등)의 half-open 탐색 예약을 반환합니다.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
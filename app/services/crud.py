@@ -1,8 +1,29 @@
 # app/services/crud.py
 
+import base64
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.database.models import ImageModel
+from sqlalchemy import and_, func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.database.fulltext import build_search_query
+from app.database.summaries import apply_summary_entries
+from app.database.models import (
+    DailySummaryModel,
+    ImageEmbeddingModel,
+    ImageModel,
+    KeywordModel,
+    MonthlySummaryModel,
+    image_keywords,
+    summary_keywords,
+)
+from app.services.write_behind import WriteBehindQueue
+from app.services.geo import covering_prefixes, encode_geohash, haversine_m, prefix_range
+from app.services.similarity import from_blob, image_similarity_index
+from app.services.dedup import image_hash_index
 from app.schemas.image import (
     ImageCreate,
     Image,
@@ -23,12 +44,28 @@ async def create_image_data(db: AsyncSession, image_data: ImageCreate) -> Image:
     """
     # Pydantic 모델을 딕셔너리로 변환하여 SQLAlchemy 모델 객체 생성
     db_image = ImageModel(**image_data.model_dump())
+    db_image.geohash = compute_geohash(image_data.latitude, image_data.longitude)
+    if image_data.created_at is not None:
+        db_image.created_at = to_utc_naive(image_data.created_at)
 
     # DB 세션에 추가
     db.add(db_image)
 
+    # id를 발급받은 뒤, 같은 트랜잭션 안에서 키워드 역색인(image_keywords)을 채웁니다.
+    await db.flush()
+    names = normalize_keywords(image_data.keywords)
+    await attach_keywords(db, db_image.id, names)
+    # 일별/월별 집계도 같은 트랜잭션에서 갱신합니다. (저장 시각은 DB가 정하므로 다시 읽어 옵니다)
+    await db.refresh(db_image, ["created_at"])
+    await apply_summary_entries(db, [(db_image.id, db_image.created_at, names)])
+    embedding_rows = _embedding_rows([(db_image.id, image_data)])
+    if embedding_rows:
+        await db.execute(insert(ImageEmbeddingModel), embedding_rows)
+
     # DB에 커밋 (비동기)
     await db.commit()
+    _index_embeddings(embedding_rows)
+    image_hash_index.add(db_image.id, image_data.phash)
 
     # DB에서 최신 데이터(id, created_at 포함)를 반영하도록 새로고침
     await db.refresh(db_image)
@@ -37,6 +74,186 @@ async def create_image_data(db: AsyncSession, image_data: ImageCreate) -> Image:
     return Image.model_validate(db_image)
 
 
+async def create_images_batch(db: AsyncSession, items: List[ImageCreate]) -> List[int]:
+    """
+    여러 이미지 데이터를 다중 행 INSERT ... RETURNING 한 번과 커밋 한 번으로 저장합니다.
+    create_image_data와 같은 부가 작업(geohash 계산, 키워드 역색인, 일별/월별 집계)도 같은 트랜잭션에서 처리합니다.
+
+    Returns:
+        items와 같은 순서의 저장된 id 목록
+    """
+    if not items:
+        return []
+
+    rows = []
+    for item in items:
+        row = item.model_dump()
+        row["geohash"] = compute_geohash(item.latitude, item.longitude)
+        if item.created_at is not None:
+            row["created_at"] = to_utc_naive(item.created_at)
+        rows.append(row)
+
+    try:
+        result = await db.execute(
+            insert(ImageModel).returning(
+                ImageModel.id, ImageModel.created_at, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        inserted = result.all()
+        image_ids = [row.id for row in inserted]
+        names = [normalize_keywords(item.keywords) for item in items]
+        await attach_keywords_many(db, dict(zip(image_ids, names)))
+        await apply_summary_entries(
+            db,
+            [(row.id, row.created_at, row_names) for row, row_names in zip(inserted, names)],
+        )
+        embedding_rows = _embedding_rows(zip(image_ids, items))
+        if embedding_rows:
+            await db.execute(insert(ImageEmbeddingModel), embedding_rows)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    _index_embeddings(embedding_rows)
+    for image_id, item in zip(image_ids, items):
+        image_hash_index.add(image_id, item.phash)
+    return image_ids
+
+
+async def _flush_image_batch(items: List[ImageCreate]) -> List[int]:
+    async with AsyncSessionLocal() as db:
+        return await create_images_batch(db, items)
+
+
+# 요청 처리 경로의 저장을 모아 배치로 커밋하는 write-behind 큐 (FastAPI lifespan에서 start/close)
+image_write_queue: WriteBehindQueue[ImageCreate] = WriteBehindQueue(
+    _flush_image_batch,
+    max_batch_size=settings.DB_WRITE_BATCH_SIZE,
+    max_delay=settings.DB_WRITE_MAX_DELAY_MS / 1000,
+    name="image-write-queue",
+)
+
+
+async def save_image_data_in_background(image_data: ImageCreate) -> Optional[int]:
+    """
+    응답 이후 BackgroundTasks에서 실행되는 저장 함수입니다.
+    write-behind 큐에 넣어 다른 요청의 레코드와 함께 배치로 저장하며, 저장된 id를 반환합니다.
+    실패해도 이미 보낸 응답에는 영향을 주지 않으므로 로그만 남깁니다.
+    """
+    try:
+        return await image_write_queue.submit(image_data)
+    except Exception as e:
+        print(f"Background database saving error: {e}")
+        return None
+
+
+def _embedding_rows(pairs) -> List[Dict[str, Any]]:
+    """(image_id, ImageCreate) 쌍에서 image_embeddings 테이블에 넣을 행을 만듭니다. (임베딩 없는 항목 제외)"""
+    rows = []
+    for image_id, item in pairs:
+        if item.embedding is None or not item.embedding_model:
+            continue
+        rows.append(
+            {
+                "image_id": image_id,
+                "model": item.embedding_model,
+                "dim": len(item.embedding) // 2,  # float16
+                "vector": item.embedding,
+            }
+        )
+    return rows
+
+
+def _index_embeddings(rows: List[Dict[str, Any]]) -> None:
+    """커밋된 임베딩을 인메모리 유사도 인덱스에 반영합니다. (인덱스와 같은 모델의 임베딩만)"""
+    for row in rows:
+        if image_similarity_index.model is None:
+            image_similarity_index.model = row["model"]
+        if row["model"] == image_similarity_index.model:
+            image_similarity_index.add(row["image_id"], from_blob(row["vector"]))
+
+
+# SQLAlchemy가 SQLite DateTime 컬럼에 기록하는 형식 (소수점 초가 0이어도 생략하지 않음)
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """created_at 컬럼은 UTC 기준 naive datetime으로 저장합니다."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def compute_geohash(latitude, longitude) -> Optional[str]:
+    """위도/경도가 모두 있으면 geohash를, 아니면 None을 반환합니다."""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(float(latitude), float(longitude))
+
+
+# --- 1-2. 키워드(태그) 역색인 ---
+KEYWORD_MAX_LENGTH = 100
+
+
+def normalize_keywords(keywords: Optional[str]) -> List[str]:
+    """
+    콤마로 구분된 키워드 문자열을 태그 목록으로 정규화합니다.
+    (공백/'#' 제거, 영문 소문자화, 빈 값과 중복 제거, 순서 유지)
+    """
+    names: List[str] = []
+    for raw in (keywords or "").split(","):
+        name = raw.strip().lstrip("#").strip().lower()[:KEYWORD_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _insert_ignoring_duplicates(db: AsyncSession, table):
+    """
+    이미 존재하는 행은 건너뛰는 INSERT 문을 만듭니다. (동시 저장 시 같은 태그 경합 대비)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+async def attach_keywords(db: AsyncSession, image_id: int, names: List[str]) -> None:
+    """
+    키워드 사전(keywords)에 없는 태그를 추가하고, 이미지와 태그를 연결합니다. 커밋은 호출자가 합니다.
+    """
+    await attach_keywords_many(db, {image_id: names})
+
+
+async def attach_keywords_many(db: AsyncSession, links: Dict[int, List[str]]) -> None:
+    """
+    여러 이미지의 태그를 한 번에 연결합니다. (사전 INSERT 1회, 조회 1회, 연결 INSERT 1회)
+    """
+    all_names = sorted({name for names in links.values() for name in names})
+    if not all_names:
+        return
+
+    await db.execute(
+        _insert_ignoring_duplicates(db, KeywordModel.__table__),
+        [{"name": name} for name in all_names],
+    )
+    result = await db.execute(
+        select(KeywordModel.name, KeywordModel.id).where(KeywordModel.name.in_(all_names))
+    )
+    keyword_ids = dict(result.all())
+    await db.execute(
+        _insert_ignoring_duplicates(db, image_keywords),
+        [
+            {"image_id": image_id, "keyword_id": keyword_ids[name]}
+            for image_id, names in links.items()
+            for name in names
+        ],
+    )
+
+
 # --- 2. 데이터 조회(READ) ---
 async def get_image_data(db: AsyncSession, image_id: int) -> ImageModel | None:
     """
@@ -61,4 +278,408 @@ async def get_image_data(db: AsyncSession, image_id: int) -> ImageModel | None:
     return db_image
 
 
+async def search_images_by_tags(
+    db: AsyncSession,
+    tags: List[str],
+    match_all: bool = True,
+    limit: int = 20,
+    before_id: Optional[int] = None,
+) -> List[ImageModel]:
+    """
+    태그로 일기를 검색합니다. image_keywords 역색인만 사용하므로 전체 테이블을 스캔하지 않습니다.
+
+    Args:
+        tags: 검색할 태그 목록.
+        match_all: True이면 모든 태그를 가진 일기만, False이면 하나라도 가진 일기를 반환합니다.
+        limit: 최대 반환 개수.
+        before_id: 이전 페이지의 마지막 id (이보다 작은 id만 반환, 최신순).
+
+    Returns:
+        id 내림차순(최신순) ImageModel 목록.
+    """
+    names = normalize_keywords(",".join(tags))
+    if not names:
+        return []
+
+    stmt = (
+        select(image_keywords.c.image_id)
+        .join(KeywordModel, KeywordModel.id == image_keywords.c.keyword_id)
+        .where(KeywordModel.name.in_(names))
+        .group_by(image_keywords.c.image_id)
+        .order_by(image_keywords.c.image_id.desc())
+        .limit(limit)
+    )
+    if match_all:
+        stmt = stmt.having(func.count() == len(names))
+    if before_id is not None:
+        stmt = stmt.where(image_keywords.c.image_id < before_id)
+
+    image_ids = (await db.execute(stmt)).scalars().all()
+    if not image_ids:
+        return []
+
+    result = await db.execute(
+        select(ImageModel).where(ImageModel.id.in_(image_ids)).order_by(ImageModel.id.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def search_images_fulltext(
+    db: AsyncSession, query: str, limit: int = 20, offset: int = 0
+) -> List[ImageModel]:
+    """
+    일기 해설/BLIP 캡션/사용자 입력을 전문 검색하여 관련도 순으로 반환합니다.
+    (SQLite: FTS5 trigram + bm25, PostgreSQL: pg_trgm)
+
+    Args:
+        query: 공백으로 구분된 검색어. 모든 단어를 포함하는 일기만 반환합니다.
+        limit: 최대 반환 개수.
+        offset: 건너뛸 개수 (페이지 이동).
+    """
+    if not query.strip():
+        return []
+
+    sql, params = build_search_query(db.get_bind().dialect.name, query, limit, offset)
+    image_ids = (await db.execute(text(sql), params)).scalars().all()
+    if not image_ids:
+        return []
+
+    result = await db.execute(select(ImageModel).where(ImageModel.id.in_(image_ids)))
+    images = {image.id: image for image in result.scalars()}
+    # 관련도 순서를 유지합니다.
+    return [images[image_id] for image_id in image_ids if image_id in images]
+
+
+# --- 3. 타임라인(목록) 조회: 키셋 페이지네이션 ---
+DIARY_PREVIEW_LENGTH = 120
+
+
+def encode_cursor(created_at: datetime, image_id: int) -> str:
+    """페이지 마지막 행의 (created_at, id)를 불투명한 커서 문자열로 만듭니다."""
+    raw = f"{created_at.isoformat()}|{image_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 문자열을 (created_at, id)로 되돌립니다. 형식이 잘못되면 ValueError가 발생합니다."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, image_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(image_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+def _cursor_timestamp(db: AsyncSession, created_at: datetime) -> Any:
+    """
+    SQLite는 DateTime을 문자열로 비교하므로, 커서 시각을 저장된 값과 같은 형식으로 바인딩합니다.
+    (created_at은 항상 SQLAlchemy가 'YYYY-MM-DD HH:MM:SS.ffffff' 형식으로 기록합니다. normalize_sqlite_timestamps 참고)
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return created_at
+    return created_at.strftime(SQLITE_TIMESTAMP_FORMAT)
+
+
+async def list_diary_summaries(
+    db: AsyncSession, limit: int = 20, cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    최신순 타임라인 한 페이지를 조회합니다. OFFSET 대신 (created_at, id) 키셋 조건을 사용하므로
+    몇 번째 페이지든 ix_images_created_at_id 인덱스 범위 스캔 한 번으로 끝납니다.
+    목록 화면에 필요한 컬럼만 조회합니다.
+
+    Returns:
+        (행 목록, 다음 페이지 커서 또는 None)
+    """
+    stmt = (
+        select(
+            ImageModel.id,
+            ImageModel.created_at,
+            ImageModel.file,
+            ImageModel.location,
+            ImageModel.keywords,
+            func.substr(ImageModel.refined_caption, 1, DIARY_PREVIEW_LENGTH).label("preview"),
+        )
+        .order_by(ImageModel.created_at.desc(), ImageModel.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, image_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(ImageModel.created_at, ImageModel.id)
+            < tuple_(_cursor_timestamp(db, created_at), image_id)
+        )
+
+    rows = (await db.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+# --- 4. 위치 기반 조회: "이 근처의 추억" ---
+async def find_images_near(
+    db: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    limit: int = 20,
+) -> List[Tuple[Any, float]]:
+    """
+    반경(미터) 안의 일기를 가까운 순으로 반환합니다.
+
+    1) 반경 원을 덮는 geohash 셀(최대 9개)의 prefix 범위로 인덱스를 검색해 후보를 좁히고,
+    2) 후보만 실제 거리(haversine)로 걸러 정렬합니다.
+
+    Returns:
+        (목록용 행, 거리(m)) 튜플 목록
+    """
+    ranges = [prefix_range(prefix) for prefix in covering_prefixes(latitude, longitude, radius_m)]
+    stmt = select(
+        ImageModel.id,
+        ImageModel.created_at,
+        ImageModel.file,
+        ImageModel.location,
+        ImageModel.keywords,
+        func.substr(ImageModel.refined_caption, 1, DIARY_PREVIEW_LENGTH).label("preview"),
+        ImageModel.latitude,
+        ImageModel.longitude,
+    ).where(
+        or_(*(and_(ImageModel.geohash >= start, ImageModel.geohash < end) for start, end in ranges))
+    )
+
+    matches = []
+    for row in (await db.execute(stmt)).all():
+        distance = haversine_m(latitude, longitude, float(row.latitude), float(row.longitude))
+        if distance <= radius_m:
+            matches.append((row, distance))
+    matches.sort(key=lambda match: (match[1], -match[0].id))
+    return matches[:limit]
+
+
+# --- 5. 유사 이미지 조회: "이 사진과 비슷한 추억" ---
+async def load_similarity_index(db: AsyncSession, model: str, batch_size: int = 5000) -> int:
+    """
+    저장된 임베딩 중 model로 만든 것을 인메모리 유사도 인덱스로 읽어 들입니다.
+    벡터 수가 많으면 IVF 분할을 만듭니다.
+
+    Returns:
+        적재한 임베딩 수
+    """
+    image_similarity_index.model = model
+    stmt = (
+        select(ImageEmbeddingModel.image_id, ImageEmbeddingModel.vector)
+        .where(ImageEmbeddingModel.model == model)
+        .execution_options(yield_per=batch_size)
+    )
+    loaded = 0
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        image_similarity_index.add_many(
+            [row.image_id for row in partition],
+            [from_blob(row.vector) for row in partition],
+        )
+        loaded += len(partition)
+    image_similarity_index.maybe_build_ivf()
+    return loaded
+
+
+async def get_image_embedding(db: AsyncSession, image_id: int):
+    """인덱스에 있으면 인덱스에서, 없으면 DB에서 이미지 임베딩을 읽습니다. 없으면 None"""
+    vector = image_similarity_index.get_vector(image_id)
+    if vector is not None:
+        return vector
+    row = await db.get(ImageEmbeddingModel, image_id)
+    if row is None or row.model != image_similarity_index.model:
+        return None
+    return from_blob(row.vector)
+
+
+async def find_similar_images(
+    db: AsyncSession, image_id: int, limit: int = 10
+) -> Optional[List[Tuple[Any, float]]]:
+    """
+    image_id의 사진과 임베딩이 가까운 일기를 유사도 순으로 반환합니다.
+
+    Returns:
+        (목록용 행, 코사인 유사도) 튜플 목록. 기준 이미지에 임베딩이 없으면 None
+    """
+    query = await get_image_embedding(db, image_id)
+    if query is None:
+        return None
+    hits = image_similarity_index.search(query, k=limit, exclude_ids=[image_id])
+    if not hits:
+        return []
+
+    stmt = select(
+        ImageModel.id,
+        ImageModel.created_at,
+        ImageModel.file,
+        ImageModel.location,
+        ImageModel.keywords,
+        func.substr(ImageModel.refined_caption, 1, DIARY_PREVIEW_LENGTH).label("preview"),
+    ).where(ImageModel.id.in_([hit_id for hit_id, _ in hits]))
+    rows = {row.id: row for row in (await db.execute(stmt)).all()}
+    # 인덱스에는 있지만 이미 삭제된 행은 건너뜁니다.
+    return [(rows[hit_id], score) for hit_id, score in hits if hit_id in rows]
+
+
+# --- 6. 근접 중복 사진 조회: 연사 등 거의 같은 사진의 결과 재사용 ---
+NEAR_DUPLICATE_CANDIDATES = 5
+
+
+async def load_hash_index(db: AsyncSession, batch_size: int = 5000) -> int:
+    """
+    저장된 perceptual hash를 BK-tree 인덱스로 읽어 들입니다.
+
+    Returns:
+        적재한 해시 수
+    """
+    stmt = (
+        select(ImageModel.id, ImageModel.phash)
+        .where(ImageModel.phash.is_not(None))
+        .execution_options(yield_per=batch_size)
+    )
+    loaded = 0
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        for row in partition:
+            image_hash_index.add(row.id, row.phash)
+        loaded += len(partition)
+    return loaded
+
+
+async def find_near_duplicate(db: AsyncSession, phash: Optional[str]) -> Optional[ImageModel]:
+    """
+    dHash 해밍 거리가 PHASH_MAX_DISTANCE 이하인 기존 사진 중 가장 가까운 것을 반환합니다.
+    재사용할 캡션(blip_text)이 없는 행은 건너뜁니다.
+    """
+    if not phash:
+        return None
+    for distance, image_id in image_hash_index.find(phash)[:NEAR_DUPLICATE_CANDIDATES]:
+        row = await db.get(ImageModel, image_id)
+        if row is not None and row.blip_text:
+            print(f"Near-duplicate of image {image_id} (distance {distance}), reusing its caption.")
+            return row
+    return None
+
+
+async def lookup_near_duplicate(phash: Optional[str]) -> Optional[ImageModel]:
+    """
+    DB 세션 의존성이 없는 라우터용 조회 함수입니다.
+    인메모리 인덱스에 후보가 없으면 DB에 연결하지 않습니다.
+    """
+    if not phash or not image_hash_index.find(phash):
+        return None
+    async with AsyncSessionLocal() as db:
+        return await find_near_duplicate(db, phash)
+
+
+# --- 7. 달력/이번 달 화면: 미리 집계된 일별·월별 요약 조회 ---
+SUMMARY_TOP_TAGS = 5
+
+
+async def get_top_summary_keywords(
+    db: AsyncSession, period_filter, limit: int = SUMMARY_TOP_TAGS
+) -> Dict[str, List[str]]:
+    """
+    period_filter 조건에 맞는 기간들의 상위 태그를 기간별로 반환합니다. (횟수 내림차순, 같으면 이름순)
+    """
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=summary_keywords.c.period,
+            order_by=(summary_keywords.c.entry_count.desc(), summary_keywords.c.keyword),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(summary_keywords.c.period, summary_keywords.c.keyword, rank)
+        .where(period_filter)
+        .subquery()
+    )
+    stmt = (
+        select(ranked.c.period, ranked.c.keyword)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.period, ranked.c.rank)
+    )
+    top: Dict[str, List[str]] = {}
+    for period, keyword in (await db.execute(stmt)).all():
+        top.setdefault(period, []).append(keyword)
+    return top
+
+
+async def get_diary_summaries_by_ids(db: AsyncSession, image_ids: List[int]) -> Dict[int, Any]:
+    """대표 일기 등 id 목록의 목록용 행을 {id: 행}으로 반환합니다."""
+    if not image_ids:
+        return {}
+    stmt = select(
+        ImageModel.id,
+        ImageModel.created_at,
+        ImageModel.file,
+        ImageModel.location,
+        ImageModel.keywords,
+        func.substr(ImageModel.refined_caption, 1, DIARY_PREVIEW_LENGTH).label("preview"),
+    ).where(ImageModel.id.in_(set(image_ids)))
+    return {row.id: row for row in (await db.execute(stmt)).all()}
+
+
+async def get_month_calendar(db: AsyncSession, month: str) -> Dict[str, Any]:
+    """
+    한 달(YYYY-MM)의 달력 데이터를 집계 테이블에서 읽습니다. images 테이블은 대표 일기 조회에만 사용합니다.
+    (월 요약 1행 + 일 요약 최대 31행 + 상위 태그 + 대표 일기, 쿼리 4번)
+
+    Returns:
+        {"month": 월 요약 행 또는 None, "days": 일 요약 행 목록, "top_tags": {기간: 태그 목록}, "representatives": {id: 행}}
+    """
+    month_row = await db.get(MonthlySummaryModel, month)
+    days = (
+        await db.execute(
+            select(DailySummaryModel)
+            .where(DailySummaryModel.day >= f"{month}-01", DailySummaryModel.day < f"{month}-32")
+            .order_by(DailySummaryModel.day)
+        )
+    ).scalars().all()
+    # 'YYYY-MM' < 'YYYY-MM-01' < ... < 'YYYY-MM-32' 이므로 월 태그와 일 태그를 한 번에 읽습니다.
+    top_tags = await get_top_summary_keywords(
+        db, and_(summary_keywords.c.period >= month, summary_keywords.c.period < f"{month}-32")
+    )
+    representative_ids = [row.latest_image_id for row in days if row.latest_image_id]
+    if month_row is not None and month_row.latest_image_id:
+        representative_ids.append(month_row.latest_image_id)
+    return {
+        "month": month_row,
+        "days": days,
+        "top_tags": top_tags,
+        "representatives": await get_diary_summaries_by_ids(db, representative_ids),
+    }
+
+
+async def list_monthly_summaries(db: AsyncSession, limit: int = 12) -> Dict[str, Any]:
+    """
+    최근 달부터 월별 요약을 반환합니다.
+
+    Returns:
+        {"months": 월 요약 행 목록, "top_tags": {월: 태그 목록}, "representatives": {id: 행}}
+    """
+    months = (
+        await db.execute(
+            select(MonthlySummaryModel).order_by(MonthlySummaryModel.month.desc()).limit(limit)
+        )
+    ).scalars().all()
+    if not months:
+        return {"months": [], "top_tags": {}, "representatives": {}}
+    top_tags = await get_top_summary_keywords(
+        db, summary_keywords.c.period.in_([row.month for row in months])
+    )
+    return {
+        "months": months,
+        "top_tags": top_tags,
+        "representatives": await get_diary_summaries_by_ids(
+            db, [row.latest_image_id for row in months if row.latest_image_id]
+        ),
+    }
+
+
 # (필요하다면, 모든 이미지 조회, 업데이트, 삭제 함수 등을 여기에 추가합니다.)
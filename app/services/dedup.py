@@ -0,0 +1,114 @@
+# app/services/dedup.py
+
+from typing import List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+def _distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def is_informative_hash(value: int, min_bits: int, hash_bits: int = 64) -> bool:
+    """
+    단색/저대비 사진은 밝기 증감이 거의 없어 dHash가 0000000000000000(또는 거의 모두 0/1)이 되므로,
+    서로 전혀 다른 사진끼리도 같은 해시가 됩니다. 1인 비트와 0인 비트가 모두 min_bits개 이상일 때만 비교에 사용합니다.
+    """
+    ones = value.bit_count()
+    return min_bits <= ones <= hash_bits - min_bits
+
+
+class BKTree:
+    """
+    해밍 거리 기준 BK-tree (Burkhard-Keller tree)
+
+    각 노드의 자식은 부모와의 거리별로 저장됩니다. 질의 q와 노드 n의 거리가 d이면
+    삼각 부등식에 의해 거리 r 이내의 해시는 [d - r, d + r] 거리의 자식 아래에만 있으므로,
+    나머지 가지는 건너뛰어 전체 해시와 비교하지 않고 근접 해시를 찾습니다.
+    """
+
+    def __init__(self):
+        # 노드: [해시, 해시에 해당하는 image_id 목록, {거리: 자식 노드}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, image_id: int) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = [value, [image_id], {}]
+            return
+        node = self._root
+        while True:
+            d = _distance(value, node[0])
+            if d == 0:
+                node[1].append(image_id)  # 같은 해시는 한 노드에 모읍니다.
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, [image_id], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, int]]:
+        """
+        value와의 해밍 거리가 max_distance 이하인 (거리, image_id) 목록을 가까운 순으로 반환합니다.
+        """
+        if self._root is None:
+            return []
+        matches: List[Tuple[int, int]] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = _distance(value, node[0])
+            if d <= max_distance:
+                matches.extend((d, image_id) for image_id in node[1])
+            for child_distance, child in node[2].items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+        matches.sort()
+        return matches
+
+
+class NearDuplicateIndex:
+    """
+    저장된 이미지의 perceptual hash(dHash, 16진수 문자열) 인덱스
+    업로드 이미지와 해밍 거리 max_distance 이내인 기존 이미지를 찾습니다.
+    정보가 적은 해시(is_informative_hash)는 인덱스에 넣지도, 찾지도 않습니다.
+    """
+
+    def __init__(self, max_distance: int = 6, min_bits: int = 8):
+        self.max_distance = max_distance
+        self.min_bits = min_bits
+        self._tree = BKTree()
+        self._ids: Set[int] = set()  # 이미 추가한 image_id (중복 추가 방지)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, image_id: int, phash: Optional[str]) -> None:
+        if not phash or image_id in self._ids:
+            return
+        value = int(phash, 16)
+        if not is_informative_hash(value, self.min_bits):
+            return
+        self._ids.add(image_id)
+        self._tree.add(value, image_id)
+
+    def find(self, phash: str, max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(거리, image_id) 목록을 가까운 순(같은 거리면 최신 id 우선)으로 반환합니다."""
+        limit = self.max_distance if max_distance is None else max_distance
+        value = int(phash, 16)
+        if not is_informative_hash(value, self.min_bits):
+            return []
+        matches = self._tree.search(value, limit)
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        return matches
+
+
+# 프로세스 전역 근접 중복 이미지 인덱스 (FastAPI lifespan에서 DB로부터 적재)
+image_hash_index = NearDuplicateIndex(
+    max_distance=settings.PHASH_MAX_DISTANCE, min_bits=settings.PHASH_MIN_INFORMATIVE_BITS
+)
@@ -0,0 +1,97 @@
+# app/services/geo.py
+
+import math
+from typing import List, Tuple
+
+# geohash base32 문자표 (a, i, l, o 제외)
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12  # DB에 저장하는 길이 (약 3.7cm × 1.9cm 셀)
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = 111320.0
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    위도/경도를 geohash 문자열로 인코딩합니다.
+    geohash는 앞부분(prefix)이 같을수록 가까운 위치이므로, B-tree 인덱스의 범위 검색으로 공간 검색을 할 수 있습니다.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+    while len(chars) < precision:
+        target, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (target[0] + target[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """주어진 길이의 geohash 셀 하나의 (위도 높이, 경도 너비)를 도 단위로 반환합니다."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def precision_for_radius(latitude: float, radius_m: float) -> int:
+    """
+    셀의 높이/너비가 반경 이상인 가장 긴 geohash 길이를 고릅니다.
+    이 길이의 중심 셀과 주변 8개 셀(3×3)이 반경 원 전체를 덮습니다.
+    """
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size_degrees(precision)
+        if (
+            height * METERS_PER_DEGREE >= radius_m
+            and width * METERS_PER_DEGREE * cos_lat >= radius_m
+        ):
+            return precision
+    return 1
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_m: float) -> List[str]:
+    """
+    반경 원을 덮는 geohash prefix 목록(중심 셀 + 이웃 셀, 중복 제거)을 반환합니다.
+    """
+    precision = precision_for_radius(latitude, radius_m)
+    height, width = cell_size_degrees(precision)
+    prefixes: List[str] = []
+    for d_lat in (-height, 0.0, height):
+        lat = latitude + d_lat
+        if lat > 90.0 or lat < -90.0:
+            continue
+        for d_lon in (-width, 0.0, width):
+            # 경도 ±180도 경계를 넘으면 반대편으로 감쌉니다.
+            lon = (longitude + d_lon + 180.0) % 360.0 - 180.0
+            prefix = encode_geohash(lat, lon, precision)
+            if prefix not in prefixes:
+                prefixes.append(prefix)
+    return prefixes
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """prefix로 시작하는 문자열의 [시작, 끝) 범위. ('{'는 ASCII에서 'z' 바로 다음 문자)"""
+    return prefix, prefix + "{"
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 위경도 사이의 대원 거리(미터)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
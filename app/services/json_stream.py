@@ -0,0 +1,132 @@
+# app/services/json_stream.py
+
+from typing import List, Optional
+
+# JSON 문자열 이스케이프 문자 → 실제 문자 매핑
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class JsonStringFieldStreamer:
+    """
+    스트리밍으로 도착하는 '미완성 JSON' 조각에서 최상위 객체의 특정 문자열 필드 값을
+    도착하는 즉시 잘라내어 돌려주는 증분 파서입니다.
+
+    예) '{"refined_caption": "오늘은 ' → '오늘은 ' 반환,
+        다음 조각 '바다에 갔다", "keywords": [...' → '바다에 갔다' 반환 후 done=True
+
+    전체 JSON을 다시 파싱하지 않고 문자 단위 상태 머신으로만 동작하므로,
+    조각 하나당 O(조각 길이) 비용만 듭니다.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.done = False
+
+        self._depth = 0
+        self._in_string = False
+        self._string_is_key = False
+        self._expecting_key = False
+        self._capturing = False
+        self._escape = False
+        self._unicode_digits: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._key_chars: List[str] = []
+        self._last_key: Optional[str] = None
+        self._value_key: Optional[str] = None
+
+    def feed(self, chunk: str) -> str:
+        """
+        새로 도착한 조각을 처리하고, 대상 필드 값 중 이번에 새로 확정된 부분만 반환합니다.
+        """
+        out: List[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._consume_string_char(ch, out)
+            else:
+                self._consume_structural_char(ch)
+        return "".join(out)
+
+    # ----------------------------------------------------
+    # 내부 기능
+    # ----------------------------------------------------
+    def _emit(self, text: str, out: List[str]) -> None:
+        if self._capturing:
+            out.append(text)
+        elif self._string_is_key:
+            self._key_chars.append(text)
+
+    def _consume_string_char(self, ch: str, out: List[str]) -> None:
+        # 1) \uXXXX 유니코드 이스케이프 수집 중
+        if self._unicode_digits is not None:
+            self._unicode_digits += ch
+            if len(self._unicode_digits) < 4:
+                return
+            code = int(self._unicode_digits, 16)
+            self._unicode_digits = None
+            if 0xD800 <= code <= 0xDBFF:
+                # 서로게이트 쌍의 앞부분은 뒷부분이 올 때까지 보류합니다.
+                self._high_surrogate = code
+                return
+            if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._emit(chr(code), out)
+            return
+
+        # 2) 백슬래시 다음 문자
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode_digits = ""
+            else:
+                self._emit(_ESCAPES.get(ch, ch), out)
+            return
+
+        if ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            # 문자열 종료
+            self._in_string = False
+            if self._string_is_key:
+                self._last_key = "".join(self._key_chars)
+                self._key_chars = []
+            elif self._capturing:
+                self._capturing = False
+                self.done = True
+            self._string_is_key = False
+        else:
+            self._emit(ch, out)
+
+    def _consume_structural_char(self, ch: str) -> None:
+        if ch == '"':
+            self._in_string = True
+            self._string_is_key = self._depth == 1 and self._expecting_key
+            if (
+                not self._string_is_key
+                and not self.done
+                and self._depth == 1
+                and self._value_key == self.field
+            ):
+                self._capturing = True
+        elif ch in "{[":
+            self._depth += 1
+            if ch == "{" and self._depth == 1:
+                self._expecting_key = True
+        elif ch in "}]":
+            self._depth -= 1
+        elif self._depth == 1:
+            if ch == ":":
+                self._expecting_key = False
+                self._value_key = self._last_key
+            elif ch == ",":
+                self._expecting_key = True
+                self._value_key = None
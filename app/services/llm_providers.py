@@ -0,0 +1,129 @@
+# app/services/llm_providers.py
+
+import abc
+import json
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import httpx
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class LlmProviderError(Exception):
+    """LLM 제공자 호출이 실패했거나 응답을 해석할 수 없을 때 발생합니다."""
+
+
+class LlmProvider(abc.ABC):
+    """
+    JSON 객체 응답을 반환하는 LLM 제공자의 공통 인터페이스입니다.
+    라우터(llm_router.py)는 이 인터페이스만 사용하므로 제공자를 쉽게 추가/교체할 수 있습니다.
+    """
+
+    name: str = "base"
+
+    @abc.abstractmethod
+    async def complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """프롬프트를 보내고 응답을 JSON 객체로 해석해 반환합니다. 실패하면 LlmProviderError를 발생시킵니다."""
+
+
+class OpenAIProvider(LlmProvider):
+    """AsyncOpenAI 클라이언트를 사용하는 ChatGPT 제공자입니다."""
+
+    name = "chatgpt"
+
+    def __init__(self, client: "AsyncOpenAI", model: str):
+        self.client = client
+        self.model = model
+
+    async def complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        completion = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            timeout=timeout,  # 라우터가 계산한 남은 시간만큼만 기다립니다.
+        )
+        try:
+            return json.loads(completion.choices[0].message.content)
+        except (TypeError, ValueError, IndexError) as e:
+            raise LlmProviderError(f"ChatGPT 응답 JSON 파싱 실패: {e}") from e
+
+
+class GeminiProvider(LlmProvider):
+    """
+    Gemini REST API(generateContent)를 httpx로 직접 호출하는 비동기 제공자입니다.
+    google.generativeai SDK 대신 REST를 사용하므로 base_url만 바꾸면 스텁 서버로 테스트할 수 있습니다.
+    """
+
+    name = "gemini"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str = "https://generativelanguage.googleapis.com",
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient()
+        return self._http_client
+
+    async def complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+        body = {
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+            "generationConfig": {
+                "temperature": temperature,
+                "responseMimeType": "application/json",
+            },
+        }
+        try:
+            response = await self.http_client.post(
+                url,
+                json=body,
+                headers={"x-goog-api-key": self.api_key},
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise LlmProviderError(f"Gemini 호출 실패: {e}") from e
+
+        if response.status_code != 200:
+            raise LlmProviderError(
+                f"Gemini 호출 실패: HTTP {response.status_code} {response.text[:200]}"
+            )
+
+        try:
+            text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+            return json.loads(text)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise LlmProviderError(f"Gemini 응답 JSON 파싱 실패: {e}") from e
@@ -0,0 +1,249 @@
+# app/services/llm_router.py
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.llm_providers import LlmProvider
+
+
+class LlmRouterError(Exception):
+    """사용 가능한 모든 제공자가 실패했거나 데드라인 안에 응답하지 못했을 때 발생합니다."""
+
+
+@dataclass
+class RoutedResult:
+    provider: str  # 실제로 응답을 돌려준 제공자 이름
+    data: Dict[str, Any]  # 제공자가 반환한 JSON 객체
+    latency: float  # 라우터 기준 전체 소요 시간(초)
+    hedged: bool  # 헤지 요청이 발사되었는지 여부
+
+
+class ProviderStats:
+    """
+    제공자별 최근 N회 호출의 지연 시간과 성공/실패를 기록합니다.
+    """
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - (sum(self.outcomes) / len(self.outcomes))
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return float(np.percentile(np.fromiter(self.latencies, dtype=np.float64), q))
+
+
+class LlmRouter:
+    """
+    최근 지연 시간/오류율로 제공자 순위를 매기고, 헤지(hedged) 요청과 데드라인을 적용해 LLM을 호출합니다.
+
+    1) 기대 지연(중앙값 / 성공률)이 가장 낮은 제공자에게 먼저 요청합니다.
+    2) 첫 요청이 그 제공자의 최근 p95를 넘기거나 실패하면, 다음 제공자에게 두 번째 요청을 보냅니다.
+    3) 먼저 성공한 응답을 사용하고 나머지 요청은 취소합니다.
+    4) 전체 과정은 호출자가 지정한 데드라인(초)을 넘지 않습니다.
+    5) 제공자별 서킷 브레이커가 열려 있으면 그 제공자는 건너뛰고, 모두 열려 있으면 즉시 실패합니다.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, LlmProvider],
+        hedge_default_delay: float = 4.0,
+        hedge_min_delay: float = 0.5,
+        hedge_max_delay: float = 10.0,
+        stats_window: int = 50,
+        min_samples: int = 5,
+        breaker_failure_threshold: int = 5,
+        breaker_slow_call_seconds: Optional[float] = None,
+        breaker_reset_seconds: float = 30.0,
+    ):
+        self.providers = providers
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.min_samples = min_samples
+        self.stats = {name: ProviderStats(stats_window) for name in providers}
+        self.breakers = {
+            name: CircuitBreaker(
+                name,
+                failure_threshold=breaker_failure_threshold,
+                slow_call_threshold=breaker_slow_call_seconds,
+                reset_timeout=breaker_reset_seconds,
+            )
+            for name in providers
+        }
+
+    # ----------------------------------------------------
+    # 순위 결정
+    # ----------------------------------------------------
+    def _expected_latency(self, name: str) -> float:
+        stats = self.stats[name]
+        median = stats.percentile(50)
+        if median is None:
+            # 표본이 없는 제공자는 기본 헤지 지연의 절반으로 가정하여 한 번은 시도되도록 합니다.
+            median = self.hedge_default_delay / 2
+        success_rate = max(1.0 - stats.error_rate, 0.05)
+        return median / success_rate
+
+    def rank(self, preferred: Optional[str] = None) -> List[str]:
+        """호출 순서대로 정렬된 제공자 이름 목록을 반환합니다. (회로가 열린 제공자는 제외)"""
+        names = sorted(
+            (
+                name
+                for name in self.providers
+                if self.breakers[name].state != CircuitBreaker.OPEN
+            ),
+            key=self._expected_latency,
+        )
+        if preferred in names:
+            names.remove(preferred)
+            names.insert(0, preferred)
+        return names
+
+    def hedge_delay(self, name: str) -> float:
+        stats = self.stats[name]
+        p95 = stats.percentile(95) if len(stats.latencies) >= self.min_samples else None
+        delay = p95 if p95 is not None else self.hedge_default_delay
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    # ----------------------------------------------------
+    # 호출
+    # ----------------------------------------------------
+    async def _call(
+        self,
+        name: str,
+        system_prompt: str,
+        user_prompt: str,
+        deadline_at: float,
+        temperature: float,
+    ) -> Dict[str, Any]:
+        breaker = self.breakers[name]
+        # 회로가 열려 있으면(half-open 탐색 슬롯이 없으면) 요청을 보내지 않고 바로 실패합니다.
+        breaker.before_call()
+
+        loop = asyncio.get_running_loop()
+        remaining = deadline_at - loop.time()
+        t0 = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(
+                self.providers[name].complete_json(
+                    system_prompt, user_prompt, timeout=remaining, temperature=temperature
+                ),
+                timeout=remaining,
+            )
+        except asyncio.CancelledError:
+            # 헤지 경쟁에서 진 요청은 실패로 집계하지 않습니다.
+            breaker.release()
+            raise
+        except Exception:
+            self.stats[name].record_failure()
+            breaker.record_failure()
+            raise
+        latency = time.perf_counter() - t0
+        self.stats[name].record_success(latency)
+        breaker.record_success(latency)
+        return data
+
+    async def complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        preferred: Optional[str] = None,
+        hedge: bool = True,
+        temperature: float = 0.7,
+    ) -> RoutedResult:
+        """
+        제공자 순위에 따라 JSON 응답을 요청합니다.
+
+        Args:
+            timeout: 헤지 요청까지 포함한 전체 데드라인(초).
+            preferred: 먼저 시도할 제공자 이름 ("chatgpt", "gemini"). None이면 자동 선택.
+            hedge: False이면 첫 번째 제공자에게만 요청합니다.
+        """
+        if not self.providers:
+            raise LlmRouterError("설정된 LLM 제공자가 없습니다.")
+        order = self.rank(preferred)
+        if not order:
+            raise LlmRouterError("모든 LLM 제공자의 회로가 열려 있습니다. 잠시 후 다시 시도하세요.")
+        if not hedge:
+            order = order[:1]
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        deadline_at = started_at + timeout
+        hedge_at = started_at + self.hedge_delay(order[0])
+
+        tasks: Dict[asyncio.Task, str] = {}
+        next_index = 0
+        last_error: Optional[BaseException] = None
+
+        def launch_next() -> None:
+            nonlocal next_index
+            name = order[next_index]
+            next_index += 1
+            task = asyncio.create_task(
+                self._call(name, system_prompt, user_prompt, deadline_at, temperature)
+            )
+            tasks[task] = name
+
+        launch_next()
+        pending = set(tasks)
+        try:
+            while pending:
+                now = loop.time()
+                if now >= deadline_at:
+                    # 데드라인까지 응답하지 못한 요청은 느린 호출이므로 실패로 집계합니다.
+                    for task in pending:
+                        self.stats[tasks[task]].record_failure()
+                        self.breakers[tasks[task]].record_failure()
+                    break
+                wait_for = deadline_at - now
+                can_hedge = next_index < len(order)
+                if can_hedge:
+                    wait_for = min(wait_for, max(hedge_at - now, 0.0))
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return RoutedResult(
+                            provider=tasks[task],
+                            data=task.result(),
+                            latency=loop.time() - started_at,
+                            hedged=len(tasks) > 1,
+                        )
+                    last_error = task.exception()
+                    print(f"LLM provider '{tasks[task]}' failed: {last_error}")
+
+                # 헤지 시점이 지났거나 진행 중인 요청이 모두 실패했다면 다음 제공자에게 요청합니다.
+                if can_hedge and (loop.time() >= hedge_at or not pending):
+                    launch_next()
+                    pending.add(next(reversed(tasks)))
+                    hedge_at = loop.time() + self.hedge_delay(order[next_index - 1])
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_error is not None and not pending:
+            raise LlmRouterError(f"모든 LLM 제공자 호출 실패: {last_error}")
+        raise LlmRouterError(f"LLM 응답 데드라인({timeout:.1f}s) 초과")
@@ -2,18 +2,81 @@
 
 # import openai
 # import google.generativeai as genai
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
+import asyncio
 from app.core.config import settings
+from app.core.deadline import budget
+from app.core.http_pool import llm_http_pool
 from captioning_module import image_captioner  # 모델 로직 재사용
 import time  # 토큰 사용량 계산 및 출력을 위해 사용
-from openai import AsyncOpenAI  # AsyncOpenAI를 임포트합니다.
 import json  # JSON 응답 파싱을 위해 사용
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.json_stream import JsonStringFieldStreamer
+from app.services.llm_providers import GeminiProvider, LlmProvider, OpenAIProvider
+from app.services.llm_router import LlmRouter
+from app.services.prompts import get_prompt
 
 if settings.CHATGPT_API_KEY:
-    async_openai_client = AsyncOpenAI(api_key=settings.CHATGPT_API_KEY)
+    # openai SDK는 키가 설정된 경우에만 import 합니다. (import 비용이 큼)
+    from openai import AsyncOpenAI
+
+    # 재시도는 라우터(헤지/페일오버)가 담당하므로 SDK 자체 재시도는 끕니다.
+    # 전송 계층은 lifespan에서 미리 연결해 두는 공유 커넥션 풀을 사용합니다.
+    async_openai_client = AsyncOpenAI(
+        api_key=settings.CHATGPT_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=0,
+        http_client=llm_http_pool.client,
+    )
 else:
     async_openai_client = None
 
+CHATGPT_MODEL_NAME = settings.CHATGPT_MODEL  # 사용할 모델
+
+# --- LLM 제공자 등록 및 라우터 생성 ---
+# API 키가 설정된 제공자만 라우터에 등록합니다.
+llm_providers: Dict[str, LlmProvider] = {}
+if async_openai_client:
+    llm_providers[OpenAIProvider.name] = OpenAIProvider(
+        async_openai_client, settings.CHATGPT_MODEL
+    )
+if settings.GEMINI_API_KEY:
+    llm_providers[GeminiProvider.name] = GeminiProvider(
+        settings.GEMINI_API_KEY,
+        settings.GEMINI_MODEL,
+        settings.GEMINI_BASE_URL,
+        http_client=llm_http_pool.client,
+    )
+
+llm_router = LlmRouter(
+    llm_providers,
+    hedge_default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+    hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+    hedge_max_delay=settings.LLM_HEDGE_MAX_DELAY,
+    stats_window=settings.LLM_STATS_WINDOW,
+    breaker_failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    breaker_slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+    breaker_reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+)
+
+# --- 캡션 개선 프롬프트 (버전 관리 레지스트리에서 한 번만 조회) ---
+# 정적 지시문은 system에, 가변 데이터는 user 메시지 마지막에 두어 제공자 prefix 캐시에 적중하도록 합니다.
+# 'refined_caption'을 'keywords'보다 먼저 쓰도록 지시해야 스트리밍 시 해설이 먼저 도착합니다.
+REFINE_PROMPT = get_prompt("refine_caption", settings.REFINE_PROMPT_VERSION)
+REFINE_SYSTEM_PROMPT = REFINE_PROMPT.system
+REFINE_BATCH_PROMPT = get_prompt("refine_caption_batch")
+KEYWORD_COUNT = 10
+
+
+def get_llm_warmup_urls() -> List[str]:
+    """커넥션 풀 예열(warm-up) 대상이 되는, 설정된 LLM 제공자의 base URL 목록입니다."""
+    urls = []
+    if async_openai_client:
+        urls.append(str(async_openai_client.base_url))
+    if GeminiProvider.name in llm_providers:
+        urls.append(llm_providers[GeminiProvider.name].base_url)
+    return urls
+
 # --- 토큰 사용량 체크 로직 (Persistence 제거, Limit 체크는 유지) ---
 def get_estimated_tokens(text: str, is_korean: bool = True) -> int:
     """텍스트 길이에 따라 토큰을 추정합니다."""
@@ -24,78 +87,347 @@ def get_estimated_tokens(text: str, is_korean: bool = True) -> int:
 
 # --- 프롬프트 생성 함수 수정 ---
 def set_prompt_for_keyword(original_caption: str, file_info: str) -> str:
-    """LLM에 전달할 사용자 프롬프트 및 키워드 추출 지시를 생성합니다."""
-    return (
-        # 🌟 통합: 구체적인 페르소나 정의
-        f"당신은 시각 장애인 친구에게 사진을 설명해주는 다정하고 친근한 도우미입니다.\n\n" 
-        
-        # 입력 데이터 및 중요성 강조
-        f"제공된 '사용자 추가 정보'에는 사진 속 인물의 이름이나 중요 정보가 포함될 수 있습니다. 최종 해설 작성 시, 대명사 대신 '사용자 추가 정보'에 포함된 구체적인 이름이나 정보를 반드시 사용하여 서술해 주세요.\n\n"
-        
-        f"[입력 데이터]\n"
-        f"1. 사진 캡션: '{original_caption}'\n"
-        f"2. 사용자 추가 정보: '{file_info}'\n\n"
-        
-        # 🌟 명령 명확화: 이제 A, B 대신 '해설'과 '키워드'로 명확히 지시
-        f"[요청 사항]\n"
-        f"1. 해설 생성: 위에 제시된 정보를 바탕으로, 눈으로 보는 것처럼 사진의 상황, 분위기, 감정을 생생하고 직관적인 언어로 전달하는 최종 해설을 작성해주세요.\n"
-        f"2. 키워드 추출: 이 사진과 해설을 대표하는 **객체, 장소, 분위기, 감정, 인물의 이름**을 포함하는 **10개의 핵심 키워드**를 추출해주세요. 키워드는 명사 또는 명사구 형태여야 합니다."
+    """
+    LLM에 전달할 사용자 프롬프트(가변 데이터 부분)를 생성합니다.
+    키워드 추출 지시 등 정적 지시문은 REFINE_SYSTEM_PROMPT에 포함되어 있습니다.
+    """
+    _, user_prompt = REFINE_PROMPT.render(
+        original_caption=original_caption, file_info=file_info
     )
+    return user_prompt
+
+def describe_with_details(caption: str, details: Optional[Dict[str, str]] = None) -> str:
+    """
+    기본 BLIP 캡션에 조건부 캡션("the mood is calm" 등)을 덧붙여 LLM에 전달할 사진 설명을 만듭니다.
+    접두어만 있고 이어지는 내용이 없는 캡션은 제외합니다.
+    """
+    sentences = [caption.strip().rstrip(".")]
+    for prompt, text in (details or {}).items():
+        text = text.strip().rstrip(".")
+        if text and text != prompt and text != sentences[0]:
+            sentences.append(text)
+    return ". ".join(sentence for sentence in sentences if sentence)
+
+
+async def get_refined_caption_and_keywords_async(
+    original_caption: str,
+    file_info: str,
+    provider: Optional[str] = None,
+    hedge: bool = True,
+) -> Dict[str, Any]:
+    """
+    LLM 라우터를 통해 캡션 개선 및 10개 키워드를 JSON으로 받아 파싱합니다.
+
+    provider가 None이면 최근 지연/오류율이 가장 좋은 제공자를 자동 선택하고,
+    응답이 느리면 다른 제공자로 헤지 요청을 보냅니다.
+    """
+    if not llm_router.providers:
+        # 키가 설정되지 않은 경우에도 딕셔너리 형태로 반환
+        return {
+            "refined_caption": "LLM API 호출 실패: LLM API 키가 설정되지 않았습니다.",
+            "keywords": [],
+        }
+
+    prompt = set_prompt_for_keyword(original_caption, file_info)
+
+    try:
+        # 요청에 남은 마감 시간을 LLM 호출 타임아웃으로 전달합니다. (이미 지났으면 즉시 실패)
+        result = await llm_router.complete_json(
+            REFINE_SYSTEM_PROMPT,
+            prompt,
+            timeout=budget(settings.LLM_DEADLINE_SECONDS),
+            preferred=provider,
+            hedge=hedge,
+        )
+        data = result.data
+
+        # 키와 캡션 추출
+        refined_caption = data.get("refined_caption", "캡션 생성 결과 없음")
+        keywords = data.get("keywords", [])  # 키워드 리스트 추출
+
+        # 최종 반환: 딕셔너리 형태로 캡션과 키워드, 응답한 제공자를 반환
+        return {
+            "refined_caption": refined_caption,
+            "keywords": keywords,
+            "provider": result.provider,
+        }
+
+    except Exception as e:
+        print(f"Error calling LLM router: {e}")
+        return {"refined_caption": f"LLM API 호출 실패: {e}", "keywords": []}
+
 
 async def get_refined_caption_and_keywords_with_chatgpt_async(
     original_caption: str, file_info: str
 ) -> Dict[str, Any]:  # 응답 타입을 Dict로 변경
     """
-    ChatGPT API를 사용하여 캡션 개선 및 10개 키워드를 JSON으로 받아 파싱합니다.
+    ChatGPT API만 사용하여 캡션 개선 및 10개 키워드를 JSON으로 받아 파싱합니다.
     """
     if not async_openai_client:
-        # 키가 설정되지 않은 경우에도 딕셔너리 형태로 반환
         return {
             "refined_caption": "LLM API 호출 실패: ChatGPT API 키가 설정되지 않았습니다.",
             "keywords": [],
         }
+    return await get_refined_caption_and_keywords_async(
+        original_caption, file_info, provider=OpenAIProvider.name, hedge=False
+    )
 
-    # --- 1. JSON 응답을 위한 시스템 프롬프트 정의 (키워드 항목 추가) ---
-    system_prompt = (
-        "You are a helpful assistant that refines an image caption based on provided context. "
-        "Your final response MUST be a single JSON object with two keys: 'refined_caption' (String) and 'keywords' (Array of Strings). "
-        "The value of 'refined_caption' should be the final, refined caption in Korean. "
-        "The value of 'keywords' MUST be an array containing exactly 10 keywords in Korean. "
+
+async def get_refined_caption_with_gemini_async(
+    original_caption: str, file_info: str
+) -> Dict[str, Any]:
+    """
+    Gemini API만 사용하여 캡션 개선 및 10개 키워드를 JSON으로 받아 파싱합니다.
+    """
+    if GeminiProvider.name not in llm_router.providers:
+        return {
+            "refined_caption": "LLM API 호출 실패: Gemini API 키가 설정되지 않았습니다.",
+            "keywords": [],
+        }
+    return await get_refined_caption_and_keywords_async(
+        original_caption, file_info, provider=GeminiProvider.name, hedge=False
     )
-    
-    # --- 2. 사용자 입력 프롬프트 생성 (새로운 함수 사용) ---
+
+
+def _validate_llm_item(entry: Any) -> Optional[Dict[str, Any]]:
+    """배치 응답의 항목 하나를 검증하고, 올바르면 {refined_caption, keywords} 딕셔너리를 반환합니다."""
+    if not isinstance(entry, dict):
+        return None
+    refined_caption = entry.get("refined_caption")
+    keywords = entry.get("keywords")
+    if not isinstance(refined_caption, str) or not refined_caption.strip():
+        return None
+    if (
+        not isinstance(keywords, list)
+        or len(keywords) != KEYWORD_COUNT
+        or not all(isinstance(k, str) and k.strip() for k in keywords)
+    ):
+        return None
+    return {"refined_caption": refined_caption, "keywords": keywords}
+
+
+async def _generate_batch_chunk(
+    chunk: List[Tuple[int, str, str]], provider: Optional[str]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    (index, 캡션, 사용자 입력) 묶음 하나를 단일 LLM 요청으로 처리합니다.
+    검증을 통과한 항목만 {index: 결과} 형태로 반환합니다.
+    """
+    items = [
+        {"index": index, "caption": caption, "user_info": user_input}
+        for index, caption, user_input in chunk
+    ]
+    system_prompt, user_prompt = REFINE_BATCH_PROMPT.render(
+        items=json.dumps(items, ensure_ascii=False)
+    )
+    try:
+        # 큰 배치를 중복 전송하지 않도록 헤지는 끄고, 실패 항목은 개별 호출(헤지 포함)로 보완합니다.
+        result = await llm_router.complete_json(
+            system_prompt,
+            user_prompt,
+            # 요청 마감(REQUEST_DEADLINE_SECONDS) 안에서만 기다립니다.
+            timeout=budget(settings.LLM_BATCH_DEADLINE_SECONDS),
+            preferred=provider,
+            hedge=False,
+        )
+        return _parse_batch_results(result.data, {index for index, _, _ in chunk}, result.provider)
+    except Exception as e:
+        print(f"Batch LLM call failed ({len(chunk)} items): {e}")
+        return {}
+
+
+def _parse_batch_results(
+    data: Any, expected: Set[int], provider: Optional[str]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    배치 응답 {"results": [...]}에서 검증을 통과한 항목만 {index: 결과}로 반환합니다.
+    응답이 객체가 아니거나, 항목에 올바른 index가 없거나, 형식이 틀린 항목은 건너뜁니다. (개별 호출로 대체)
+    """
+    entries = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        print("Batch LLM response has no 'results' list. Falling back to single-item calls.")
+        return {}
+
+    results: Dict[int, Dict[str, Any]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        # bool은 int의 하위 타입이므로 따로 제외합니다. (True == 1)
+        if not isinstance(index, int) or isinstance(index, bool):
+            continue
+        validated = _validate_llm_item(entry)
+        if index in expected and index not in results and validated:
+            validated["provider"] = provider
+            results[index] = validated
+    return results
+
+
+def _batch_failure(detail: str) -> Dict[str, Any]:
+    return {"refined_caption": None, "keywords": [], "error": detail}
+
+
+def _as_batch_item(result: Dict[str, Any]) -> Dict[str, Any]:
+    """개별 호출이 실패 메시지를 돌려주면 일기로 쓰지 않고 error로 보고합니다."""
+    refined_caption = result.get("refined_caption") or ""
+    if refined_caption.startswith("LLM API 호출 실패"):
+        return _batch_failure(refined_caption)
+    return result
+
+
+async def get_refined_captions_and_keywords_batch_async(
+    items: List[Tuple[str, str]],
+    provider: Optional[str] = None,
+    batch_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    여러 (캡션, 사용자 입력) 쌍을 batch_size개씩 묶어 한 번의 LLM 요청으로 처리합니다.
+
+    - 시스템 프롬프트는 묶음당 한 번만 전송되어, 같은 rate limit 안에서 처리량이 늘어납니다.
+    - 응답은 항목별로 검증하고, 누락/형식 오류 항목만 개별 호출로 다시 생성합니다.
+    - 반환 리스트의 순서는 입력 순서와 같습니다.
+    - 끝내 생성하지 못한 항목은 refined_caption 대신 "error"에 사유를 담습니다.
+    """
+    if not llm_router.providers:
+        return [_batch_failure("LLM API 호출 실패: LLM API 키가 설정되지 않았습니다.") for _ in items]
+
+    size = max(batch_size or settings.LLM_BATCH_SIZE, 1)
+    indexed = [(i, caption, user_input) for i, (caption, user_input) in enumerate(items)]
+    chunks = [indexed[i:i + size] for i in range(0, len(indexed), size)]
+    semaphore = asyncio.Semaphore(max(settings.LLM_BATCH_CONCURRENCY, 1))
+
+    async def run_chunk(chunk: List[Tuple[int, str, str]]) -> Dict[int, Dict[str, Any]]:
+        async with semaphore:
+            return await _generate_batch_chunk(chunk, provider)
+
+    results: Dict[int, Dict[str, Any]] = {}
+    for chunk_results in await asyncio.gather(*(run_chunk(c) for c in chunks)):
+        results.update(chunk_results)
+
+    # 검증에 실패한 항목은 개별 호출로 대체합니다.
+    missing = [entry for entry in indexed if entry[0] not in results]
+    if missing:
+        print(f"Batch LLM fallback: {len(missing)}/{len(items)} items retried individually")
+
+        async def run_single(index: int, caption: str, user_input: str) -> None:
+            async with semaphore:
+                results[index] = _as_batch_item(
+                    await get_refined_caption_and_keywords_async(caption, user_input, provider=provider)
+                )
+
+        await asyncio.gather(*(run_single(*entry) for entry in missing))
+
+    return [results[i] for i in range(len(items))]
+
+
+async def stream_refined_caption_and_keywords_with_chatgpt_async(
+    original_caption: str, file_info: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    ChatGPT 스트리밍 응답을 받아, 미완성 JSON에서 'refined_caption' 값을 도착하는 대로 잘라 전달합니다.
+
+    다음 형태의 이벤트 딕셔너리를 순서대로 yield 합니다.
+        {"event": "caption", "delta": "해설 조각"}                        (여러 번)
+        {"event": "done", "refined_caption": "...", "keywords": [...]}   (마지막 1회)
+        {"event": "error", "detail": "LLM API 호출 실패: ..."}            (실패 시)
+    """
+    if not async_openai_client:
+        yield {
+            "event": "error",
+            "detail": "LLM API 호출 실패: ChatGPT API 키가 설정되지 않았습니다.",
+        }
+        return
+
     prompt = set_prompt_for_keyword(original_caption, file_info)
-    model_name = "gpt-3.5-turbo"  # 사용할 모델
+    streamer = JsonStringFieldStreamer("refined_caption")
+    response_chunks = []
+    # 스트리밍은 라우터를 거치지 않으므로 ChatGPT 서킷 브레이커를 직접 확인/갱신합니다.
+    breaker = llm_router.breakers[OpenAIProvider.name]
+    t0 = time.perf_counter()
 
     try:
-        completion = await async_openai_client.chat.completions.create(
-            model=model_name,
+        breaker.before_call()
+        stream = await async_openai_client.chat.completions.create(
+            model=CHATGPT_MODEL_NAME,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": REFINE_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             temperature=0.7,
-            response_format={"type": "json_object"},  # JSON 형식 요청
+            response_format={"type": "json_object"},
+            stream=True,
+            timeout=budget(settings.LLM_DEADLINE_SECONDS),
         )
+        # 스트림 전체 길이가 아니라 응답 시작까지의 지연으로 느린 호출 여부를 판단합니다.
+        first_byte_latency = time.perf_counter() - t0
 
-        # 3. 응답에서 텍스트 추출 및 파싱
-        response_text = completion.choices[0].message.content
-        data = json.loads(response_text)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            response_chunks.append(content)
 
-        # 4. 키와 캡션 추출
-        refined_caption = data.get("refined_caption", "캡션 생성 결과 없음")
-        keywords = data.get("keywords", [])  # 키워드 리스트 추출
+            # 새로 확정된 해설 조각만 즉시 전달
+            delta = streamer.feed(content)
+            if delta:
+                yield {"event": "caption", "delta": delta}
 
-        # 최종 반환: 딕셔너리 형태로 캡션과 키워드 모두 반환
-        return {"refined_caption": refined_caption, "keywords": keywords}
+        # 스트림 종료 후 전체 JSON을 한 번 파싱하여 키워드를 꺼냅니다.
+        data = json.loads("".join(response_chunks))
+        breaker.record_success(first_byte_latency)
+        yield {
+            "event": "done",
+            "refined_caption": data.get("refined_caption", "캡션 생성 결과 없음"),
+            "keywords": data.get("keywords", []),
+        }
 
+    except CircuitOpenError as e:
+        yield {"event": "error", "detail": f"LLM API 호출 실패: {e}"}
+    except (asyncio.CancelledError, GeneratorExit):
+        # 클라이언트 연결 종료로 중단된 스트림은 실패로 집계하지 않고, half-open 탐색 예약만 반환합니다.
+        breaker.release()
+        raise
     except Exception as e:
-        print(f"Error calling ChatGPT API: {e}")
-        return {"refined_caption": f"LLM API 호출 실패: {e}", "keywords": []}
+        breaker.record_failure()
+        print(f"Error streaming ChatGPT API: {e}")
+        yield {"event": "error", "detail": f"LLM API 호출 실패: {e}"}
 
 
-# 🌟 전역 클라이언트를 사용하거나, 설정되지 않았다면 None을 반환하도록 수정
 async def translate_to_korean_async(english_text: str) -> str:
+    """
+    BLIP 캡션(영어)을 설정된 번역 백엔드(settings.TRANSLATION_BACKEND)로 한국어로 번역합니다.
+    번역에 실패하면 원문(영어)을 그대로 반환합니다.
+    """
+    backend = settings.TRANSLATION_BACKEND.lower()
+
+    if backend == "openvino":
+        try:
+            # 로컬 모델 추론은 CPU 바운드이므로 스레드에서 실행합니다.
+            return await asyncio.to_thread(translate_with_openvino, english_text)
+        except Exception as e:
+            print(f"Local Translation failed: {e}")
+            return english_text
+
+    if backend == "llm":
+        return await translate_with_llm_async(english_text)
+
+    return english_text
+
+
+def translate_with_openvino(english_text: str) -> str:
+    """
+    OpenVINO 로컬 번역 모델(싱글톤)로 번역합니다. 토큰을 사용하지 않습니다.
+    """
+    # 번역 백엔드를 쓰지 않는 배포에서는 번역 모델을 불러오지 않도록 여기서 import 합니다.
+    from captioning_module.translator import KoreanTranslator
+
+    return KoreanTranslator.get_translator().translate(english_text)
+
+
+# 🌟 전역 클라이언트를 사용하거나, 설정되지 않았다면 None을 반환하도록 수정
+async def translate_with_llm_async(english_text: str) -> str:
     """
     GPT를 사용하여 영어 텍스트를 한국어로 번역합니다.
     (경량 프롬프트로 토큰 사용 최소화)
@@ -0,0 +1,258 @@
+# app/services/prompts.py
+
+"""
+버전 관리되는 LLM 프롬프트 템플릿 레지스트리입니다.
+
+제공자 측 프롬프트 prefix 캐싱(OpenAI prompt caching, Gemini context caching)은
+요청 앞부분이 '글자 그대로' 같을 때만 동작합니다. 따라서 템플릿은
+    [정적 지시문 (system)] → [가변 데이터 (user)]
+순서로 구성하고, 정적 부분은 모듈 로드 시 한 번만 만들어 재사용합니다.
+
+오프라인 토큰/비용 리포트:
+    python -m app.services.prompts
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    name/version으로 식별되는 프롬프트 템플릿.
+
+    system: 매 요청 동일한 정적 지시문 (캐시 가능한 prefix)
+    user_template: 가변 데이터만 담는 str.format 템플릿 (요청 마지막에 위치)
+    """
+
+    name: str
+    version: str
+    system: str
+    user_template: str
+    description: str = ""
+
+    def render(self, **values: str) -> Tuple[str, str]:
+        """(system_prompt, user_prompt)를 반환합니다."""
+        return self.system, self.user_template.format(**values)
+
+    def static_prefix(self) -> str:
+        """가변 데이터가 처음 등장하기 전까지의, 요청마다 동일한 부분입니다."""
+        first_field = self.user_template.find("{")
+        head = self.user_template if first_field < 0 else self.user_template[:first_field]
+        return self.system + head
+
+
+# name -> version -> PromptTemplate
+PROMPT_REGISTRY: Dict[str, Dict[str, PromptTemplate]] = {}
+
+
+def register_prompt(template: PromptTemplate) -> PromptTemplate:
+    PROMPT_REGISTRY.setdefault(template.name, {})[template.version] = template
+    return template
+
+
+def get_prompt(name: str, version: Optional[str] = None) -> PromptTemplate:
+    """
+    템플릿을 조회합니다. version이 None이면 가장 최신 버전을 반환합니다.
+    """
+    versions = PROMPT_REGISTRY.get(name)
+    if not versions:
+        raise KeyError(f"등록되지 않은 프롬프트입니다: {name}")
+    if version is None:
+        version = max(versions, key=lambda v: int(v.lstrip("v")))
+    if version not in versions:
+        raise KeyError(f"등록되지 않은 프롬프트 버전입니다: {name}/{version}")
+    return versions[version]
+
+
+# ----------------------------------------------------------------------
+# A. 캡션 개선 + 키워드 추출 (refine_caption)
+# ----------------------------------------------------------------------
+
+# v1: 기존 구조. 영어 시스템 프롬프트 + 사용자 캡션이 한국어 지시문 '중간'에 삽입되어
+#     캡션 뒤의 [요청 사항] 블록은 매 요청 prefix가 달라 캐시되지 않습니다.
+register_prompt(
+    PromptTemplate(
+        name="refine_caption",
+        version="v1",
+        description="기존 구조 (가변 데이터가 지시문 중간에 위치)",
+        system=(
+            "You are a helpful assistant that refines an image caption based on provided context. "
+            "Your final response MUST be a single JSON object with two keys: 'refined_caption' (String) and 'keywords' (Array of Strings). "
+            "Always write the 'refined_caption' key first, followed by 'keywords'. "
+            "The value of 'refined_caption' should be the final, refined caption in Korean. "
+            "The value of 'keywords' MUST be an array containing exactly 10 keywords in Korean. "
+        ),
+        user_template=(
+            "당신은 시각 장애인 친구에게 사진을 설명해주는 다정하고 친근한 도우미입니다.\n\n"
+            "제공된 '사용자 추가 정보'에는 사진 속 인물의 이름이나 중요 정보가 포함될 수 있습니다. 최종 해설 작성 시, 대명사 대신 '사용자 추가 정보'에 포함된 구체적인 이름이나 정보를 반드시 사용하여 서술해 주세요.\n\n"
+            "[입력 데이터]\n"
+            "1. 사진 캡션: '{original_caption}'\n"
+            "2. 사용자 추가 정보: '{file_info}'\n\n"
+            "[요청 사항]\n"
+            "1. 해설 생성: 위에 제시된 정보를 바탕으로, 눈으로 보는 것처럼 사진의 상황, 분위기, 감정을 생생하고 직관적인 언어로 전달하는 최종 해설을 작성해주세요.\n"
+            "2. 키워드 추출: 이 사진과 해설을 대표하는 **객체, 장소, 분위기, 감정, 인물의 이름**을 포함하는 **10개의 핵심 키워드**를 추출해주세요. 키워드는 명사 또는 명사구 형태여야 합니다."
+        ),
+    )
+)
+
+# v2: 모든 지시문을 system으로 올려 정적 prefix로 만들고, user 메시지에는 입력 데이터만 둡니다.
+#     영어/한국어로 중복 기술되던 출력 형식 지시도 한 번만 기술합니다.
+register_prompt(
+    PromptTemplate(
+        name="refine_caption",
+        version="v2",
+        description="정적 지시문 우선, 가변 데이터 마지막 (prefix 캐시 친화)",
+        system=(
+            "당신은 시각 장애인 친구에게 사진을 설명해주는 다정하고 친근한 도우미입니다.\n"
+            "사용자 메시지의 [입력 데이터]에는 사진 캡션(영어일 수 있음)과 사용자 추가 정보가 주어집니다. "
+            "사용자 추가 정보에는 사진 속 인물의 이름이나 중요 정보가 포함될 수 있으므로, "
+            "해설 작성 시 대명사 대신 그 구체적인 이름이나 정보를 반드시 사용하세요.\n\n"
+            "[요청 사항]\n"
+            "1. 해설 생성: 눈으로 보는 것처럼 사진의 상황, 분위기, 감정을 생생하고 직관적인 한국어로 전달하는 최종 해설을 작성합니다.\n"
+            "2. 키워드 추출: 객체, 장소, 분위기, 감정, 인물의 이름을 포함해 사진과 해설을 대표하는 한국어 명사(구) 키워드를 정확히 10개 추출합니다.\n\n"
+            "[출력 형식]\n"
+            'JSON 객체 하나만 출력합니다: {"refined_caption": "<해설>", "keywords": ["<키워드1>", ..., "<키워드10>"]}. '
+            "'refined_caption' 키를 반드시 먼저 작성하세요."
+        ),
+        user_template=(
+            "[입력 데이터]\n"
+            "1. 사진 캡션: {original_caption}\n"
+            "2. 사용자 추가 정보: {file_info}"
+        ),
+    )
+)
+
+
+# ----------------------------------------------------------------------
+# A-2. 여러 사진을 한 번에 처리하는 배치 버전 (refine_caption_batch)
+# ----------------------------------------------------------------------
+
+# 지시문은 refine_caption/v2와 같고, 입력/출력만 JSON 배열 형태입니다.
+# 시스템 프롬프트가 항목마다 반복 전송되지 않으므로 항목당 입력 토큰이 크게 줄어듭니다.
+register_prompt(
+    PromptTemplate(
+        name="refine_caption_batch",
+        version="v1",
+        description="여러 (캡션, 사용자 정보) 쌍을 한 요청으로 처리",
+        system=(
+            "당신은 시각 장애인 친구에게 사진을 설명해주는 다정하고 친근한 도우미입니다.\n"
+            "사용자 메시지의 [입력 데이터 목록]은 JSON 배열이며, 각 항목은 index, 사진 캡션(caption, 영어일 수 있음), "
+            "사용자 추가 정보(user_info)로 이루어져 있습니다. 사용자 추가 정보에는 사진 속 인물의 이름이나 "
+            "중요 정보가 포함될 수 있으므로, 해설 작성 시 대명사 대신 그 구체적인 이름이나 정보를 반드시 사용하세요. "
+            "각 항목은 서로 독립된 사진이므로 다른 항목의 정보를 섞지 마세요.\n\n"
+            "[요청 사항] 항목마다 다음을 수행합니다.\n"
+            "1. 해설 생성: 눈으로 보는 것처럼 사진의 상황, 분위기, 감정을 생생하고 직관적인 한국어로 전달하는 최종 해설을 작성합니다.\n"
+            "2. 키워드 추출: 객체, 장소, 분위기, 감정, 인물의 이름을 포함해 사진과 해설을 대표하는 한국어 명사(구) 키워드를 정확히 10개 추출합니다.\n\n"
+            "[출력 형식]\n"
+            'JSON 객체 하나만 출력합니다: {"results": [{"index": <입력 index>, "refined_caption": "<해설>", '
+            '"keywords": ["<키워드1>", ..., "<키워드10>"]}, ...]}. '
+            "입력의 모든 index에 대해 정확히 하나의 결과를 같은 순서로 작성하세요."
+        ),
+        user_template="[입력 데이터 목록]\n{items}",
+    )
+)
+
+
+# ----------------------------------------------------------------------
+# B. 오프라인 토큰 계산 및 비용/지연 리포트
+# ----------------------------------------------------------------------
+
+# 입력 토큰 단가 (USD / 1M tokens). 캐시 적중 토큰은 CACHED_INPUT_DISCOUNT 비율로 과금됩니다.
+MODEL_INPUT_PRICE_PER_MTOK: Dict[str, float] = {
+    "gpt-3.5-turbo": 0.50,
+    "gpt-4o-mini": 0.15,
+    "gpt-4o": 2.50,
+}
+CACHED_INPUT_DISCOUNT = 0.5
+# OpenAI prompt caching은 prefix가 1024 토큰 이상일 때만 적용됩니다.
+MIN_CACHEABLE_PREFIX_TOKENS = 1024
+# 입력 토큰 처리(prefill)에 드는 대략적인 시간 (ms / 1K tokens). 캐시 적중 시 이 시간이 절약됩니다.
+PREFILL_MS_PER_KTOK = 40.0
+
+# 리포트에 사용할 대표 입력값
+SAMPLE_VALUES = {
+    "original_caption": "a man in a white shirt and black pants sitting on a stool in a room",
+    "file_info": "오늘 일산 스튜디오에서 민수가 찍어 준 프로필 사진",
+    "items": '[{"index": 0, "caption": "a man in a white shirt and black pants sitting on a stool in a room", '
+    '"user_info": "오늘 일산 스튜디오에서 민수가 찍어 준 프로필 사진"}]',
+}
+
+
+def load_token_counter(model: str = "gpt-3.5-turbo") -> Tuple[str, Callable[[str], int]]:
+    """
+    로컬 토크나이저를 불러옵니다. tiktoken(및 로컬 캐시된 BPE 파일)이 있으면 정확한 값을,
+    없으면 문자 종류 기반 근사값을 사용합니다. (이름, 카운터 함수)를 반환합니다.
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model(model)
+        return f"tiktoken/{encoding.name}", lambda text: len(encoding.encode(text))
+    except Exception as e:
+        print(f"Warning: tiktoken unavailable ({type(e).__name__}). Using approximate token counts.")
+
+    def approximate(text: str) -> int:
+        # BPE 기준 한글 음절은 대략 1토큰, 그 외 문자는 약 4자당 1토큰입니다.
+        hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+        return hangul + math.ceil((len(text) - hangul) / 4)
+
+    return "approx", approximate
+
+
+def template_report(
+    template: PromptTemplate,
+    count_tokens: Callable[[str], int],
+    model: str = "gpt-3.5-turbo",
+    values: Optional[Dict[str, str]] = None,
+) -> Dict[str, float]:
+    """템플릿 1개의 토큰 수와 1,000건당 예상 입력 비용/절약 지연을 계산합니다."""
+    system, user = template.render(**(values or SAMPLE_VALUES))
+    total = count_tokens(system) + count_tokens(user)
+    static = min(count_tokens(template.static_prefix()), total)
+    cacheable = static if static >= MIN_CACHEABLE_PREFIX_TOKENS else 0
+
+    price = MODEL_INPUT_PRICE_PER_MTOK.get(model, 0.0) / 1_000_000
+    cost_no_cache = total * price * 1000
+    cost_with_cache = ((total - cacheable) + cacheable * CACHED_INPUT_DISCOUNT) * price * 1000
+
+    return {
+        "total_tokens": total,
+        "static_prefix_tokens": static,
+        "variable_tokens": total - static,
+        "cacheable_tokens": cacheable,
+        "cost_per_1k_requests_usd": cost_with_cache,
+        "cache_saving_per_1k_requests_usd": cost_no_cache - cost_with_cache,
+        "prefill_saving_ms": cacheable * PREFILL_MS_PER_KTOK / 1000,
+    }
+
+
+def print_report(model: str = "gpt-3.5-turbo") -> None:
+    tokenizer_name, count_tokens = load_token_counter(model)
+    print(f"[Prompt report] model={model}, tokenizer={tokenizer_name}")
+    for name, versions in PROMPT_REGISTRY.items():
+        baseline: Optional[Dict[str, float]] = None
+        for version in sorted(versions, key=lambda v: int(v.lstrip("v"))):
+            report = template_report(versions[version], count_tokens, model)
+            line = (
+                f"  {name}/{version}: total={report['total_tokens']} "
+                f"static={report['static_prefix_tokens']} "
+                f"variable={report['variable_tokens']} "
+                f"cacheable={report['cacheable_tokens']} "
+                f"cost/1k=${report['cost_per_1k_requests_usd']:.4f} "
+                f"prefill_saving={report['prefill_saving_ms']:.1f}ms"
+            )
+            if baseline is not None:
+                saved_tokens = baseline["total_tokens"] - report["total_tokens"]
+                saved_cost = (
+                    baseline["cost_per_1k_requests_usd"] - report["cost_per_1k_requests_usd"]
+                )
+                line += f" | vs v1: -{saved_tokens} tokens, -${saved_cost:.4f}/1k"
+            else:
+                baseline = report
+            print(line)
+
+
+if __name__ == "__main__":
+    print_report()
@@ -0,0 +1,200 @@
+# app/services/similarity.py
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    """임베딩을 L2 정규화한 뒤 float16 바이트열로 변환합니다. (DB 저장용, float32 대비 절반 크기)"""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+    return vector.astype(np.float16).tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    """DB에 저장된 float16 바이트열을 float32 벡터로 되돌립니다."""
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+
+class SimilarityIndex:
+    """
+    이미지 임베딩 코사인 유사도 검색 인덱스 (NumPy, 인메모리)
+
+    - 기본은 전수 비교(brute force): 정규화된 임베딩 행렬과 질의 벡터의 행렬 곱 한 번으로 점수를 계산합니다.
+    - 벡터 수가 ivf_min_size 이상이면 IVF(역 파일) 분할을 만들어, 질의와 가까운 nprobe개 분할만 비교합니다.
+      (분할은 구면 k-means로 만들며, 이후 추가되는 벡터는 가장 가까운 분할에 배정합니다.)
+    """
+
+    def __init__(
+        self,
+        ivf_min_size: int = 20000,
+        nprobe: int = 8,
+        model: Optional[str] = None,
+    ):
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self.model = model  # 인덱스에 담긴 임베딩을 만든 모델 이름
+        self.dim: Optional[int] = None
+        self._ids = np.empty(0, dtype=np.int64)
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._assign = np.empty(0, dtype=np.int32)  # 행별 IVF 분할 번호
+        self._rows: Dict[int, int] = {}  # image_id → 행 번호
+        self._size = 0
+        self.centroids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, image_id: int) -> bool:
+        return image_id in self._rows
+
+    # ----------------------------------------------------
+    # 추가 / 삭제
+    # ----------------------------------------------------
+    def _reserve(self, count: int) -> None:
+        # 용량을 두 배씩 늘려 추가 비용을 상수 시간으로 유지합니다.
+        capacity = self._vectors.shape[0]
+        if self._size + count <= capacity:
+            return
+        new_capacity = max(self._size + count, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+        assign = np.zeros(new_capacity, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._vectors, self._ids, self._assign = vectors, ids, assign
+
+    def add_many(self, image_ids: Iterable[int], vectors: np.ndarray) -> None:
+        """여러 임베딩을 추가합니다. 이미 있는 id는 새 벡터로 교체합니다."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        image_ids = [int(image_id) for image_id in image_ids]
+        if not image_ids:
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vectors = np.empty((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"embedding dim {vectors.shape[1]} != index dim {self.dim}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        assign = self._nearest_centroid(vectors)
+
+        self._reserve(len(image_ids))
+        for image_id, vector, cell in zip(image_ids, vectors, assign):
+            row = self._rows.get(image_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[image_id] = row
+                self._ids[row] = image_id
+            self._vectors[row] = vector
+            self._assign[row] = cell
+
+    def add(self, image_id: int, vector: np.ndarray) -> None:
+        self.add_many([image_id], np.asarray(vector)[None, :])
+
+    def remove(self, image_id: int) -> None:
+        row = self._rows.pop(image_id, None)
+        if row is None:
+            return
+        # 마지막 행을 빈자리로 옮겨 배열을 연속으로 유지합니다.
+        last = self._size - 1
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._ids[row] = moved_id
+            self._vectors[row] = self._vectors[last]
+            self._assign[row] = self._assign[last]
+            self._rows[moved_id] = row
+        self._size -= 1
+
+    def get_vector(self, image_id: int) -> Optional[np.ndarray]:
+        row = self._rows.get(image_id)
+        return None if row is None else self._vectors[row].copy()
+
+    # ----------------------------------------------------
+    # IVF 분할
+    # ----------------------------------------------------
+    def _nearest_centroid(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        현재 벡터로 구면 k-means를 실행해 IVF 분할을 만듭니다. (기본 분할 수: √N)
+        """
+        if self._size == 0:
+            return
+        vectors = self._vectors[: self._size]
+        n_lists = min(n_lists or max(int(math.sqrt(self._size)), 1), self._size)
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(self._size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            # 빈 분할은 임의의 벡터로 다시 시작합니다.
+            sums[empty] = vectors[rng.choice(self._size, int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        self._assign[: self._size] = self._nearest_centroid(vectors)
+        print(f"[SimilarityIndex] IVF built: {self._size} vectors, {n_lists} lists")
+
+    def maybe_build_ivf(self) -> None:
+        if self._size >= self.ivf_min_size > 0:
+            self.build_ivf()
+
+    # ----------------------------------------------------
+    # 검색
+    # ----------------------------------------------------
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        exclude_ids: Iterable[int] = (),
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        코사인 유사도가 높은 순으로 (image_id, score) 최대 k개를 반환합니다.
+        """
+        if self._size == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        if self.centroids is not None and self._size >= self.ivf_min_size:
+            probes = np.argsort(-(self.centroids @ query))[: nprobe or self.nprobe]
+            rows = np.flatnonzero(np.isin(self._assign[: self._size], probes))
+        else:
+            rows = np.arange(self._size)
+
+        exclude = {int(image_id) for image_id in exclude_ids}
+        if exclude:
+            rows = rows[~np.isin(self._ids[rows], list(exclude))]
+        if rows.size == 0:
+            return []
+
+        scores = self._vectors[rows] @ query
+        top = min(k, rows.size)
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(int(self._ids[rows[i]]), float(scores[i])) for i in best]
+
+
+# 프로세스 전역 이미지 유사도 인덱스 (FastAPI lifespan에서 DB로부터 적재)
+image_similarity_index = SimilarityIndex(
+    ivf_min_size=settings.SIMILARITY_IVF_MIN_SIZE,
+    nprobe=settings.SIMILARITY_IVF_NPROBE,
+)
@@ -0,0 +1,124 @@
+# app/services/write_behind.py
+
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class WriteBehindQueue(Generic[T]):
+    """
+    레코드를 모아 한 번에 저장하는 비동기 write-behind 큐입니다.
+
+    submit()으로 들어온 레코드를 모아 두었다가, max_batch_size개가 모이거나
+    첫 레코드 이후 max_delay초가 지나면 flush 함수(다중 행 INSERT + 커밋 1회)로 저장합니다.
+    flush 함수는 입력과 같은 순서의 ID 목록을 반환해야 하며, 각 호출자는 자기 레코드의 ID를 받습니다.
+
+    배치 저장이 실패하면 문제가 된 레코드만 실패하도록 레코드를 하나씩 다시 저장합니다.
+    FastAPI lifespan에서 start()로 시작하고, 종료 시 close()로 남은 레코드를 모두 저장합니다.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[List[int]]],
+        max_batch_size: int = 64,
+        max_delay: float = 0.05,
+        name: str = "write-behind",
+    ):
+        self._flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, item: T) -> int:
+        """
+        레코드를 큐에 넣고, 배치가 커밋되면 저장된 ID를 반환합니다.
+        큐가 시작되지 않았다면(테스트, 스크립트 등) 바로 저장합니다.
+        """
+        if not self.running:
+            return (await self._flush([item]))[0]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """새 레코드를 받지 않고, 큐에 남은 레코드를 모두 저장한 뒤 종료합니다."""
+        if not self.running:
+            return
+        await self._queue.put(None)  # 종료 신호
+        await self._worker
+        self._worker = None
+
+    # ----------------------------------------------------
+    # 내부 기능
+    # ----------------------------------------------------
+    async def _collect(self, first) -> Tuple[List[tuple], bool]:
+        """첫 레코드 이후 크기/시간 임계값까지 레코드를 모읍니다. (배치, 종료 신호 수신 여부)"""
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            try:
+                entry = (
+                    self._queue.get_nowait()
+                    if remaining <= 0
+                    else await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch, stopping = await self._collect(first)
+            await self._write(batch)
+
+        # 종료 신호 이후에 들어온 레코드도 저장합니다.
+        leftover = []
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not None:
+                leftover.append(entry)
+        for start in range(0, len(leftover), self.max_batch_size):
+            await self._write(leftover[start:start + self.max_batch_size])
+
+    async def _write(self, batch: List[tuple]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            ids = await self._flush(items)
+        except Exception as e:
+            print(f"[{self.name}] batch of {len(items)} failed, retrying one by one: {e}")
+            for item, future in batch:
+                try:
+                    result = (await self._flush([item]))[0]
+                except Exception as item_error:
+                    if not future.done():
+                        future.set_exception(item_error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+
+        for (_, future), image_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(image_id)
@@ -0,0 +1,30 @@
+# app/tests/database_case.py
+
+import os
+import tempfile
+import unittest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.models import *  # noqa: F401,F403 (Base.metadata에 모든 테이블 등록)
+from app.database.profiles import create_engine_for_profile, get_storage_profile
+
+
+class TempDatabaseTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    테스트마다 임시 SQLite 파일 DB(운영과 같은 저장소 프로필)를 만들어 주는 기반 클래스입니다.
+    """
+
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        profile = get_storage_profile(f"sqlite:///{os.path.join(self._tmp.name, 'test.db')}")
+        self.engine = create_engine_for_profile(profile)
+        self.Session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self._tmp.cleanup()
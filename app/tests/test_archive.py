@@ -0,0 +1,141 @@
+# app/tests/test_archive.py
+
+import io
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import select
+
+from app.database.models import ImageModel, MonthlySummaryModel
+from app.schemas.image import ImageCreate
+from app.services import archive, crud
+from app.services.dedup import NearDuplicateIndex
+from app.tests.database_case import TempDatabaseTestCase
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def make_images():
+    return [
+        ImageCreate(
+            file=f"{i}.jpg",
+            refined_caption=f"일기 {i}",
+            blip_text="a dog",
+            keywords="바다,강아지" if i % 2 else None,
+            latitude=37.5665 if i == 0 else None,
+            longitude=126.978 if i == 0 else None,
+            created_at=datetime(2025, 12, 31, 10, i),
+        )
+        for i in range(5)
+    ]
+
+
+class ArchiveTest(TempDatabaseTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        patcher = mock.patch.object(crud, "image_hash_index", NearDuplicateIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        async with self.Session() as db:
+            await crud.create_images_batch(db, make_images())
+
+    async def _export(self, archive_format):
+        chunks = [
+            chunk
+            async for chunk in archive.stream_archive(archive_format, self.Session, batch_size=2)
+        ]
+        return chunks
+
+    async def _rows(self):
+        async with self.Session() as db:
+            result = await db.execute(
+                select(
+                    ImageModel.file,
+                    ImageModel.refined_caption,
+                    ImageModel.keywords,
+                    ImageModel.latitude,
+                    ImageModel.created_at,
+                ).order_by(ImageModel.id)
+            )
+            return [tuple(row) for row in result.all()]
+
+    async def test_ndjson_round_trip(self):
+        """
+        NDJSON을 batch 단위로 내보내고, 가져오면 원래 작성 시각까지 같은 일기가 추가되는지 테스트합니다.
+        이미 있는 일기(파일 이름, 해시, 작성 시각이 같음)는 다시 저장하지 않습니다.
+        """
+        chunks = await self._export("ndjson")
+        self.assertEqual(len(chunks), 3)  # 5행 / batch 2
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        self.assertEqual(json.loads(lines[0])["refined_caption"], "일기 0")
+
+        original = await self._rows()
+        renamed = json.dumps(dict(json.loads(lines[0]), file="copy.jpg"), ensure_ascii=False).encode()
+        payload = b"".join(chunks) + renamed + b"\n" + renamed + b"\n" + b"not json\n" + b'{"file": "x.jpg"}\n'
+        result = await archive.import_records(archive.iter_ndjson(io.BytesIO(payload)), self.Session, batch_size=2)
+        self.assertEqual((result["imported"], result["duplicates"], result["failed"]), (1, 6, 2))
+        self.assertEqual([error["record"] for error in result["errors"]], [8, 9])
+        self.assertEqual(await self._rows(), original + [("copy.jpg",) + original[0][1:]])
+
+        # 가져온 일기도 원래 작성 월의 집계에 더해집니다.
+        async with self.Session() as db:
+            month = await db.get(MonthlySummaryModel, "2025-12")
+            self.assertEqual(month.entry_count, 6)
+
+        # 같은 파일을 다시 가져와도 일기가 늘어나지 않습니다.
+        result = await archive.import_records(archive.iter_ndjson(io.BytesIO(payload)), self.Session)
+        self.assertEqual((result["imported"], result["duplicates"]), (0, 7))
+        self.assertEqual(len(await self._rows()), 6)
+
+    async def test_same_second_ties_are_paged_after_import(self):
+        """
+        같은 초에 작성된 일기를 가져온 뒤에도 타임라인 커서가 같은 초의 행을 빠뜨리지 않는지 테스트합니다.
+        """
+        payload = "".join(
+            json.dumps({"file": f"burst-{i}.jpg", "refined_caption": "연사", "created_at": "2025-12-31T10:00:00"})
+            + "\n"
+            for i in range(5)
+        ).encode()
+        result = await archive.import_records(archive.iter_ndjson(io.BytesIO(payload)), self.Session)
+        self.assertEqual(result["imported"], 5)
+        async with self.Session() as db:
+            await crud.create_image_data(db, ImageCreate(file="now.jpg", refined_caption="오늘", blip_text=""))
+
+        ids, cursor = [], None
+        async with self.Session() as db:
+            while True:
+                rows, cursor = await crud.list_diary_summaries(db, limit=2, cursor=cursor)
+                ids.extend(row.id for row in rows)
+                if cursor is None:
+                    break
+        # 기존 일기 1(10:00)과 가져온 일기 6~10이 같은 초입니다.
+        self.assertEqual(ids, [11, 5, 4, 3, 2, 10, 9, 8, 7, 6, 1])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    async def test_parquet_round_trip(self):
+        """
+        Parquet를 row group 단위로 스트리밍해 쓴 파일이 올바르게 읽히고 가져와지는지 테스트합니다.
+        """
+        import pyarrow.parquet as pq
+
+        data = b"".join(await self._export("parquet"))
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        self.assertEqual(parquet_file.metadata.num_rows, 5)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+
+        original = await self._rows()
+        result = await archive.import_records(archive.iter_parquet(io.BytesIO(data)), self.Session)
+        self.assertEqual((result["imported"], result["duplicates"]), (0, 5))
+        self.assertEqual(await self._rows(), original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+# app/tests/test_caption_details.py
+
+import unittest
+
+from app.services.llm_service import describe_with_details
+
+
+class DescribeWithDetailsTest(unittest.TestCase):
+
+    def test_joins_conditional_captions(self):
+        details = {"the mood is": "the mood is calm.", "people in the photo are": "people in the photo are"}
+        self.assertEqual(
+            describe_with_details("a dog on the beach", details),
+            "a dog on the beach. the mood is calm",
+        )
+
+    def test_without_details(self):
+        self.assertEqual(describe_with_details("a dog on the beach"), "a dog on the beach")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+# app/tests/test_circuit_breaker.py
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.core import deadline
+from app.services import llm_service
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "chatgpt",
+            failure_threshold=3,
+            slow_call_threshold=2.0,
+            reset_timeout=10.0,
+            clock=self.clock,
+        )
+
+    def test_opens_after_consecutive_failures_and_recovers(self):
+        """
+        연속 실패 시 open → 시간 경과 후 half-open 탐색 1회 → 성공하면 closed로 돌아오는지 테스트합니다.
+        """
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.clock.now = 10.0
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()  # 탐색 호출은 1개만 허용
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success(0.1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        """
+        성공했더라도 느린 호출이 연속되면 회로가 열리고, half-open 탐색 실패 시 다시 open 되는지 테스트합니다.
+        """
+        for _ in range(3):
+            self.breaker.record_success(5.0)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now = 10.0
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class StreamingBreakerTest(unittest.IsolatedAsyncioTestCase):
+    """SSE 스트리밍이 클라이언트 연결 종료로 중단될 때 half-open 탐색 예약을 반환하는지 테스트합니다."""
+
+    async def asyncSetUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("chatgpt", failure_threshold=1, reset_timeout=10.0, clock=self.clock)
+        self.breaker.record_failure()
+        self.clock.now = 10.0  # half-open: 탐색 호출 1개만 허용
+        self.chunk_delay = 0
+
+        async def chunks():
+            for text in ('{"refined_caption": "바닷가의 ', '하루", ', '"keywords": []}'):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+                await asyncio.sleep(self.chunk_delay)
+
+        async def create(**kwargs):
+            return chunks()
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        for patcher in (
+            mock.patch.object(llm_service, "async_openai_client", client),
+            mock.patch.object(llm_service, "llm_router", SimpleNamespace(breakers={"chatgpt": self.breaker})),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_disconnect_releases_half_open_probe(self):
+        stream = llm_service.stream_refined_caption_and_keywords_with_chatgpt_async("a beach", "휴가")
+        first = await stream.__anext__()
+        self.assertEqual(first["event"], "caption")
+        self.assertFalse(self.breaker.allow())  # 탐색 호출 진행 중
+
+        await stream.aclose()  # 클라이언트 연결 종료 (GeneratorExit)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+    async def test_cancelled_stream_releases_half_open_probe(self):
+        """다음 조각을 기다리는 중에 요청 작업이 취소되는 경우 (CancelledError)"""
+        self.chunk_delay = 10
+
+        async def consume():
+            async for _ in llm_service.stream_refined_caption_and_keywords_with_chatgpt_async("a beach", "휴가"):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(self.breaker.allow())
+
+
+class RequestDeadlineTest(unittest.TestCase):
+
+    def test_budget_is_capped_by_remaining_request_time(self):
+        """
+        하위 호출 타임아웃이 요청의 남은 마감 시간을 넘지 않고, 마감이 지나면 즉시 실패하는지 테스트합니다.
+        """
+        self.assertEqual(deadline.budget(20.0), 20.0)  # 마감 미설정
+
+        token = deadline.set_request_deadline(1.0)
+        try:
+            self.assertLessEqual(deadline.budget(20.0), 1.0)
+            self.assertEqual(deadline.budget(0.5), 0.5)
+        finally:
+            deadline.reset_request_deadline(token)
+
+        token = deadline.set_request_deadline(-1.0)
+        try:
+            with self.assertRaises(deadline.DeadlineExceededError):
+                deadline.budget(20.0)
+        finally:
+            deadline.reset_request_deadline(token)
+
+    def test_header_cannot_extend_server_deadline(self):
+        self.assertEqual(deadline.parse_deadline_header("1500", 30.0), 1.5)
+        self.assertEqual(deadline.parse_deadline_header("90000", 30.0), 30.0)
+        self.assertEqual(deadline.parse_deadline_header("abc", 30.0), 30.0)
+        self.assertEqual(deadline.parse_deadline_header(None, 30.0), 30.0)
@@ -0,0 +1,135 @@
+# app/tests/test_dedup.py
+
+import random
+import unittest
+from io import BytesIO
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.services.dedup import BKTree, NearDuplicateIndex
+from app.tests.database_case import TempDatabaseTestCase
+from captioning_module.phash import dhash, hamming_distance, image_hash, load_image
+
+
+def make_photo(seed, size=(640, 480)):
+    """무작위 색 블록으로 된 테스트용 사진"""
+    rng = np.random.default_rng(seed)
+    blocks = rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    return Image.fromarray(blocks).resize(size, Image.BILINEAR)
+
+
+def to_jpeg(image, quality=90):
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class PerceptualHashTest(unittest.TestCase):
+
+    def test_dhash_is_stable_for_resized_and_recompressed_copies(self):
+        """
+        크기 조정/재압축한 같은 사진은 해시가 거의 같고, 다른 사진은 크게 다른지 테스트합니다.
+        """
+        photo = make_photo(0, size=(2000, 1500))
+        original = image_hash(to_jpeg(photo))
+        copy = image_hash(to_jpeg(photo.resize((800, 600)), quality=60))
+        other = dhash(make_photo(1))
+
+        self.assertEqual(len(original), 16)
+        self.assertLessEqual(hamming_distance(original, copy), 4)
+        self.assertGreater(hamming_distance(original, other), 12)
+
+    def test_draft_decoding_is_limited_to_the_hash(self):
+        """
+        해시는 축소 디코딩으로 계산해도 원본 해시와 거의 같고, BLIP 입력은 원본 해상도로 디코딩하는지 테스트합니다.
+        """
+        data = to_jpeg(make_photo(2, size=(2000, 1500)))
+
+        self.assertEqual(load_image(data).size, (2000, 1500))
+        self.assertLessEqual(hamming_distance(image_hash(data), dhash(load_image(data))), 2)
+
+    def test_bk_tree_matches_linear_scan(self):
+        """
+        BK-tree 검색 결과가 전체 비교(선형 탐색)와 같은지 테스트합니다.
+        """
+        rnd = random.Random(0)
+        values = [rnd.getrandbits(64) for _ in range(2000)]
+        # 일부는 기존 해시에서 몇 비트만 바꾼 근접 중복으로 만듭니다.
+        for i in range(0, 2000, 10):
+            values[i] = values[i + 1] ^ (1 << rnd.randrange(64)) ^ (1 << rnd.randrange(64))
+        tree = BKTree()
+        for image_id, value in enumerate(values):
+            tree.add(value, image_id)
+
+        for query in values[:50]:
+            expected = sorted(
+                ((query ^ value).bit_count(), image_id)
+                for image_id, value in enumerate(values)
+                if (query ^ value).bit_count() <= 6
+            )
+            self.assertEqual(tree.search(query, 6), expected)
+
+    def test_negative_threshold_disables_matching(self):
+        index = NearDuplicateIndex(max_distance=-1)
+        index.add(1, "0123456789abcdef")
+        self.assertEqual(index.find("0123456789abcdef"), [])
+
+    def test_flat_images_are_not_near_duplicates(self):
+        """
+        서로 다른 단색/저대비 사진은 dHash가 같아지므로(0000000000000000), 근접 중복으로 찾지 않는지 테스트합니다.
+        """
+        red = dhash(Image.new("RGB", (640, 480), (200, 30, 30)))
+        blue = dhash(Image.new("RGB", (640, 480), (20, 40, 220)))
+        gradient = dhash(Image.linear_gradient("L").rotate(90).convert("RGB"))
+        self.assertEqual(red, blue)
+
+        index = NearDuplicateIndex(max_distance=6, min_bits=8)
+        index.add(1, red)
+        index.add(2, gradient)
+        index.add(3, dhash(make_photo(4)))
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.find(blue), [])
+        self.assertEqual(index.find(gradient), [])
+        self.assertEqual(index.find(dhash(make_photo(4))), [(0, 3)])
+
+
+class NearDuplicateDatabaseTest(TempDatabaseTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        patcher = mock.patch.object(crud, "image_hash_index", NearDuplicateIndex(max_distance=6))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_near_duplicate_reuses_stored_caption(self):
+        """
+        저장된 사진의 근접 중복을 찾고, 서버 재시작 후에도 DB에서 인덱스를 다시 만드는지 테스트합니다.
+        """
+        photo = make_photo(2)
+        stored_hash = image_hash(to_jpeg(photo))
+        burst_hash = image_hash(to_jpeg(photo.resize((600, 450)), quality=70))
+
+        async with self.Session() as db:
+            stored = await crud.create_image_data(
+                db,
+                ImageCreate(
+                    file="a.jpg", refined_caption="일기", blip_text="a dog", phash=stored_hash
+                ),
+            )
+            duplicate = await crud.find_near_duplicate(db, burst_hash)
+            self.assertEqual(duplicate.id, stored.id)
+            self.assertIsNone(await crud.find_near_duplicate(db, dhash(make_photo(3))))
+
+        with mock.patch.object(crud, "image_hash_index", NearDuplicateIndex(max_distance=6)):
+            async with self.Session() as db:
+                self.assertEqual(await crud.load_hash_index(db), 1)
+                duplicate = await crud.find_near_duplicate(db, burst_hash)
+                self.assertEqual(duplicate.blip_text, "a dog")
+
+
+if __name__ == "__main__":
+    unittest.main()
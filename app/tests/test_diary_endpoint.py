@@ -0,0 +1,177 @@
+# app/tests/test_diary_endpoint.py
+
+import asyncio
+import time
+import unittest
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from PIL import Image
+
+from app.services.dedup import NearDuplicateIndex
+from captioning_module.phash import dhash
+from captioning_module.tier_router import CaptionTierRouter
+
+# 라우터 모듈은 import 시 BLIP 캡셔너를 불러오므로, 가짜 캡셔너 라우터로 바꿔 import 합니다.
+with mock.patch.object(
+    CaptionTierRouter, "get_tier_router", return_value=CaptionTierRouter({"large": SimpleNamespace()})
+):
+    from app.routers.v1 import images
+
+lookup_near_duplicate = images.crud.lookup_near_duplicate
+
+
+def make_png(image=None) -> bytes:
+    buffer = BytesIO()
+    (image or Image.new("RGB", (32, 32), (200, 120, 40))).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_photo() -> Image.Image:
+    """무작위 색 블록으로 된 테스트용 사진 (dHash 비트가 고르게 섞임)"""
+    blocks = np.random.default_rng(0).integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    return Image.fromarray(blocks).resize((320, 240), Image.BILINEAR)
+
+
+def flip_bits(phash: str, count: int) -> str:
+    return f"{int(phash, 16) ^ ((1 << count) - 1):016x}"
+
+
+class FakeCaptioner:
+    embedding_model = None
+
+    def __init__(self):
+        self.prompts = []
+
+    def get_blip_analyze_with_prompts(self, image, prompts):
+        self.prompts.append(list(prompts))
+        return "a dog on the beach", {prompt: f"{prompt} calm" for prompt in prompts}, None
+
+
+class DiaryEndpointTest(unittest.IsolatedAsyncioTestCase):
+    """
+    /diary/ 엔드포인트 테스트 (BLIP, LLM, DB 저장은 가짜로 대체)
+    """
+
+    async def asyncSetUp(self):
+        app = FastAPI()
+        app.include_router(images.router)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        self.addAsyncCleanup(self.client.aclose)
+
+        self.captioner = FakeCaptioner()
+        self.llm = mock.AsyncMock(
+            return_value={"refined_caption": "바닷가의 하루", "keywords": ["바다"], "provider": "chatgpt"}
+        )
+        for patcher in (
+            mock.patch.object(images, "caption_router", CaptionTierRouter({"large": self.captioner})),
+            mock.patch.object(images.crud, "lookup_near_duplicate", mock.AsyncMock(return_value=None)),
+            mock.patch.object(images.crud, "save_image_data_in_background", mock.AsyncMock()),
+            mock.patch.object(images, "get_refined_caption_and_keywords_async", self.llm),
+            mock.patch.object(images, "get_llm_warmup_urls", return_value=["https://llm.example"]),
+            # 예열을 확인하는 테스트는 ensure_warm을 다시 바꿉니다. (그 외에는 실제 연결을 시도하지 않음)
+            mock.patch.object(images.llm_http_pool, "ensure_warm", mock.AsyncMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def post_diary(self, image=None, **data):
+        return await self.client.post(
+            "/diary/",
+            files={"image_file": ("photo.png", make_png(image), "image/png")},
+            data={"user_input": "여름 휴가", **data},
+        )
+
+    def stored_image(self, phash):
+        return SimpleNamespace(
+            id=7, phash=phash, blip_text="a dog on the beach", file_info="여름 휴가",
+            refined_caption="지난번 일기", keywords="바다,여름",
+        )
+
+    async def test_slow_warm_up_does_not_delay_response(self):
+        """예열이 오래 걸려도 /diary/가 예열을 기다리지 않고 응답하는지 테스트합니다."""
+        warm_up_started = asyncio.Event()
+
+        async def slow_warm_up(urls):
+            warm_up_started.set()
+            await asyncio.sleep(5)
+
+        with mock.patch.object(images.llm_http_pool, "ensure_warm", side_effect=slow_warm_up):
+            t0 = time.perf_counter()
+            response = await self.post_diary()
+            elapsed = time.perf_counter() - t0
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["diary"], "바닷가의 하루")
+        self.assertTrue(warm_up_started.is_set())
+        self.assertLess(elapsed, 1.0)
+        self.llm.assert_awaited_once()
+        for task in list(images.llm_http_pool._warmup_tasks):
+            task.cancel()
+
+    async def test_failed_warm_up_does_not_break_diary(self):
+        with mock.patch.object(
+            images.llm_http_pool, "ensure_warm", side_effect=RuntimeError("connect failed")
+        ):
+            response = await self.post_diary()
+            await asyncio.sleep(0)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["tags"], ["바다"])
+        self.assertEqual(response.json()["model_tier"], "large")
+
+    async def test_different_flat_images_do_not_share_a_diary(self):
+        """
+        해시가 같아지는 서로 다른 단색 사진(0000000000000000)이 이전 사진의 일기를 재사용하지 않는지 테스트합니다.
+        """
+        index = NearDuplicateIndex(max_distance=6)
+        index.add(7, dhash(Image.new("RGB", (32, 32), (20, 40, 220))))
+        with mock.patch.object(images.crud, "image_hash_index", index), mock.patch.object(
+            images.crud, "lookup_near_duplicate", lookup_near_duplicate
+        ):
+            response = await self.post_diary()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.json()["duplicate_of"])
+        self.assertEqual(response.json()["diary"], "바닷가의 하루")
+        self.llm.assert_awaited_once()
+
+    async def test_diary_is_reused_only_within_tighter_distance(self):
+        """
+        캡션 재사용 거리(PHASH_MAX_DISTANCE) 안이어도 일기 재사용 거리(PHASH_DIARY_MAX_DISTANCE)를 넘으면
+        캡션만 재사용하고 일기는 새로 만드는지 테스트합니다.
+        """
+        photo = make_photo()
+        phash = dhash(photo)
+        for distance, reused in ((0, True), (images.settings.PHASH_DIARY_MAX_DISTANCE + 2, False)):
+            with self.subTest(distance=distance):
+                self.llm.reset_mock()
+                with mock.patch.object(
+                    images.crud,
+                    "lookup_near_duplicate",
+                    mock.AsyncMock(return_value=self.stored_image(flip_bits(phash, distance))),
+                ):
+                    response = await self.post_diary(photo)
+
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(response.json()["duplicate_of"], 7)
+                self.assertEqual(response.json()["diary"], "지난번 일기" if reused else "바닷가의 하루")
+                self.assertEqual(self.llm.await_count, 0 if reused else 1)
+
+    async def test_conditional_captions_are_opt_in(self):
+        """조건부 캡션은 요청에 conditional_captions=true가 있을 때만 만들고 LLM 입력에 덧붙이는지 테스트합니다."""
+        with mock.patch.object(images.settings, "BLIP_CONDITIONAL_PROMPTS", ["the mood is"]):
+            await self.post_diary()
+            await self.post_diary(conditional_captions="true")
+
+        self.assertEqual(self.captioner.prompts, [[], ["the mood is"]])
+        self.assertEqual(self.llm.await_args_list[0].args[0], "a dog on the beach")
+        self.assertEqual(self.llm.await_args_list[1].args[0], "a dog on the beach. the mood is calm")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# app/tests/test_diary_summaries.py
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, update
+
+from app.services.backfill import rebuild_diary_summaries
+from app.database.models import DailySummaryModel, ImageModel, MonthlySummaryModel
+from app.database.summaries import period_keys
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.tests.database_case import TempDatabaseTestCase
+
+
+def make_image(keywords):
+    return ImageCreate(file="a.jpg", refined_caption="오늘의 일기", blip_text="caption", keywords=keywords)
+
+
+class DiarySummaryTest(TempDatabaseTestCase):
+
+    async def _set_created_at(self, image_id, created_at):
+        async with self.Session() as db:
+            await db.execute(
+                update(ImageModel).where(ImageModel.id == image_id).values(created_at=created_at)
+            )
+            await db.commit()
+
+    async def _snapshot(self):
+        async with self.Session() as db:
+            days = (await db.execute(select(DailySummaryModel).order_by(DailySummaryModel.day))).scalars().all()
+            months = (await db.execute(select(MonthlySummaryModel))).scalars().all()
+            calendar = {
+                month.month: await crud.get_month_calendar(db, month.month) for month in months
+            }
+        return (
+            [(d.day, d.entry_count, d.latest_image_id) for d in days],
+            [(m.month, m.entry_count, m.latest_image_id) for m in months],
+            {month: value["top_tags"] for month, value in calendar.items()},
+        )
+
+    def test_period_keys_use_diary_timezone(self):
+        """UTC 저장 시각이 DIARY_TIMEZONE 기준 날짜로 바뀌는지 테스트합니다. (서울 = UTC+9)"""
+        seoul = ZoneInfo("Asia/Seoul")
+        self.assertEqual(period_keys(datetime(2026, 1, 31, 15, 30), seoul), ("2026-02-01", "2026-02"))
+        self.assertEqual(period_keys(datetime(2026, 1, 31, 14, 59), seoul), ("2026-01-31", "2026-01"))
+
+    async def test_incremental_summaries_match_rebuild(self):
+        """
+        단건/배치 저장 시 증분 갱신된 집계가, 전체 재계산 결과와 같은지 테스트합니다.
+        """
+        async with self.Session() as db:
+            await crud.create_image_data(db, make_image("바다,강아지"))
+            await crud.create_image_data(db, make_image("바다"))
+            batch_ids = await crud.create_images_batch(db, [make_image("산책,바다"), make_image(None)])
+
+        async with self.Session() as db:
+            month = (await db.execute(select(MonthlySummaryModel))).scalars().one()
+            self.assertEqual(month.entry_count, 4)
+            self.assertEqual(month.latest_image_id, max(batch_ids))
+            calendar = await crud.get_month_calendar(db, month.month)
+            self.assertEqual(calendar["top_tags"][month.month][:2], ["바다", "강아지"])
+            self.assertEqual(sum(day.entry_count for day in calendar["days"]), 4)
+            self.assertIn(max(batch_ids), calendar["representatives"])
+
+        incremental = await self._snapshot()
+        self.assertEqual(await rebuild_diary_summaries(self.Session), 4)
+        self.assertEqual(await self._snapshot(), incremental)
+
+    async def test_rebuild_groups_by_day_and_month(self):
+        """
+        저장 시각을 바꾼 뒤 재계산하면 날짜/월별로 나뉘고, 월 목록이 최근 달부터 나오는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            ids = [
+                (await crud.create_image_data(db, make_image(tags))).id
+                for tags in ("바다", "바다,하늘", "눈")
+            ]
+        await self._set_created_at(ids[0], datetime(2026, 1, 10, 3, 0))
+        await self._set_created_at(ids[1], datetime(2026, 1, 10, 5, 0))
+        await self._set_created_at(ids[2], datetime(2026, 2, 1, 1, 0))
+
+        # 첫 배포가 아니면(집계가 이미 있으면) only_if_empty 재계산은 건너뜁니다.
+        self.assertEqual(await rebuild_diary_summaries(self.Session, only_if_empty=True), 0)
+        await rebuild_diary_summaries(self.Session)
+
+        async with self.Session() as db:
+            january = await crud.get_month_calendar(db, "2026-01")
+            self.assertEqual(
+                [(day.day, day.entry_count, day.latest_image_id) for day in january["days"]],
+                [("2026-01-10", 2, ids[1])],
+            )
+            self.assertEqual(january["top_tags"]["2026-01-10"], ["바다", "하늘"])
+
+            empty = await crud.get_month_calendar(db, "2025-12")
+            self.assertIsNone(empty["month"])
+            self.assertEqual(empty["days"], [])
+
+            months = await crud.list_monthly_summaries(db, limit=12)
+            self.assertEqual([row.month for row in months["months"]], ["2026-02", "2026-01"])
+            self.assertEqual(months["top_tags"]["2026-01"], ["바다", "하늘"])
@@ -0,0 +1,109 @@
+# app/tests/test_diary_timeline.py
+
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.database.migrations import ensure_indexes, normalize_sqlite_timestamps
+from app.database.models import ImageModel
+from app.services import crud
+from app.tests.database_case import TempDatabaseTestCase
+
+
+class DiaryTimelineTest(TempDatabaseTestCase):
+
+    async def collect_pages(self, limit):
+        pages, cursor = [], None
+        async with self.Session() as db:
+            while True:
+                rows, cursor = await crud.list_diary_summaries(db, limit=limit, cursor=cursor)
+                pages.append([row.id for row in rows])
+                if cursor is None:
+                    return pages
+
+    async def test_pages_cover_all_rows_newest_first(self):
+        """
+        기본값으로 저장된 행과 과거 시각 행이 섞여도 커서 페이지가 빠짐/중복 없이 최신순인지 테스트합니다.
+        """
+        async with self.Session() as db:
+            db.add_all([ImageModel(file=f"{i}.jpg", refined_caption="일기" * 100) for i in range(7)])
+            db.add(ImageModel(file="old.jpg", refined_caption="옛날", created_at=datetime(2020, 1, 1, 9, 30)))
+            await db.commit()
+
+        pages = await self.collect_pages(limit=3)
+        ids = [image_id for page in pages for image_id in page]
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+        self.assertEqual(ids, [7, 6, 5, 4, 3, 2, 1, 8])
+
+        async with self.Session() as db:
+            rows, _ = await crud.list_diary_summaries(db, limit=1)
+            self.assertEqual(len(rows[0].preview), crud.DIARY_PREVIEW_LENGTH)
+
+    async def test_legacy_timestamps_are_normalized(self):
+        """
+        이전 기본값(func.now())으로 소수점 초 없이 저장된 행과 같은 초의 행이 마이그레이션 후 빠짐없이 페이지되는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            for i in range(3):
+                await db.execute(
+                    text(
+                        "INSERT INTO images (file, refined_caption, created_at) "
+                        "VALUES (:file, '옛 일기', '2025-01-01 10:00:00')"
+                    ),
+                    {"file": f"legacy-{i}.jpg"},
+                )
+            db.add_all(
+                [
+                    ImageModel(file=f"{i}.jpg", refined_caption="일기", created_at=datetime(2025, 1, 1, 10))
+                    for i in range(3)
+                ]
+            )
+            await db.commit()
+
+        self.assertEqual(await normalize_sqlite_timestamps(self.Session), 3)
+        pages = await self.collect_pages(limit=2)
+        self.assertEqual([image_id for page in pages for image_id in page], [6, 5, 4, 3, 2, 1])
+
+    async def test_timestamp_normalization_runs_once(self):
+        """정리가 끝난 DB에서는 서버를 다시 시작해도 images 전체를 훑는 UPDATE를 다시 실행하지 않는지 테스트합니다."""
+        self.assertEqual(await normalize_sqlite_timestamps(self.Session), 0)
+        async with self.Session() as db:
+            await db.execute(
+                text(
+                    "INSERT INTO images (file, refined_caption, created_at) "
+                    "VALUES ('late.jpg', '옛 일기', '2025-01-01 10:00:00')"
+                )
+            )
+            await db.commit()
+
+        self.assertEqual(await normalize_sqlite_timestamps(self.Session), 0)
+        async with self.Session() as db:
+            stored = (await db.execute(text("SELECT created_at FROM images"))).scalar()
+        self.assertEqual(stored, "2025-01-01 10:00:00")
+
+    async def test_invalid_cursor_is_rejected(self):
+        async with self.Session() as db:
+            with self.assertRaises(ValueError):
+                await crud.list_diary_summaries(db, cursor="not-a-cursor")
+
+    async def test_keyset_query_uses_composite_index(self):
+        """
+        기존 DB에 인덱스가 없어도 ensure_indexes로 추가되고, 커서 조회가 그 인덱스를 사용하는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            await db.execute(text("DROP INDEX ix_images_created_at_id"))
+            await db.commit()
+
+        await ensure_indexes(self.Session)
+
+        async with self.Session() as db:
+            plan = (
+                await db.execute(
+                    text(
+                        "EXPLAIN QUERY PLAN SELECT id FROM images "
+                        "WHERE (created_at, id) < ('2030-01-01 00:00:00', 10) "
+                        "ORDER BY created_at DESC, id DESC LIMIT 20"
+                    )
+                )
+            ).all()
+        self.assertIn("ix_images_created_at_id", " ".join(str(row) for row in plan))
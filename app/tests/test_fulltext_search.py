@@ -0,0 +1,137 @@
+# app/tests/test_fulltext_search.py
+
+from sqlalchemy import text, update
+
+from app.database.fulltext import build_search_query, ensure_fulltext_index
+from app.database.models import ImageModel
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.tests.database_case import TempDatabaseTestCase
+
+
+def make_image(refined_caption, blip_text="", file_info=None):
+    return ImageCreate(
+        file="a.jpg", refined_caption=refined_caption, blip_text=blip_text, file_info=file_info
+    )
+
+
+class FulltextSearchTest(TempDatabaseTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with self.Session() as db:
+            # 인덱스 생성 전에 저장된 행도 검색되어야 합니다. (rebuild)
+            db.add(ImageModel(file="old.jpg", refined_caption="오래된 해변 산책 기록", blip_text=""))
+            await db.commit()
+            await ensure_fulltext_index(db)
+
+    async def ids(self, query, **kwargs):
+        async with self.Session() as db:
+            return [image.id for image in await crud.search_images_fulltext(db, query, **kwargs)]
+
+    async def test_korean_terms_are_found_in_all_columns(self):
+        """
+        3글자 이상(trigram 색인)과 2글자(LIKE) 한국어 검색어가 모든 대상 컬럼에서 검색되는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            a = await crud.create_image_data(db, make_image("강아지와 해변을 산책했다", "a dog on the beach"))
+            b = await crud.create_image_data(db, make_image("카페에서 커피", file_info="친구와 해변 근처"))
+
+        self.assertEqual(await self.ids("강아지와"), [a.id])
+        self.assertEqual(sorted(await self.ids("해변")), sorted([1, a.id, b.id]))
+        self.assertEqual(await self.ids("해변 커피"), [b.id])
+        self.assertEqual(await self.ids("beach dog"), [a.id])
+        self.assertEqual(await self.ids("없는단어"), [])
+        # FTS/LIKE 특수문자는 일반 문자로 취급합니다.
+        self.assertEqual(await self.ids('"강아지 100%'), [])
+
+    async def test_index_follows_updates_and_deletes(self):
+        async with self.Session() as db:
+            image = await crud.create_image_data(db, make_image("눈 내리는 겨울 산책"))
+            await db.execute(
+                update(ImageModel).where(ImageModel.id == image.id).values(refined_caption="봄날의 벚꽃놀이")
+            )
+            await db.commit()
+
+        self.assertEqual(await self.ids("겨울 산책"), [])
+        self.assertEqual(await self.ids("벚꽃놀이"), [image.id])
+
+        async with self.Session() as db:
+            await db.delete(await db.get(ImageModel, image.id))
+            await db.commit()
+        self.assertEqual(await self.ids("벚꽃놀이"), [])
+
+    async def test_migration_replaces_old_trigger_bodies(self):
+        """
+        이전 버전이 만든 트리거(모든 UPDATE에 반응하던 images_fts_au)가 마이그레이션 후 새 본문으로 바뀌는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            await db.execute(text("DROP TRIGGER images_fts_au"))
+            await db.execute(
+                text(
+                    """
+                    CREATE TRIGGER images_fts_au AFTER UPDATE ON images BEGIN
+                        INSERT INTO images_fts(images_fts, rowid, refined_caption, blip_text, file_info)
+                        VALUES ('delete', old.id, old.refined_caption, old.blip_text, old.file_info);
+                        INSERT INTO images_fts(rowid, refined_caption, blip_text, file_info)
+                        VALUES (new.id, new.refined_caption, new.blip_text, new.file_info);
+                    END
+                    """
+                )
+            )
+            await db.commit()
+            await ensure_fulltext_index(db)
+            body = (
+                await db.execute(text("SELECT sql FROM sqlite_master WHERE name = 'images_fts_au'"))
+            ).scalar()
+        self.assertIn("UPDATE OF refined_caption, blip_text, file_info", body)
+        self.assertEqual(await self.ids("해변 산책"), [1])
+
+    async def test_short_terms_use_bigram_index(self):
+        """
+        trigram 색인을 쓸 수 없는 2글자/1글자 검색어가 LIKE 전체 스캔 대신 bigram 기본 키 검색으로 처리되는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            a = await crud.create_image_data(db, make_image("눈 내리는 겨울 바다", file_info="Sea"))
+            b = await crud.create_image_data(db, make_image("여름 바다와 강아지와 산책"))
+
+        self.assertEqual(await self.ids("바다"), [b.id, a.id])
+        self.assertEqual(await self.ids("바다 강아지와"), [b.id])
+        self.assertEqual(await self.ids("눈"), [a.id])
+        self.assertEqual(await self.ids("se"), [a.id])  # 대소문자 무시
+        self.assertEqual(await self.ids("다눈"), [])
+
+        async with self.Session() as db:
+            for query in ("바다", "눈", "바다 눈", "바다 강아지와"):
+                sql, params = build_search_query("sqlite", query, 20, 0)
+                plan = (await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)).all()
+                details = [row[-1] for row in plan]
+                with self.subTest(query=query, plan=details):
+                    self.assertTrue(any("SEARCH images_bigrams USING PRIMARY KEY" in d for d in details))
+                    # images 테이블/bigram 테이블 전체 스캔 없음 (FTS5 MATCH 인덱스 사용은 허용)
+                    self.assertFalse(
+                        any(d.startswith("SCAN images") and "VIRTUAL TABLE" not in d for d in details)
+                    )
+
+        # 수정/삭제가 bigram 테이블에도 반영됩니다.
+        async with self.Session() as db:
+            await db.execute(update(ImageModel).where(ImageModel.id == a.id).values(refined_caption="봄 산"))
+            await db.commit()
+        self.assertEqual(await self.ids("눈"), [])
+        self.assertEqual(await self.ids("봄"), [a.id])
+        async with self.Session() as db:
+            await db.delete(await db.get(ImageModel, b.id))
+            await db.commit()
+        self.assertEqual(await self.ids("바다"), [])
+
+    async def test_results_are_ranked_and_paginated(self):
+        async with self.Session() as db:
+            strong = await crud.create_image_data(db, make_image("공원에서 공원에서 산책"))
+            weak = await crud.create_image_data(db, make_image("공원에서 점심을 먹고 집으로 돌아오는 길, 하늘이 맑았다"))
+
+        # 검색어가 여러 번 나오는 짧은 문서가 최신 문서보다 bm25 점수가 높습니다.
+        ranked = await self.ids("공원에서")
+        self.assertEqual(ranked, [strong.id, weak.id])
+        first = await self.ids("공원에서", limit=1)
+        second = await self.ids("공원에서", limit=1, offset=1)
+        self.assertEqual(first + second, ranked)
@@ -0,0 +1,81 @@
+# app/tests/test_geo.py
+
+import random
+import unittest
+
+from sqlalchemy import text
+
+from app.database.migrations import ensure_columns
+from app.services.backfill import backfill_geohash
+from app.database.models import ImageModel
+from app.schemas.image import ImageCreate
+from app.services import crud, geo
+from app.tests.database_case import TempDatabaseTestCase
+
+SEOUL_CITY_HALL = (37.566535, 126.977969)
+
+
+class GeohashTest(unittest.TestCase):
+
+    def test_known_geohash(self):
+        self.assertEqual(geo.encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+
+    def test_covering_cells_contain_every_point_in_radius(self):
+        """
+        반경 안의 임의의 점이 항상 covering_prefixes 중 하나로 시작하는지 테스트합니다. (경도 180도 경계 포함)
+        """
+        rng = random.Random(0)
+        for lat, lon, radius in [(*SEOUL_CITY_HALL, 300), (37.5, 179.999, 2000), (-33.9, 151.2, 20000)]:
+            prefixes = geo.covering_prefixes(lat, lon, radius)
+            for _ in range(500):
+                d_lat = rng.uniform(-1, 1) * radius / geo.METERS_PER_DEGREE
+                d_lon = rng.uniform(-1, 1) * radius / geo.METERS_PER_DEGREE / 0.7
+                p_lat, p_lon = lat + d_lat, (lon + d_lon + 180) % 360 - 180
+                if geo.haversine_m(lat, lon, p_lat, p_lon) > radius:
+                    continue
+                code = geo.encode_geohash(p_lat, p_lon)
+                self.assertTrue(any(code.startswith(p) for p in prefixes))
+
+
+class NearbyQueryTest(TempDatabaseTestCase):
+
+    async def test_nearby_returns_only_points_in_radius_sorted(self):
+        lat, lon = SEOUL_CITY_HALL
+        async with self.Session() as db:
+            near = await crud.create_image_data(
+                db, ImageCreate(file="a", refined_caption="시청", blip_text="", latitude=lat + 0.001, longitude=lon)
+            )
+            nearer = await crud.create_image_data(
+                db, ImageCreate(file="b", refined_caption="시청 앞", blip_text="", latitude=lat, longitude=lon + 0.0005)
+            )
+            await crud.create_image_data(
+                db, ImageCreate(file="c", refined_caption="부산", blip_text="", latitude=35.1796, longitude=129.0756)
+            )
+            await crud.create_image_data(db, ImageCreate(file="d", refined_caption="위치 없음", blip_text=""))
+
+            matches = await crud.find_images_near(db, lat, lon, radius_m=300)
+
+        self.assertEqual([row.id for row, _ in matches], [nearer.id, near.id])
+        self.assertLess(matches[0][1], matches[1][1])
+        self.assertLess(matches[1][1], 300)
+
+    async def test_existing_database_gets_column_and_backfill(self):
+        """
+        geohash 컬럼이 없던 기존 DB에 컬럼을 추가하고 기존 행의 geohash를 채우는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            await db.execute(text("DROP INDEX ix_images_geohash"))
+            await db.execute(text("ALTER TABLE images DROP COLUMN geohash"))
+            await db.execute(
+                text("INSERT INTO images (file, refined_caption, latitude, longitude, created_at) "
+                     "VALUES ('old', '일기', 37.566535, 126.977969, CURRENT_TIMESTAMP)")
+            )
+            await db.commit()
+
+        await ensure_columns(self.Session)
+        self.assertEqual(await backfill_geohash(self.Session), 1)
+
+        async with self.Session() as db:
+            image = await db.get(ImageModel, 1)
+            self.assertEqual(image.geohash, geo.encode_geohash(*SEOUL_CITY_HALL))
+            self.assertEqual(len(await crud.find_images_near(db, *SEOUL_CITY_HALL, radius_m=10)), 1)
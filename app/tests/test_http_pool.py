@@ -0,0 +1,122 @@
+# app/tests/test_http_pool.py
+
+import asyncio
+import unittest
+from unittest import mock
+
+from app.core.config import settings
+from app.core.http_pool import LlmHttpPool
+
+
+class KeepAliveServer:
+    """
+    연결을 끊지 않고(keep-alive) 빈 200 응답을 돌려주는 로컬 HTTP 서버입니다.
+    새로 맺어진 TCP 연결 수와 요청 수를 기록합니다.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class LlmHttpPoolTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # 평문 로컬 서버이므로 HTTP/1.1 연결 수로 재사용 여부를 확인합니다.
+        patcher = mock.patch.object(settings, "LLM_HTTP2", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = LlmHttpPool()
+        self.addAsyncCleanup(self.pool.close)
+
+    async def test_warm_up_connections_are_reused(self):
+        """
+        예열로 맺은 연결(호스트당 LLM_HTTP_WARM_CONNECTIONS개)을 이후 요청이 새 핸드셰이크 없이 재사용하는지 테스트합니다.
+        """
+        async with KeepAliveServer(delay=0.05) as server:
+            await self.pool.warm_up([server.base_url])
+            self.assertEqual(server.connections, settings.LLM_HTTP_WARM_CONNECTIONS)
+
+            await asyncio.gather(*(self.pool.client.get(server.base_url) for _ in range(2)))
+            self.assertEqual(server.connections, settings.LLM_HTTP_WARM_CONNECTIONS)
+            self.assertEqual(server.requests, settings.LLM_HTTP_WARM_CONNECTIONS + 2)
+
+    async def test_ensure_warm_skips_recently_used_hosts(self):
+        async with KeepAliveServer() as server:
+            await self.pool.client.get(server.base_url)
+            requests = server.requests
+
+            await self.pool.ensure_warm([server.base_url])
+            self.assertEqual(server.requests, requests)
+
+    async def test_warm_up_failure_does_not_raise(self):
+        """예열 대상에 연결할 수 없어도 예외 없이 넘어가는지 테스트합니다. (서버 기동을 막지 않음)"""
+        async with KeepAliveServer() as server:
+            url = server.base_url
+        await self.pool.warm_up([url])
+
+    async def test_keepalive_pings_quietly(self):
+        """keep-alive는 호스트당 요청 하나씩만 보내고, 성공하면 아무것도 출력하지 않는지 테스트합니다."""
+        with mock.patch.object(settings, "LLM_HTTP_KEEPALIVE_INTERVAL", 0.01), mock.patch(
+            "builtins.print"
+        ) as printed:
+            async with KeepAliveServer() as server:
+                self.pool.start_keepalive([server.base_url])
+                await asyncio.wait_for(self._wait_for_requests(server, 3), timeout=5)
+                await self.pool.close()
+        self.assertEqual(server.connections, 1)
+        printed.assert_not_called()
+
+    async def _wait_for_requests(self, server, count):
+        while server.requests < count:
+            await asyncio.sleep(0.01)
+
+    async def test_close_stops_keepalive(self):
+        with mock.patch.object(settings, "LLM_HTTP_KEEPALIVE_INTERVAL", 0.01):
+            async with KeepAliveServer() as server:
+                self.pool.start_keepalive([server.base_url])
+                # 첫 클라이언트/연결 생성이 느릴 수 있으므로 고정 시간 대신 요청이 올 때까지 기다립니다.
+                await asyncio.wait_for(self._wait_for_requests(server, 1), timeout=5)
+
+                keepalive_task = self.pool._keepalive_task
+                await self.pool.close()
+                await asyncio.sleep(0)
+                self.assertTrue(keepalive_task.cancelled())
+                self.assertIsNone(self.pool._client)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# app/tests/test_json_stream.py
+
+import json
+import unittest
+
+from app.services.json_stream import JsonStringFieldStreamer
+
+
+class JsonStringFieldStreamerTest(unittest.TestCase):
+
+    def _feed_in_chunks(self, text, size):
+        streamer = JsonStringFieldStreamer("refined_caption")
+        pieces = [streamer.feed(text[i:i + size]) for i in range(0, len(text), size)]
+        return streamer, "".join(pieces)
+
+    def test_extracts_value_across_arbitrary_chunk_boundaries(self):
+        """
+        조각 크기와 관계없이 json.loads와 동일한 값을 복원하는지 테스트합니다.
+        """
+        data = {
+            "refined_caption": '바다 "앞"에서\n웃는 민수 \\ 😀 {괄호}',
+            "keywords": ["바다", "민수"],
+        }
+        text = json.dumps(data)  # ensure_ascii=True → \\uXXXX 및 서로게이트 쌍 포함
+
+        for size in (1, 2, 3, 7, len(text)):
+            streamer, extracted = self._feed_in_chunks(text, size)
+            self.assertEqual(extracted, data["refined_caption"])
+            self.assertTrue(streamer.done)
+
+    def test_ignores_same_name_in_nested_objects_and_values(self):
+        """
+        중첩 객체의 동일 키나, 값으로 등장한 필드명은 무시하는지 테스트합니다.
+        """
+        text = json.dumps(
+            {
+                "meta": {"refined_caption": "무시"},
+                "note": "refined_caption",
+                "refined_caption": "정답",
+            },
+            ensure_ascii=False,
+        )
+        streamer, extracted = self._feed_in_chunks(text, 4)
+        self.assertEqual(extracted, "정답")
+
+    def test_partial_value_is_not_done(self):
+        """
+        닫는 따옴표가 오기 전까지는 done이 False인지 테스트합니다.
+        """
+        streamer = JsonStringFieldStreamer("refined_caption")
+        self.assertEqual(streamer.feed('{"refined_caption": "오늘은 '), "오늘은 ")
+        self.assertFalse(streamer.done)
+        self.assertEqual(streamer.feed('맑음", "keywords": []}'), "맑음")
+        self.assertTrue(streamer.done)
@@ -0,0 +1,62 @@
+# app/tests/test_keyword_index.py
+
+from sqlalchemy import func, select
+
+from app.services.backfill import backfill_image_keywords
+from app.database.models import ImageModel, KeywordModel, image_keywords
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.tests.database_case import TempDatabaseTestCase
+
+
+def make_image(keywords):
+    return ImageCreate(file="a.jpg", refined_caption="일기", blip_text="caption", keywords=keywords)
+
+
+class KeywordIndexTest(TempDatabaseTestCase):
+
+    async def test_create_links_keywords_and_search_by_tags(self):
+        """
+        저장 시 태그가 정규화되어 연결되고, all/any 검색과 before_id 페이지 이동이 동작하는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            first = await crud.create_image_data(db, make_image("바다, 강아지,#Beach"))
+            second = await crud.create_image_data(db, make_image("바다,산책"))
+            third = await crud.create_image_data(db, make_image("강아지,바다,바다"))
+
+            keyword_count = (await db.execute(select(func.count()).select_from(KeywordModel))).scalar()
+            self.assertEqual(keyword_count, 4)  # 바다, 강아지, beach, 산책
+
+            both = await crud.search_images_by_tags(db, ["바다", "강아지"])
+            self.assertEqual([image.id for image in both], [third.id, first.id])
+
+            any_match = await crud.search_images_by_tags(db, ["산책", "beach"], match_all=False)
+            self.assertEqual([image.id for image in any_match], [second.id, first.id])
+
+            page = await crud.search_images_by_tags(db, ["바다"], limit=2)
+            self.assertEqual([image.id for image in page], [third.id, second.id])
+            rest = await crud.search_images_by_tags(db, ["바다"], limit=2, before_id=page[-1].id)
+            self.assertEqual([image.id for image in rest], [first.id])
+
+    async def test_backfill_links_existing_rows_once(self):
+        """
+        역색인 없이 저장된 기존 행을 백필하고, 다시 실행해도 중복 연결하지 않는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            db.add_all(
+                [
+                    ImageModel(file="old.jpg", refined_caption="일기", keywords="바다,하늘"),
+                    ImageModel(file="old.jpg", refined_caption="일기", keywords=" , "),
+                    ImageModel(file="old.jpg", refined_caption="일기", keywords=None),
+                ]
+            )
+            await db.commit()
+
+        self.assertEqual(await backfill_image_keywords(self.Session, batch_size=1), 1)
+        self.assertEqual(await backfill_image_keywords(self.Session), 0)
+
+        async with self.Session() as db:
+            links = (await db.execute(select(func.count()).select_from(image_keywords))).scalar()
+            self.assertEqual(links, 2)
+            found = await crud.search_images_by_tags(db, ["하늘"])
+            self.assertEqual(len(found), 1)
@@ -0,0 +1,123 @@
+# app/tests/test_llm_batch.py
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.core.deadline import reset_request_deadline, set_request_deadline
+from app.services import llm_service
+from app.services.llm_router import RoutedResult
+
+KEYWORDS = [f"키워드{i}" for i in range(llm_service.KEYWORD_COUNT)]
+
+
+def batch_entry(index, caption="배치 해설"):
+    return {"index": index, "refined_caption": f"{caption} {index}", "keywords": KEYWORDS}
+
+
+class BatchGenerationTest(unittest.IsolatedAsyncioTestCase):
+    """
+    여러 항목을 한 요청으로 생성할 때, 배치 응답이 잘못되었거나 일부만 오면
+    해당 항목만 개별 호출로 대체하는지 테스트합니다.
+    """
+
+    def setUp(self):
+        self.complete_json = mock.AsyncMock()
+        router = SimpleNamespace(providers={"chatgpt": object()}, complete_json=self.complete_json)
+        self.single = mock.AsyncMock(
+            side_effect=lambda caption, user_input, provider=None: {
+                "refined_caption": f"개별 해설 {caption}",
+                "keywords": KEYWORDS,
+            }
+        )
+        for patcher in (
+            mock.patch.object(llm_service, "llm_router", router),
+            mock.patch.object(llm_service, "get_refined_caption_and_keywords_async", self.single),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def respond(self, data):
+        self.complete_json.return_value = RoutedResult("chatgpt", data, 0.1, False)
+
+    async def generate(self, count=3):
+        items = [(str(i), "사용자 입력") for i in range(count)]
+        return await llm_service.get_refined_captions_and_keywords_batch_async(items, batch_size=count)
+
+    async def test_valid_batch_needs_no_fallback(self):
+        self.respond({"results": [batch_entry(2), batch_entry(0), batch_entry(1)]})
+        results = await self.generate()
+        self.assertEqual([r["refined_caption"] for r in results], ["배치 해설 0", "배치 해설 1", "배치 해설 2"])
+        self.assertEqual(results[0]["provider"], "chatgpt")
+        self.single.assert_not_awaited()
+
+    async def test_partial_results_fall_back_per_item(self):
+        self.respond({"results": [batch_entry(0)]})
+        results = await self.generate()
+        self.assertEqual(
+            [r["refined_caption"] for r in results], ["배치 해설 0", "개별 해설 1", "개별 해설 2"]
+        )
+        self.assertEqual(self.single.await_count, 2)
+
+    async def test_malformed_entries_fall_back_per_item(self):
+        """항목이 객체가 아니거나, index가 없거나 정수가 아니거나, 키워드 수가 틀리면 그 항목만 다시 생성합니다."""
+        bad_keywords = dict(batch_entry(2), keywords=["하나"])
+        self.respond(
+            {
+                "results": [
+                    "not an object",
+                    {"refined_caption": "index 없음", "keywords": KEYWORDS},
+                    dict(batch_entry(0), index=[0]),
+                    dict(batch_entry(1), index=True),
+                    batch_entry(1),
+                    bad_keywords,
+                ]
+            }
+        )
+        results = await self.generate()
+        self.assertEqual(
+            [r["refined_caption"] for r in results], ["개별 해설 0", "배치 해설 1", "개별 해설 2"]
+        )
+
+    async def test_malformed_response_falls_back_for_every_item(self):
+        for data in ([batch_entry(0)], "results", {"results": {"0": batch_entry(0)}}, {}):
+            with self.subTest(data=data):
+                self.single.reset_mock()
+                self.respond(data)
+                results = await self.generate()
+                self.assertEqual(
+                    [r["refined_caption"] for r in results], ["개별 해설 0", "개별 해설 1", "개별 해설 2"]
+                )
+                self.assertEqual(self.single.await_count, 3)
+
+    async def test_failed_batch_call_falls_back(self):
+        self.complete_json.side_effect = RuntimeError("deadline exceeded")
+        results = await self.generate(count=2)
+        self.assertEqual([r["refined_caption"] for r in results], ["개별 해설 0", "개별 해설 1"])
+
+    async def test_batch_timeout_is_clamped_to_request_deadline(self):
+        """배치 호출 타임아웃(LLM_BATCH_DEADLINE_SECONDS)이 요청 마감보다 길면 남은 시간으로 줄이는지 테스트합니다."""
+        self.respond({"results": [batch_entry(0), batch_entry(1)]})
+        token = set_request_deadline(5)
+        try:
+            await self.generate(count=2)
+        finally:
+            reset_request_deadline(token)
+        self.assertLessEqual(self.complete_json.await_args.kwargs["timeout"], 5)
+
+    async def test_failed_items_are_reported_as_errors(self):
+        """개별 호출까지 실패한 항목은 실패 메시지를 일기로 돌려주지 않고 error로 보고하는지 테스트합니다."""
+        self.respond({"results": [batch_entry(0)]})
+        self.single.side_effect = lambda caption, user_input, provider=None: {
+            "refined_caption": "LLM API 호출 실패: 요청 마감 시간이 지났습니다.",
+            "keywords": [],
+        }
+        results = await self.generate(count=2)
+        self.assertEqual(results[0]["refined_caption"], "배치 해설 0")
+        self.assertNotIn("error", results[0])
+        self.assertIsNone(results[1]["refined_caption"])
+        self.assertEqual(results[1]["error"], "LLM API 호출 실패: 요청 마감 시간이 지났습니다.")
+
+
+if __name__ == "__main__":
+    unittest.main()
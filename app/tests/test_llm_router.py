@@ -0,0 +1,205 @@
+# app/tests/test_llm_router.py
+
+import asyncio
+import json
+import time
+import unittest
+
+from openai import AsyncOpenAI
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.llm_providers import GeminiProvider, LlmProvider, OpenAIProvider
+from app.services.llm_router import LlmRouter, LlmRouterError
+
+
+class StubLlmServer:
+    """
+    OpenAI(chat.completions)와 Gemini(generateContent) 응답을 흉내 내는 로컬 HTTP 스텁 서버입니다.
+    delay(초)와 status로 느린 응답/오류 응답을 재현합니다.
+    """
+
+    def __init__(self, caption: str, delay: float = 0.0, status: int = 200):
+        self.caption = caption
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            self.requests += 1
+
+            await asyncio.sleep(self.delay)
+            content = json.dumps(
+                {"refined_caption": self.caption, "keywords": ["바다"]},
+                ensure_ascii=False,
+            )
+            if b"generateContent" in request_line:
+                payload = {"candidates": [{"content": {"parts": [{"text": content}]}}]}
+            else:
+                payload = {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "stub",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+            body = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {self.status} STUB\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class LlmRouterTest(unittest.IsolatedAsyncioTestCase):
+
+    def _router(self, openai_server, gemini_server, **kwargs):
+        providers = {
+            "chatgpt": OpenAIProvider(
+                AsyncOpenAI(
+                    api_key="test", base_url=f"{openai_server.base_url}/v1", max_retries=0
+                ),
+                "stub",
+            ),
+            "gemini": GeminiProvider("test", "stub", gemini_server.base_url),
+        }
+        kwargs.setdefault("hedge_min_delay", 0.05)
+        return LlmRouter(providers, **kwargs)
+
+    async def test_slow_primary_is_hedged_to_secondary(self):
+        """
+        첫 제공자가 헤지 지연을 넘기면 두 번째 제공자의 응답이 사용되는지 테스트합니다.
+        """
+        async with StubLlmServer("느린 응답", delay=2.0) as slow, StubLlmServer(
+            "빠른 응답"
+        ) as fast:
+            router = self._router(slow, fast, hedge_default_delay=0.2)
+
+            t0 = time.perf_counter()
+            result = await router.complete_json("sys", "user", timeout=5.0, preferred="chatgpt")
+
+            self.assertEqual(result.provider, "gemini")
+            self.assertEqual(result.data["refined_caption"], "빠른 응답")
+            self.assertTrue(result.hedged)
+            self.assertLess(time.perf_counter() - t0, 1.5)
+
+    async def test_failed_primary_fails_over_immediately(self):
+        """
+        첫 제공자가 오류를 반환하면 헤지 지연을 기다리지 않고 바로 다음 제공자를 호출하는지 테스트합니다.
+        """
+        async with StubLlmServer("오류", status=500) as broken, StubLlmServer(
+            "정상 응답"
+        ) as healthy:
+            router = self._router(broken, healthy, hedge_default_delay=3.0)
+
+            t0 = time.perf_counter()
+            result = await router.complete_json("sys", "user", timeout=5.0, preferred="chatgpt")
+
+            self.assertEqual(result.provider, "gemini")
+            self.assertLess(time.perf_counter() - t0, 1.0)
+            self.assertGreater(router.stats["chatgpt"].error_rate, 0.0)
+
+    async def test_deadline_is_enforced(self):
+        """
+        모든 제공자가 느리면 데드라인 시점에 LlmRouterError가 발생하는지 테스트합니다.
+        """
+        async with StubLlmServer("느림", delay=3.0) as a, StubLlmServer("느림", delay=3.0) as b:
+            router = self._router(a, b, hedge_default_delay=0.1)
+
+            t0 = time.perf_counter()
+            with self.assertRaises(LlmRouterError):
+                await router.complete_json("sys", "user", timeout=0.5)
+            self.assertLess(time.perf_counter() - t0, 1.0)
+
+    async def test_routing_prefers_faster_provider(self):
+        """
+        통계가 쌓이면 지연 시간이 짧은 제공자가 먼저 선택되는지 테스트합니다.
+        """
+        async with StubLlmServer("느림", delay=0.3) as slow, StubLlmServer("빠름") as fast:
+            router = self._router(slow, fast, hedge_default_delay=5.0)
+
+            for _ in range(3):
+                await router.complete_json("sys", "user", timeout=5.0, preferred="chatgpt", hedge=False)
+                await router.complete_json("sys", "user", timeout=5.0, preferred="gemini", hedge=False)
+
+            self.assertEqual(router.rank()[0], "gemini")
+            result = await router.complete_json("sys", "user", timeout=5.0)
+            self.assertEqual(result.provider, "gemini")
+
+    async def test_open_circuit_skips_provider_without_request(self):
+        """
+        회로가 열린 제공자에게는 요청을 보내지 않고, 모두 열리면 즉시 실패하는지 테스트합니다.
+        """
+        async with StubLlmServer("오류", status=500) as broken, StubLlmServer(
+            "정상 응답"
+        ) as healthy:
+            router = self._router(
+                broken, healthy, hedge_default_delay=3.0, breaker_failure_threshold=2
+            )
+            for _ in range(2):
+                await router.complete_json("sys", "user", timeout=5.0, preferred="chatgpt")
+            self.assertEqual(router.breakers["chatgpt"].state, CircuitBreaker.OPEN)
+
+            sent = broken.requests
+            result = await router.complete_json("sys", "user", timeout=5.0, preferred="chatgpt")
+            self.assertEqual(result.provider, "gemini")
+            self.assertEqual(broken.requests, sent)
+
+            for name in router.breakers:
+                for _ in range(2):
+                    router.breakers[name].record_failure()
+            t0 = time.perf_counter()
+            with self.assertRaises(LlmRouterError):
+                await router.complete_json("sys", "user", timeout=5.0)
+            self.assertLess(time.perf_counter() - t0, 0.1)
+
+
+class LlmProviderInterfaceTest(unittest.TestCase):
+
+    def test_complete_json_is_required(self):
+        """complete_json을 구현하지 않은 제공자는 만들 수 없는지 테스트합니다."""
+
+        class IncompleteProvider(LlmProvider):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteProvider()
+        with self.assertRaises(TypeError):
+            LlmProvider()
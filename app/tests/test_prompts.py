@@ -0,0 +1,70 @@
+# app/tests/test_prompts.py
+
+import unittest
+
+from app.services.llm_service import REFINE_SYSTEM_PROMPT, set_prompt_for_keyword
+from app.services.prompts import (
+    MIN_CACHEABLE_PREFIX_TOKENS,
+    get_prompt,
+    template_report,
+)
+
+
+class PromptRegistryTest(unittest.TestCase):
+
+    def test_get_prompt_versions(self):
+        self.assertEqual(get_prompt("refine_caption").version, "v2")  # 생략 시 최신 버전
+        self.assertEqual(get_prompt("refine_caption", "v1").version, "v1")
+        with self.assertRaises(KeyError):
+            get_prompt("refine_caption", "v9")
+        with self.assertRaises(KeyError):
+            get_prompt("unknown")
+
+    def test_v2_keeps_variable_data_last(self):
+        """
+        v2는 입력이 달라도 요청 앞부분(system + user의 데이터 앞부분)이 글자 그대로 같은지 테스트합니다.
+        (v1은 캡션 뒤에 지시문이 있어 입력마다 그 뒤가 달라짐)
+        """
+        template = get_prompt("refine_caption", "v2")
+        first = "".join(template.render(original_caption="a dog", file_info="바닷가"))
+        second = "".join(template.render(original_caption="a cat", file_info="거실"))
+        prefix = template.static_prefix()
+        self.assertTrue(first.startswith(prefix) and second.startswith(prefix))
+        self.assertNotIn("요청 사항", first[len(prefix):])
+
+        v1 = get_prompt("refine_caption", "v1")
+        rendered = v1.render(original_caption="a dog", file_info="바닷가")[1]
+        self.assertIn("요청 사항", rendered[rendered.index("a dog"):])
+
+    def test_llm_service_sends_only_data_in_user_message(self):
+        prompt = set_prompt_for_keyword("a dog on the beach", "여름 휴가")
+        self.assertIn("a dog on the beach", prompt)
+        self.assertIn("여름 휴가", prompt)
+        self.assertNotIn("요청 사항", prompt)
+        self.assertIn("요청 사항", REFINE_SYSTEM_PROMPT)
+
+    def test_report_counts_cacheable_prefix_only_above_minimum(self):
+        template = get_prompt("refine_caption", "v2")
+        # 글자 수를 토큰 수로 쓰면 현재 프롬프트는 최소 캐시 길이보다 짧습니다.
+        report = template_report(template, len, model="gpt-4o-mini")
+        self.assertLess(report["static_prefix_tokens"], MIN_CACHEABLE_PREFIX_TOKENS)
+        self.assertEqual(report["cacheable_tokens"], 0)
+        self.assertEqual(report["cache_saving_per_1k_requests_usd"], 0)
+        self.assertEqual(
+            report["total_tokens"], report["static_prefix_tokens"] + report["variable_tokens"]
+        )
+
+        # 토큰이 많다고 가정하면 정적 prefix가 캐시되어 비용/prefill 시간이 줄어듭니다.
+        report = template_report(template, lambda text: len(text) * 10, model="gpt-4o-mini")
+        self.assertEqual(report["cacheable_tokens"], report["static_prefix_tokens"])
+        self.assertGreater(report["cache_saving_per_1k_requests_usd"], 0)
+        self.assertGreater(report["prefill_saving_ms"], 0)
+
+    def test_v2_is_shorter_than_v1(self):
+        v1 = template_report(get_prompt("refine_caption", "v1"), len)
+        v2 = template_report(get_prompt("refine_caption", "v2"), len)
+        self.assertLess(v2["total_tokens"], v1["total_tokens"])
+
+
+if __name__ == "__main__":
+    unittest.main()
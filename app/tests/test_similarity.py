@@ -0,0 +1,128 @@
+# app/tests/test_similarity.py
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.services.similarity import SimilarityIndex, from_blob, to_blob
+from app.tests.database_case import TempDatabaseTestCase
+
+MODEL = "test-blip:vision-pooled"
+
+
+def brute_force(vectors, query, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+class SimilarityIndexTest(unittest.TestCase):
+
+    def test_exact_search_matches_brute_force(self):
+        """
+        전수 비교 검색 결과가 직접 계산한 코사인 유사도 순위와 같은지 테스트합니다.
+        """
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(500, 32)).astype(np.float32)
+        index = SimilarityIndex(ivf_min_size=0)
+        index.add_many(range(500), vectors)
+
+        query = rng.normal(size=32)
+        hits = index.search(query, k=10)
+        self.assertEqual([image_id for image_id, _ in hits], brute_force(vectors, query, 10))
+        self.assertTrue(all(a[1] >= b[1] for a, b in zip(hits, hits[1:])))
+
+        excluded = index.search(vectors[7], k=3, exclude_ids=[7])
+        self.assertNotIn(7, [image_id for image_id, _ in excluded])
+
+    def test_remove_and_replace(self):
+        """
+        삭제 후 검색되지 않고, 같은 id를 다시 추가하면 벡터가 교체되는지 테스트합니다.
+        """
+        index = SimilarityIndex()
+        index.add_many([1, 2, 3], np.eye(3, dtype=np.float32))
+        index.remove(1)
+        self.assertEqual(len(index), 2)
+        self.assertIn(index.search([1, 0, 0], k=1)[0][0], (2, 3))
+        self.assertNotIn(1, index)
+
+        index.add(3, np.array([1, 0, 0], dtype=np.float32))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search([1, 0, 0], k=1)[0][0], 3)
+
+    def test_ivf_recall_on_clustered_vectors(self):
+        """
+        IVF 분할 검색이 군집된 데이터에서 전수 비교 결과를 대부분 찾아내는지 테스트합니다.
+        """
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(40, 64))
+        vectors = (
+            centers[rng.integers(0, 40, size=4000)] + 0.3 * rng.normal(size=(4000, 64))
+        ).astype(np.float32)
+        index = SimilarityIndex(ivf_min_size=1000, nprobe=4)
+        index.add_many(range(4000), vectors)
+        index.maybe_build_ivf()
+        self.assertIsNotNone(index.centroids)
+
+        found = total = 0
+        for query in vectors[rng.choice(4000, 50, replace=False)]:
+            expected = set(brute_force(vectors, query, 10))
+            found += len(expected & {image_id for image_id, _ in index.search(query, k=10)})
+            total += len(expected)
+        self.assertGreaterEqual(found / total, 0.9)
+
+    def test_blob_round_trip(self):
+        vector = np.arange(1, 9, dtype=np.float32)
+        restored = from_blob(to_blob(vector))
+        np.testing.assert_allclose(restored, vector / np.linalg.norm(vector), atol=1e-3)
+
+
+class SimilarImagesDatabaseTest(TempDatabaseTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        patcher = mock.patch.object(crud, "image_similarity_index", SimilarityIndex(model=MODEL))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_image(self, caption, vector=None):
+        return ImageCreate(
+            file=f"{caption}.jpg",
+            refined_caption=caption,
+            blip_text="caption",
+            embedding=None if vector is None else to_blob(np.asarray(vector, dtype=np.float32)),
+            embedding_model=None if vector is None else MODEL,
+        )
+
+    async def test_embeddings_are_stored_and_searched(self):
+        """
+        단건/배치 저장 시 임베딩이 함께 저장되고, 재적재한 인덱스로 유사 일기를 찾는지 테스트합니다.
+        """
+        async with self.Session() as db:
+            beach = await crud.create_image_data(db, self.make_image("바다", [1, 0, 0]))
+            ids = await crud.create_images_batch(
+                db,
+                [
+                    self.make_image("해변", [0.9, 0.1, 0]),
+                    self.make_image("숲", [0, 1, 0]),
+                    self.make_image("임베딩 없음"),
+                ],
+            )
+
+            matches = await crud.find_similar_images(db, beach.id, limit=2)
+            self.assertEqual([row.id for row, _ in matches], [ids[0], ids[1]])
+            self.assertIsNone(await crud.find_similar_images(db, ids[2]))
+
+        # 서버 재시작: 빈 인덱스에 DB의 임베딩을 다시 적재합니다.
+        with mock.patch.object(crud, "image_similarity_index", SimilarityIndex()):
+            async with self.Session() as db:
+                self.assertEqual(await crud.load_similarity_index(db, MODEL), 3)
+                matches = await crud.find_similar_images(db, ids[1], limit=1)
+                self.assertEqual(matches[0][0].preview, "해변")
+
+
+if __name__ == "__main__":
+    unittest.main()
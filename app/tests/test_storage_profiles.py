@@ -0,0 +1,53 @@
+# app/tests/test_storage_profiles.py
+
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+
+from app.database.profiles import (
+    create_engine_for_profile,
+    get_storage_profile,
+    normalize_database_url,
+)
+
+
+class StorageProfileTest(unittest.IsolatedAsyncioTestCase):
+
+    def test_urls_are_mapped_to_async_drivers(self):
+        self.assertEqual(
+            normalize_database_url("sqlite:///./test.db"), "sqlite+aiosqlite:///./test.db"
+        )
+        self.assertEqual(
+            normalize_database_url("postgres://u:p@db/sodam"), "postgresql+asyncpg://u:p@db/sodam"
+        )
+        self.assertEqual(
+            normalize_database_url("postgresql://u:p@db/sodam"), "postgresql+asyncpg://u:p@db/sodam"
+        )
+
+    def test_postgres_profile_configures_pool(self):
+        profile = get_storage_profile("postgresql://u:p@db/sodam")
+        self.assertEqual(profile.name, "postgresql")
+        self.assertTrue(profile.engine_kwargs["pool_pre_ping"])
+        self.assertIn("pool_size", profile.engine_kwargs)
+        self.assertFalse(profile.engine_kwargs["echo"])
+
+    async def test_sqlite_pragmas_are_applied_on_connect(self):
+        """
+        SQLite 프로필로 만든 엔진의 연결에 WAL/synchronous/busy_timeout PRAGMA가 적용되는지 테스트합니다.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            profile = get_storage_profile(f"sqlite:///{os.path.join(tmp, 'profile.db')}")
+            engine = create_engine_for_profile(profile)
+            try:
+                async with engine.connect() as conn:
+                    journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                    synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+                    busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            finally:
+                await engine.dispose()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(busy_timeout, profile.sqlite_pragmas["busy_timeout"])
@@ -0,0 +1,95 @@
+# app/tests/test_write_behind.py
+
+import asyncio
+import unittest
+
+from sqlalchemy import func, select
+
+from app.database.models import ImageModel, image_keywords
+from app.schemas.image import ImageCreate
+from app.services import crud
+from app.services.write_behind import WriteBehindQueue
+from app.tests.database_case import TempDatabaseTestCase
+
+
+def make_image(i, keywords="바다,산책"):
+    return ImageCreate(
+        file=f"{i}.jpg", refined_caption=f"일기 {i}", blip_text="", keywords=keywords,
+        latitude=37.5, longitude=127.0,
+    )
+
+
+class CreateImagesBatchTest(TempDatabaseTestCase):
+
+    async def test_batch_insert_returns_ids_in_order_with_side_effects(self):
+        async with self.Session() as db:
+            ids = await crud.create_images_batch(db, [make_image(i) for i in range(5)])
+            files = dict((await db.execute(select(ImageModel.id, ImageModel.file))).all())
+            links = (await db.execute(select(func.count()).select_from(image_keywords))).scalar()
+            geohashes = (await db.execute(select(ImageModel.geohash))).scalars().all()
+
+        self.assertEqual([files[image_id] for image_id in ids], [f"{i}.jpg" for i in range(5)])
+        self.assertEqual(links, 10)
+        self.assertTrue(all(geohashes))
+
+
+class WriteBehindQueueTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_submits_share_batches(self):
+        """
+        동시에 들어온 레코드가 크기 임계값 단위로 묶여 저장되고, 각 호출자가 자기 ID를 받는지 테스트합니다.
+        """
+        batches = []
+
+        async def flush(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        queue = WriteBehindQueue(flush, max_batch_size=4, max_delay=1.0)
+        queue.start()
+        results = await asyncio.gather(*(queue.submit(i) for i in range(10)))
+        await queue.close()
+
+        self.assertEqual(results, [i * 10 for i in range(10)])
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+
+    async def test_time_threshold_flushes_partial_batch(self):
+        async def flush(items):
+            return list(items)
+
+        queue = WriteBehindQueue(flush, max_batch_size=100, max_delay=0.01)
+        queue.start()
+        self.assertEqual(await asyncio.wait_for(queue.submit(7), 1.0), 7)
+        await queue.close()
+
+    async def test_failing_record_does_not_fail_the_batch(self):
+        async def flush(items):
+            if "bad" in items:
+                raise ValueError("invalid record")
+            return [len(item) for item in items]
+
+        queue = WriteBehindQueue(flush, max_batch_size=10, max_delay=0.05)
+        queue.start()
+        results = await asyncio.gather(
+            queue.submit("a"), queue.submit("bad"), queue.submit("ccc"), return_exceptions=True
+        )
+        await queue.close()
+
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 3)
+
+    async def test_close_flushes_pending_records(self):
+        saved = []
+
+        async def flush(items):
+            saved.extend(items)
+            return list(range(len(items)))
+
+        queue = WriteBehindQueue(flush, max_batch_size=100, max_delay=60.0)
+        queue.start()
+        pending = [asyncio.create_task(queue.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        await queue.close()
+        await asyncio.gather(*pending)
+        self.assertEqual(sorted(saved), [0, 1, 2])
@@ -0,0 +1,46 @@
+# captioning_module/decoder_head.py
+"""
+디코더 IR에 붙이는 토큰 선택 헤드 (마지막 위치 logits 잘라내기 + greedy/top-k)
+
+디코더 출력 logits (B, seq_len, vocab)를 그대로 받으면 단계마다 seq_len × vocab(약 3만) 개의 float를
+호스트로 복사해야 합니다. 헤드를 붙이면 OpenVINO 그래프 안에서 행마다 positions[b] 위치만 골라
+TopK를 계산하므로, 호스트는 (B, k)개의 값/토큰 id만 받습니다. k=1이면 greedy(argmax)입니다.
+
+이 모듈은 export 스크립트(captioning_module 디렉터리에서 실행)에서도 import 하므로
+패키지 상대 import를 사용하지 않습니다.
+"""
+
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+
+POSITIONS_INPUT = "positions"
+
+
+def add_token_head(model: ov.Model, top_k: int = 1, logits_index: int = 0) -> ov.Model:
+    """
+    model의 logits 출력 뒤에 토큰 선택 헤드를 붙인 새 모델을 반환합니다.
+
+    입력: 기존 입력 + positions (B,) int64  (행마다 다음 토큰을 고를 위치 = 마지막 실제 토큰 인덱스)
+    출력: (top-k logits (B, k) float32, top-k 토큰 id (B, k) int64)  — 값 내림차순
+    """
+    if top_k < 1:
+        raise ValueError("top_k must be >= 1")
+    model = model.clone()
+    logits_result = model.get_results()[logits_index]
+    logits = logits_result.input_value(0)
+    positions = ops.parameter([-1], ov.Type.i64, name=POSITIONS_INPUT)
+    # (B, seq_len, vocab)에서 행마다 한 위치만: batch_dims=1 → (B, vocab)
+    last_logits = ops.gather(logits, positions, 1, 1)
+    top = ops.topk(
+        last_logits, ops.constant(np.int64(top_k)), -1, "max", "value", ov.Type.i64
+    )
+    values = ops.convert(top.output(0), ov.Type.f32)
+
+    # 기존 출력(logits 전체)은 모두 제거하고 헤드 출력만 남깁니다.
+    for result in list(model.get_results()):
+        model.remove_result(result)
+    model.add_parameters([positions])
+    model.add_results([ops.result(values), ops.result(top.output(1))])
+    model.validate_nodes_and_infer_types()
+    return model
@@ -1,20 +1,88 @@
+import argparse
 import os
 from pathlib import Path
 
 import torch
 import openvino as ov
 from transformers import BlipForConditionalGeneration, BlipProcessor
-from model_config import BLIP_MODEL_ID, BLIP_MODEL_DIR
+from model_config import BLIP_TIER_LARGE, BLIP_TIERS
+from preprocess_spec import save_preprocess_spec
+
+
+class VisionEncoderWrapper(torch.nn.Module):
+    """pixel_values → (image_embeds, pooled_embedding)"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.vision_model = model.vision_model
+
+    def forward(self, pixel_values):
+        last_hidden_state, pooled_output = self.vision_model(
+            pixel_values=pixel_values, return_dict=False
+        )[:2]
+        return last_hidden_state, pooled_output
+
+
+class TextDecoderWrapper(torch.nn.Module):
+    """(input_ids, image_embeds) → logits"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.text_decoder = model.text_decoder
+
+    def forward(self, input_ids, image_embeds):
+        image_attention_mask = torch.ones(image_embeds.shape[:-1], dtype=torch.long)
+        return self.text_decoder(
+            input_ids=input_ids,
+            encoder_hidden_states=image_embeds,
+            encoder_attention_mask=image_attention_mask,
+            return_dict=False,
+        )[0]
+
+
+def export_fused(model, dummy_pixel_values, dummy_input_ids, output_dir: Path) -> None:
+    """
+    (pixel_values, input_ids) → logits 단일 IR (기존 형식, 분리 IR이 없을 때의 대체 경로)
+    """
+    ov_model = ov.convert_model(
+        model,
+        example_input=(dummy_pixel_values, dummy_input_ids),
+    )
+    ov.save_model(ov_model, output_dir / "blip_caption.xml")
+
+
+def export_split(model, dummy_pixel_values, dummy_input_ids, output_dir: Path) -> None:
+    """
+    비전 인코더와 텍스트 디코더를 별도 IR로 저장합니다.
+    이미지당 비전 인코더를 한 번만 실행하고, 그 pooled 임베딩을 유사 이미지 검색에 사용합니다.
+    """
+    vision = VisionEncoderWrapper(model)
+    with torch.no_grad():
+        image_embeds, _ = vision(dummy_pixel_values)
+
+    ov_vision = ov.convert_model(vision, example_input=(dummy_pixel_values,))
+    ov.save_model(ov_vision, output_dir / "blip_vision.xml")
+
+    ov_decoder = ov.convert_model(
+        TextDecoderWrapper(model),
+        example_input=(dummy_input_ids, image_embeds),
+    )
+    ov.save_model(ov_decoder, output_dir / "blip_text_decoder.xml")
 
-OUTPUT_DIR = Path(BLIP_MODEL_DIR)
 
 def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    parser = argparse.ArgumentParser(description="BLIP → OpenVINO IR 변환")
+    # large(기본)와 base를 각각 export 하면 런타임이 두 등급을 함께 불러 부하에 따라 고릅니다.
+    parser.add_argument("--tier", choices=sorted(BLIP_TIERS), default=BLIP_TIER_LARGE)
+    args = parser.parse_args()
+    model_id, model_dir = BLIP_TIERS[args.tier]
+    output_dir = Path(model_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # 1. HuggingFace 모델/프로세서 로드
-    print("Loading BLIP model & processor from Hugging Face...")
-    model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_ID)
-    processor = BlipProcessor.from_pretrained(BLIP_MODEL_ID)
+    print(f"Loading BLIP model & processor from Hugging Face ({model_id})...")
+    model = BlipForConditionalGeneration.from_pretrained(model_id)
+    processor = BlipProcessor.from_pretrained(model_id)
     model.eval()
 
     # 2. 예제 입력(example_input) 준비
@@ -29,17 +97,15 @@ def main():
     dummy_input_ids = torch.tensor([[bos_token_id]], dtype=torch.long)
     print("Converting PyTorch BLIP model to OpenVINO IR...")
 
-    # 3. PyTorch -> OpenVINO Model 변환
-    ov_model = ov.convert_model(
-        model,
-        example_input=(dummy_pixel_values, dummy_input_ids),
-    )
-
-    # 4. IR 모델 저장 (기본적으로 FP16 압축)
-    xml_path = OUTPUT_DIR / "blip_caption.xml"
-    ov.save_model(ov_model, xml_path) 
+    # 3. PyTorch -> OpenVINO Model 변환 및 IR 저장 (기본적으로 FP16 압축)
+    # 3-1. 기존 단일(fused) IR
+    export_fused(model, dummy_pixel_values, dummy_input_ids, output_dir)
+    # 3-2. 비전 인코더 / 텍스트 디코더 분리 IR (임베딩 추출 + 디코딩 단계마다 비전 인코더 재실행 방지)
+    export_split(model, dummy_pixel_values, dummy_input_ids, output_dir)
+    # 3-3. 전처리 명세 + fast tokenizer (런타임은 transformers 없이 이 파일만 읽음)
+    save_preprocess_spec(processor, output_dir)
 
-    print(f"OpenVINO IR saved to: {xml_path.resolve()}")
+    print(f"OpenVINO IR saved to: {output_dir.resolve()}")
     print("변환 완료!")
 
 if __name__ == "__main__":
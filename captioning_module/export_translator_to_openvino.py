@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import torch
+import openvino as ov
+from transformers import AutoTokenizer, MarianMTModel
+
+try:
+    from .model_config import TRANSLATION_MODEL_ID, TRANSLATION_MODEL_DIR
+except ImportError:
+    from model_config import TRANSLATION_MODEL_ID, TRANSLATION_MODEL_DIR
+
+OUTPUT_DIR = Path(TRANSLATION_MODEL_DIR)
+
+# translator.py가 읽는 파일 이름
+ENCODER_XML = "translator_encoder.xml"
+DECODER_XML = "translator_decoder.xml"
+CONFIG_JSON = "translator_config.json"
+
+
+class EncoderWrapper(torch.nn.Module):
+    """(input_ids, attention_mask) → encoder_hidden_states"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.encoder = model.get_encoder()
+
+    def forward(self, input_ids, attention_mask):
+        return self.encoder(
+            input_ids=input_ids, attention_mask=attention_mask, return_dict=False
+        )[0]
+
+
+class DecoderWrapper(torch.nn.Module):
+    """(decoder_input_ids, encoder_hidden_states, encoder_attention_mask) → logits"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.decoder = model.get_decoder()
+        self.lm_head = model.lm_head
+        self.register_buffer("final_logits_bias", model.final_logits_bias.clone())
+
+    def forward(self, decoder_input_ids, encoder_hidden_states, encoder_attention_mask):
+        hidden = self.decoder(
+            input_ids=decoder_input_ids,
+            encoder_hidden_states=encoder_hidden_states,
+            encoder_attention_mask=encoder_attention_mask,
+            use_cache=False,
+            return_dict=False,
+        )[0]
+        return self.lm_head(hidden) + self.final_logits_bias
+
+
+def export_translator(model, tokenizer, output_dir: Path) -> None:
+    """
+    seq2seq 번역 모델을 인코더/디코더 OpenVINO IR 두 개와 토크나이저, 설정 파일로 저장합니다.
+    (테스트에서는 작은 랜덤 초기화 모델로 호출합니다.)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model.eval()
+
+    # 1. 예제 입력(example_input) 준비
+    sample = tokenizer(["a dog is running on the beach"], return_tensors="pt")
+    decoder_start_token_id = model.config.decoder_start_token_id
+    dummy_decoder_ids = torch.tensor([[decoder_start_token_id]], dtype=torch.long)
+
+    with torch.no_grad():
+        encoder = EncoderWrapper(model)
+        hidden = encoder(sample["input_ids"], sample["attention_mask"])
+
+        # 2. PyTorch -> OpenVINO Model 변환 (입력 shape는 동적으로 유지됩니다)
+        ov_encoder = ov.convert_model(
+            encoder, example_input=(sample["input_ids"], sample["attention_mask"])
+        )
+        ov_decoder = ov.convert_model(
+            DecoderWrapper(model),
+            example_input=(dummy_decoder_ids, hidden, sample["attention_mask"]),
+        )
+
+    # 3. IR, 토크나이저, 생성 설정 저장
+    ov.save_model(ov_encoder, output_dir / ENCODER_XML)
+    ov.save_model(ov_decoder, output_dir / DECODER_XML)
+    tokenizer.save_pretrained(output_dir)
+    with open(output_dir / CONFIG_JSON, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model_id": getattr(model.config, "_name_or_path", ""),
+                "decoder_start_token_id": decoder_start_token_id,
+                "eos_token_id": model.config.eos_token_id,
+                "pad_token_id": model.config.pad_token_id,
+            },
+            f,
+            indent=2,
+        )
+
+
+def main():
+    print("Loading translation model & tokenizer from Hugging Face...")
+    model = MarianMTModel.from_pretrained(TRANSLATION_MODEL_ID)
+    tokenizer = AutoTokenizer.from_pretrained(TRANSLATION_MODEL_ID)
+
+    print("Converting PyTorch translation model to OpenVINO IR...")
+    export_translator(model, tokenizer, OUTPUT_DIR)
+
+    print(f"OpenVINO IR saved to: {OUTPUT_DIR.resolve()}")
+    print("변환 완료!")
+
+
+if __name__ == "__main__":
+    main()
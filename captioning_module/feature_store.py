@@ -0,0 +1,199 @@
+# captioning_module/feature_store.py
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+KEY_BYTES = 16
+_META_FILE = "meta.json"
+_DATA_FILE = "features.f16"
+_KEYS_FILE = "keys.u8"
+_STAMPS_FILE = "stamps.i64"
+_LOCK_FILE = "lock"
+
+
+def feature_key(pixel_values: np.ndarray) -> bytes:
+    """
+    전처리된 입력(pixel_values)의 내용 해시. 같은 사진이면 bytes/PIL 어느 경로로 들어와도 같은 키입니다.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(pixel_values).tobytes(), digest_size=KEY_BYTES).digest()
+
+
+class VisionFeatureStore:
+    """
+    비전 인코더 출력(image_embeds + pooled 임베딩)을 디스크에 보관하는 메모리 매핑 저장소
+
+    고정 크기 슬롯 배열(float16) 하나를 np.memmap으로 열어 두고, 키 → 슬롯 위치만 메모리에 둡니다.
+    max_bytes를 넘지 않도록 슬롯 수를 정하고, 가득 차면 가장 오래 사용하지 않은 항목을 덮어씁니다. (LRU)
+    모델 버전이나 출력 형태가 바뀌면 기존 파일을 버리고 새로 만듭니다.
+
+    슬롯마다 키와 마지막 사용 순번을 따로 기록하므로 프로세스를 다시 시작해도 항목과 LRU 순서가 유지됩니다.
+    슬롯을 덮어쓸 때는 키를 지워 디스크에 기록(flush)한 뒤 데이터를 쓰고, 데이터를 flush 한 다음에 새 키를 씁니다.
+    따라서 프로세스 종료나 전원 차단으로 쓰기가 중단되어도 키가 남은 슬롯에는 온전한 데이터가 들어 있습니다.
+    한 디렉터리는 한 프로세스만 사용합니다. 다른 프로세스가 이미 사용 중이면 OSError가 발생합니다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, model_version: str):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.model_version = model_version
+        self._lock = threading.Lock()
+        self._slots: "OrderedDict[bytes, int]" = OrderedDict()  # 키 → 슬롯 (앞쪽이 오래된 항목)
+        self._free = []
+        self._clock = 0
+        self._data = self._keys = self._stamps = None
+        self._embeds_shape: Optional[Tuple[int, int]] = None
+        self._pooled_size = 0
+        self.hits = self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(self._path(_LOCK_FILE), "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            raise
+        self._open_existing()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._data is None else self._data.shape[0]
+
+    # ----------------------------------------------------
+    # 파일 배치
+    # ----------------------------------------------------
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _open_existing(self) -> None:
+        try:
+            with open(self._path(_META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("model_version") != self.model_version:
+            print("[INFO] Vision feature store: model version changed, discarding cached features.")
+            return
+        embeds_shape = tuple(meta["embeds_shape"])
+        capacity = self._capacity_for(embeds_shape, meta["pooled_size"])
+        if capacity != meta["capacity"]:
+            print("[INFO] Vision feature store: size limit changed, discarding cached features.")
+            return
+        try:
+            self._map(embeds_shape, meta["pooled_size"], capacity, "r+")
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not open vision feature store: {e}")
+            self._data = self._keys = self._stamps = None
+            return
+
+        empty = bytes(KEY_BYTES)
+        used = [
+            (int(self._stamps[slot]), bytes(self._keys[slot]), slot)
+            for slot in range(capacity)
+            if bytes(self._keys[slot]) != empty
+        ]
+        for stamp, key, slot in sorted(used):
+            self._slots[key] = slot
+        occupied = set(self._slots.values())
+        self._free = [slot for slot in range(capacity - 1, -1, -1) if slot not in occupied]
+        self._clock = max((stamp for stamp, _, _ in used), default=0)
+        print(f"[INFO] Vision feature store loaded: {len(self._slots)}/{capacity} images")
+
+    def _capacity_for(self, embeds_shape, pooled_size: int) -> int:
+        slot_bytes = 2 * (embeds_shape[0] * embeds_shape[1] + pooled_size)
+        return max(self.max_bytes // slot_bytes, 0)
+
+    def _map(self, embeds_shape, pooled_size: int, capacity: int, mode: str) -> None:
+        slot_len = embeds_shape[0] * embeds_shape[1] + pooled_size
+        self._data = np.memmap(self._path(_DATA_FILE), np.float16, mode, shape=(capacity, slot_len))
+        self._keys = np.memmap(self._path(_KEYS_FILE), np.uint8, mode, shape=(capacity, KEY_BYTES))
+        self._stamps = np.memmap(self._path(_STAMPS_FILE), np.int64, mode, shape=(capacity,))
+        self._embeds_shape = tuple(embeds_shape)
+        self._pooled_size = pooled_size
+
+    def _create(self, embeds_shape, pooled_size: int) -> bool:
+        """첫 저장 시(또는 형태가 바뀌면) 출력 형태에 맞춰 파일을 새로 만듭니다."""
+        capacity = self._capacity_for(embeds_shape, pooled_size)
+        if capacity == 0:
+            return False
+        self._data = self._keys = self._stamps = None
+        self._map(embeds_shape, pooled_size, capacity, "w+")
+        self._slots.clear()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._clock = 0
+        meta = {
+            "model_version": self.model_version,
+            "embeds_shape": list(embeds_shape),
+            "pooled_size": pooled_size,
+            "capacity": capacity,
+        }
+        tmp_path = self._path(_META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(_META_FILE))
+        return True
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1
+        self._stamps[slot] = self._clock
+
+    # ----------------------------------------------------
+    # 조회 / 저장
+    # ----------------------------------------------------
+    def get(self, key: bytes) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(image_embeds (1, N, D) float32, pooled (D,) float32) 또는 None"""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                self.misses += 1
+                return None
+            self._slots.move_to_end(key)
+            self._touch(slot)
+            row = np.asarray(self._data[slot], dtype=np.float32)
+            self.hits += 1
+
+        split = self._embeds_shape[0] * self._embeds_shape[1]
+        return row[:split].reshape((1,) + self._embeds_shape), row[split:]
+
+    def put(self, key: bytes, image_embeds: np.ndarray, pooled: np.ndarray) -> None:
+        embeds_shape = tuple(image_embeds.shape[-2:])
+        with self._lock:
+            if key in self._slots:
+                return
+            if self._data is None or embeds_shape != self._embeds_shape or pooled.size != self._pooled_size:
+                if not self._create(embeds_shape, int(pooled.size)):
+                    return
+            if self._free:
+                slot = self._free.pop()
+            else:
+                _, slot = self._slots.popitem(last=False)  # LRU 항목 제거
+
+            # 메모리 매핑 페이지는 기록 순서대로 디스크에 쓰인다는 보장이 없으므로, 단계마다 flush로 순서를 고정합니다.
+            self._keys[slot] = 0
+            self._keys.flush()
+            self._data[slot] = np.concatenate([image_embeds.reshape(-1), pooled.reshape(-1)])
+            self._data.flush()
+            self._keys[slot] = np.frombuffer(key, dtype=np.uint8)
+            self._touch(slot)
+            self._slots[key] = slot
+
+    def flush(self) -> None:
+        with self._lock:
+            for array in (self._data, self._keys, self._stamps):
+                if array is not None:
+                    array.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._data = self._keys = self._stamps = None
+            self._slots.clear()
+            self._lock_file.close()  # 잠금 해제
@@ -1,16 +1,34 @@
-from io import BytesIO
 import numpy as np
 from PIL import Image
 import openvino as ov
-from transformers import BlipProcessor
-from typing import Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
+import hashlib
+import os
 import time
-from .model_config import BLIP_MODEL_ID, BLIP_MODEL_PATH
+from .model_config import (
+    BLIP_DECODER_IR,
+    BLIP_DECODER_TOP_K,
+    BLIP_FUSED_IR,
+    BLIP_MODEL_DIR,
+    BLIP_MODEL_ID,
+    BLIP_VISION_IR,
+    VISION_FEATURE_STORE_DIR,
+    VISION_FEATURE_STORE_MAX_MB,
+    embedding_model_name,
+)
+from .decoder_head import add_token_head
+from .feature_store import VisionFeatureStore, feature_key
+from .phash import load_image
+from .preprocess_spec import build_preprocess_spec, clean_up_tokenization, load_preprocess_spec
 
 class ImageCaptioner:
 
     MIN_TOKEN = 10
     MAX_TOKEN = 20
+    # 조건부 캡션(텍스트 접두어)은 접두어가 이미 문장을 시작하므로 짧게 끝나도 됩니다.
+    CONDITIONAL_MIN_TOKEN = 2
+    # BLIP 조건부 캡션 접두어 예시 ("a photography of ..."처럼 접두어 뒤를 이어서 생성)
+    DEFAULT_PROMPTS = ("the mood is", "people in the photo are")
 
     _this = None
 
@@ -25,70 +43,192 @@ class ImageCaptioner:
 
     def __init__(
         self,
-        ov_model_path: str = BLIP_MODEL_PATH,
+        model_dir: str = BLIP_MODEL_DIR,
+        model_id: str = BLIP_MODEL_ID,
         device: str = "AUTO",
+        feature_store_dir: Optional[str] = VISION_FEATURE_STORE_DIR,
+        feature_store_max_mb: int = VISION_FEATURE_STORE_MAX_MB,
+        decoder_top_k: int = BLIP_DECODER_TOP_K,
     ):
         """
         OpenVINO 기반 BLIP 이미지 캡셔너 초기화
+        기본 모델(large)은 get_image_captioner()로 공유하고, 다른 등급(base)은 model_dir/model_id로 따로 만듭니다.
         """
-        if ImageCaptioner._this is not None:
-            return  
+        self.model_id = model_id
+        spec, self.tokenizer = self._load_preprocess_spec(model_dir, model_id)
+        self.image_height = int(spec["image_height"])
+        self.image_width = int(spec["image_width"])
+        self.resample = int(spec.get("resample", Image.BICUBIC))
+        self.rescale_factor = float(spec.get("rescale_factor", 1 / 255))
+        self.image_mean = np.array(spec["image_mean"], dtype=np.float32)
+        self.image_std = np.array(spec["image_std"], dtype=np.float32)
+        self.bos_token_id = spec["bos_token_id"]
+        self.eos_token_id = spec["eos_token_id"]
+        self.pad_token_id = spec.get("pad_token_id")
 
-        self.processor = BlipProcessor.from_pretrained(
-            BLIP_MODEL_ID
+        core = ov.Core()
+        # 디코더 logits 뒤에 토큰 선택 헤드(마지막 위치 + TopK)를 붙이면 단계마다 (B, k)개만 받아옵니다.
+        # 0이면 기존처럼 전체 logits를 받아 호스트에서 argmax 합니다.
+        self.decoder_top_k = max(decoder_top_k, 0)
+        # 분리 IR(비전 인코더 + 텍스트 디코더)이 있으면 우선 사용합니다.
+        # 비전 인코더를 이미지당 한 번만 실행하고, pooled 임베딩을 유사 이미지 검색용으로 돌려줄 수 있습니다.
+        vision_path = os.path.join(model_dir, BLIP_VISION_IR)
+        decoder_path = os.path.join(model_dir, BLIP_DECODER_IR)
+        self.split_model = os.path.exists(vision_path) and os.path.exists(decoder_path)
+        self.embedding_model = embedding_model_name(model_id) if self.split_model else None
+        if self.split_model:
+            self.vision_model = core.compile_model(core.read_model(vision_path), device)
+            self.decoder_model = core.compile_model(
+                self._with_token_head(core.read_model(decoder_path)), device
+            )
+            self.image_embeds_output = self.vision_model.output(0)
+            self.pooled_output = self.vision_model.output(1)
+            self.output = self.decoder_model.output(0)
+            ov_model_path = vision_path
+        else:
+            ov_model_path = os.path.join(model_dir, BLIP_FUSED_IR)
+            ov_model = core.read_model(ov_model_path)
+            self.compiled_model = core.compile_model(self._with_token_head(ov_model), device)
+            self.output = self.compiled_model.output(0)
+        # 헤드가 있으면 output(0) = top-k logits (B, k), output(1) = top-k 토큰 id (B, k)
+        self.token_ids_output = (
+            (self.decoder_model if self.split_model else self.compiled_model).output(1)
+            if self.decoder_top_k
+            else None
         )
+        self._rng = np.random.default_rng()
 
-        image_processor = self.processor.image_processor
-        size = image_processor.size
-        # size가 dict인 경우
-        if isinstance(size, dict):
-            self.image_height = int(size.get("height"))
-            self.image_width = int(size.get("width"))
-        else:
-            # 그냥 정수 하나로 오는 경우
-            self.image_height = int(size)
-            self.image_width = int(size)
-        self.image_mean = np.array(image_processor.image_mean, dtype=np.float32)
-        self.image_std = np.array(image_processor.image_std, dtype=np.float32)
+        # 비전 인코더 출력 저장소 (분리 IR에서만 인코더를 따로 건너뛸 수 있음)
+        self.feature_store = None
+        if self.split_model and feature_store_dir and feature_store_max_mb > 0:
+            self.feature_store = self._open_feature_store(
+                model_dir, model_id, vision_path, feature_store_dir, feature_store_max_mb
+            )
 
-        core = ov.Core()
-        ov_model = core.read_model(ov_model_path)
-        self.compiled_model = core.compile_model(ov_model, device)
-        self.output = self.compiled_model.output(0)
-
-        self.tokenizer = self.processor.tokenizer
-        self.bos_token_id = (
-            self.tokenizer.bos_token_id
-            or self.tokenizer.cls_token_id
-            or self.tokenizer.pad_token_id
-        )
-        self.eos_token_id = self.tokenizer.eos_token_id
         print(f"BLIP_MODEL_PATH: {ov_model_path}")
 
-        print("[Singleton] OpenVINO BLIP Captioner Loaded")
+        print(f"OpenVINO BLIP Captioner Loaded ({model_id})")
+
+    @staticmethod
+    def _load_preprocess_spec(model_dir: str, model_id: str):
+        """
+        export 때 저장한 전처리 명세 + fast tokenizer를 불러옵니다.
+        명세가 없는 이전 export 결과라면 BlipProcessor(transformers)에서 같은 값을 만듭니다.
+        """
+        loaded = load_preprocess_spec(model_dir)
+        if loaded is not None:
+            return loaded
+
+        print(
+            "Warning: blip_preprocess.json not found. Loading BlipProcessor from transformers "
+            "(slow startup). Re-run export_blip_to_openvino.py to create it."
+        )
+        from transformers import BlipProcessor
+
+        processor = BlipProcessor.from_pretrained(model_id)
+        return build_preprocess_spec(processor), processor.tokenizer.backend_tokenizer
+
+    def _with_token_head(self, model: ov.Model) -> ov.Model:
+        if not self.decoder_top_k:
+            return model
+        return add_token_head(model, self.decoder_top_k)
+
+    @staticmethod
+    def _open_feature_store(
+        model_dir: str, model_id: str, vision_path: str, store_dir: str, max_mb: int
+    ) -> Optional[VisionFeatureStore]:
+        """
+        모델 디렉터리별 저장소를 엽니다. 모델 버전은 모델 id와 비전 IR 파일(크기, 수정 시각)로 정하므로
+        다시 export 하면 이전 특징은 자동으로 버려집니다.
+        """
+        version_source = [model_id]
+        for path in (vision_path, os.path.splitext(vision_path)[0] + ".bin"):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                version_source.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        model_version = hashlib.sha1("|".join(version_source).encode()).hexdigest()
+        directory = os.path.join(store_dir, os.path.basename(os.path.normpath(model_dir)))
+        try:
+            return VisionFeatureStore(directory, max_mb * 1024 * 1024, model_version)
+        except OSError as e:
+            print(f"Warning: vision feature store disabled ({directory}): {e}")
+            return None
 
     # ----------------------------------------------------
     # 이미지 분석
     # ----------------------------------------------------
-    def get_blip_analyze(self, image_bytes: bytes) -> str:
+    def get_blip_analyze(
+        self,
+        image_bytes: Union[bytes, Image.Image],
+        return_embedding: bool = False,
+        temperature: float = 0.0,
+    ) -> Union[str, Tuple[str, Optional[np.ndarray]]]:
+        """
+        이미지 캡션을 생성합니다. 이미 디코딩한 PIL 이미지를 넘기면 다시 디코딩하지 않습니다.
+        return_embedding=True이면 (캡션, L2 정규화된 pooled 이미지 임베딩)을 반환합니다.
+        단일(fused) IR만 있는 경우 임베딩은 None입니다.
+        temperature > 0이면 top-k 헤드(decoder_top_k > 1)의 후보 중에서 샘플링합니다. (다시 생성용)
+        """
         t0 = time.perf_counter()
-        image = Image.open(BytesIO(image_bytes)).convert("RGB")
+        if isinstance(image_bytes, Image.Image):
+            image = image_bytes.convert("RGB")
+        else:
+            image = load_image(image_bytes)
         print("[INFO] Generating BLIP caption...")
-        caption = self._generate_caption(image)
+        caption, embedding = self._generate_caption(image, temperature=temperature)
         t1 = time.perf_counter()
         print(f"[PROFILE] Total caption time: {(t1 - t0):.3f} sec")
         print(f"[INFO] Generated Caption: success")
+        if return_embedding:
+            return caption, embedding
         return caption
 
+    def get_blip_analyze_with_prompts(
+        self,
+        image_bytes: Union[bytes, Image.Image],
+        prompts: Sequence[str] = DEFAULT_PROMPTS,
+        temperature: float = 0.0,
+    ) -> Tuple[str, Dict[str, str], Optional[np.ndarray]]:
+        """
+        기본(무조건) 캡션과 접두어별 조건부 캡션을 한 번에 생성합니다.
+        비전 인코더는 한 번만 실행하고, 모든 캡션을 한 배치로 디코딩하므로
+        접두어를 늘려도 전체 추론이 아니라 디코더 배치 행만 늘어납니다.
+        분리 IR(blip_vision.xml + blip_text_decoder.xml) 없이 단일 IR(blip_caption.xml)만 있으면
+        디코딩 단계마다 행별로 비전 인코더가 다시 실행되므로 조건부 캡션을 만들지 않습니다. (빈 dict 반환)
+
+        Returns:
+            (기본 캡션, {접두어: 접두어로 시작하는 캡션}, L2 정규화된 pooled 임베딩 또는 None)
+        """
+        t0 = time.perf_counter()
+        if isinstance(image_bytes, Image.Image):
+            image = image_bytes.convert("RGB")
+        else:
+            image = load_image(image_bytes)
+
+        prompts = [prompt.strip() for prompt in prompts if prompt and prompt.strip()]
+        if prompts and not self.split_model:
+            print("Warning: conditional captions need the split BLIP IR. Skipping prompts.")
+            prompts = []
+        prefixes = [[self.bos_token_id]] + [
+            [self.bos_token_id] + self.tokenizer.encode(prompt, add_special_tokens=False).ids
+            for prompt in prompts
+        ]
+        min_new_tokens = [self.MIN_TOKEN] + [self.CONDITIONAL_MIN_TOKEN] * len(prompts)
+        captions, embedding = self._generate_captions(
+            image, prefixes, self.MAX_TOKEN, min_new_tokens, temperature
+        )
+        print(f"[PROFILE] Total caption time ({len(prefixes)} prompts): {(time.perf_counter() - t0):.3f} sec")
+        return captions[0], dict(zip(prompts, captions[1:])), embedding
+
     # ----------------------------------------------------
     # 내부 기능
     # ----------------------------------------------------
     def _preprocess(self, image: Image.Image) -> np.ndarray:
         # 1) 리사이즈 (BLIP는 보통 384 기준)
-        image = image.resize((self.image_width, self.image_height))
+        image = image.resize((self.image_width, self.image_height), resample=self.resample)
 
         # 2) numpy 배열로 변환 (H, W, C)
-        arr = np.array(image).astype(np.float32) / 255.0
+        arr = np.array(image).astype(np.float32) * self.rescale_factor
 
         # 3) 정규화 (mean/std는 (3,)이라 브로드캐스트 됨)
         arr = (arr - self.image_mean) / self.image_std
@@ -100,42 +240,145 @@ class ImageCaptioner:
         return np.expand_dims(arr, axis=0)
 
 
+    def _encode_image(self, pixel_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        분리 IR의 비전 인코더를 실행합니다. (image_embeds, L2 정규화된 pooled 임베딩)
+        """
+        outputs = self.vision_model({0: pixel_values})
+        pooled = outputs[self.pooled_output][0].astype(np.float32)
+        pooled /= max(float(np.linalg.norm(pooled)), 1e-12)
+        return outputs[self.image_embeds_output], pooled
+
+    def _vision_features(self, pixel_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        저장소에 같은 입력의 특징이 있으면 비전 인코더를 건너뜁니다.
+        저장소는 float16으로 보관하므로, 처음 계산할 때도 같은 정밀도로 맞춰
+        재생성 결과가 처음 결과와 달라지지 않게 합니다.
+        """
+        if self.feature_store is None:
+            return self._encode_image(pixel_values)
+
+        key = feature_key(pixel_values)
+        cached = self.feature_store.get(key)
+        if cached is not None:
+            print("[INFO] Vision features loaded from store (encoder skipped)")
+            image_embeds, pooled = cached
+        else:
+            image_embeds, pooled = self._encode_image(pixel_values)
+            image_embeds = image_embeds.astype(np.float16).astype(np.float32)
+            pooled = pooled.astype(np.float16).astype(np.float32)
+            self.feature_store.put(key, image_embeds, pooled)
+        pooled /= max(float(np.linalg.norm(pooled)), 1e-12)
+        return image_embeds, pooled
+
     def _generate_caption(
-        self, image: Image.Image, max_new_tokens: int = MAX_TOKEN, min_new_tokens: int = MIN_TOKEN
-    ) -> str:
+        self,
+        image: Image.Image,
+        max_new_tokens: int = MAX_TOKEN,
+        min_new_tokens: int = MIN_TOKEN,
+        temperature: float = 0.0,
+    ) -> Tuple[str, Optional[np.ndarray]]:
+        captions, embedding = self._generate_captions(
+            image, [[self.bos_token_id]], max_new_tokens, [min_new_tokens], temperature
+        )
+        return captions[0], embedding
+
+    def _generate_captions(
+        self,
+        image: Image.Image,
+        prefixes: List[List[int]],
+        max_new_tokens: int,
+        min_new_tokens: List[int],
+        temperature: float = 0.0,
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        한 이미지에 대해 여러 접두 토큰열(prefix)을 한 배치로 greedy 디코딩합니다.
+        비전 인코더는 한 번만 실행하고, 디코더 입력만 배치로 늘립니다.
+
+        접두 길이가 다르면 오른쪽을 pad로 채웁니다. 디코더는 causal이라 각 행의 마지막 실제 토큰
+        위치의 logits는 뒤쪽 pad의 영향을 받지 않으므로, 행마다 자기 위치의 logits만 읽으면
+        attention mask 없이도 한 장씩 디코딩한 결과와 같습니다.
+        """
         t0 = time.perf_counter()
         pixel_values = self._preprocess(image)
         t1 = time.perf_counter()
         print(f"[PROFILE] Preprocess time: {(t1 - t0):.3f} sec")
 
-        input_ids = np.array([[self.bos_token_id]], dtype=np.int64)
+        embedding = None
+        batch_size = len(prefixes)
+        if self.split_model:
+            image_embeds, embedding = self._vision_features(pixel_values)
+            print(f"[PROFILE] Vision encoder time: {(time.perf_counter() - t1):.3f} sec")
+            image_embeds = np.repeat(image_embeds, batch_size, axis=0)
+        else:
+            pixel_values = np.repeat(pixel_values, batch_size, axis=0)
+
+        lengths = np.array([len(prefix) for prefix in prefixes], dtype=np.int64)
+        start_lengths = lengths.copy()
+        pad_token_id = self.pad_token_id if self.pad_token_id is not None else 0
+        input_ids = np.full(
+            (batch_size, int(lengths.max()) + max_new_tokens), pad_token_id, dtype=np.int64
+        )
+        for row, prefix in enumerate(prefixes):
+            input_ids[row, : len(prefix)] = prefix
+        finished = np.zeros(batch_size, dtype=bool)
+        rows = np.arange(batch_size)
 
         for step in range(max_new_tokens):
             t_loop0 = time.perf_counter()
-            outputs = self.compiled_model({0: pixel_values, 1: input_ids})
-            logits = outputs[self.output]
+            # 아직 디코딩 중인 행들 중 가장 긴 길이까지만 잘라 넣습니다.
+            current = input_ids[:, : int(lengths[~finished].max())]
+            positions = np.minimum(lengths, current.shape[1]) - 1
+            if self.split_model:
+                inputs = {0: current, 1: image_embeds}
+                model = self.decoder_model
+            else:
+                inputs = {0: pixel_values, 1: current}
+                model = self.compiled_model
+            if self.token_ids_output is not None:
+                inputs[2] = positions
+            outputs = model(inputs)
             t_loop1 = time.perf_counter()
             print(f"[PROFILE] Step {step+1} infer: {(t_loop1 - t_loop0):.3f} sec")
 
-            next_token_logits = logits[:, -1, :]
-            next_token_id = int(next_token_logits.argmax(axis=-1)[0])
+            next_token_ids = self._select_tokens(outputs, rows, positions, temperature)
+            for row in np.flatnonzero(~finished):
+                next_token_id = int(next_token_ids[row])
+                input_ids[row, lengths[row]] = next_token_id
+                lengths[row] += 1
+                if (
+                    self.eos_token_id is not None
+                    and lengths[row] - start_lengths[row] > min_new_tokens[row]
+                    and next_token_id == self.eos_token_id
+                ):
+                    finished[row] = True
+            if finished.all():
+                break
 
-            input_ids = np.concatenate(
-                [input_ids, np.array([[next_token_id]], dtype=np.int64)],
-                axis=1,
+        captions = []
+        for row in range(batch_size):
+            caption = clean_up_tokenization(
+                self.tokenizer.decode(input_ids[row, : lengths[row]].tolist(), skip_special_tokens=True)
             )
+            print(f"[DEBUG] Raw generated caption: {caption}")
+            captions.append(caption.strip())
+        return captions, embedding
 
-            if (
-                self.eos_token_id is not None
-                and step >= min_new_tokens
-                and next_token_id == self.eos_token_id
-            ):
-                break
+    def _select_tokens(self, outputs, rows: np.ndarray, positions: np.ndarray, temperature: float) -> np.ndarray:
+        """
+        행마다 다음 토큰 id를 고릅니다.
+        토큰 헤드가 있으면 그래프가 이미 골라 둔 top-k (값 내림차순)를 사용하고,
+        없으면 전체 logits에서 행마다 자기 위치만 잘라 argmax 합니다.
+        """
+        if self.token_ids_output is None:
+            return outputs[self.output][rows, positions].argmax(axis=-1)
 
-        caption = self.tokenizer.decode(
-            input_ids[0],
-            skip_special_tokens=True,
-            clean_up_tokenization_spaces=True,
-        )
-        print(f"[DEBUG] Raw generated caption: {caption}")
-        return caption.strip()
\ No newline at end of file
+        token_ids = outputs[self.token_ids_output]
+        if temperature <= 0 or token_ids.shape[1] == 1:
+            return token_ids[:, 0]
+        # top-k 후보 중에서 softmax(값 / temperature) 확률로 샘플링
+        scores = outputs[self.output] / temperature
+        probs = np.exp(scores - scores.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        choices = [self._rng.choice(probs.shape[1], p=row_probs) for row_probs in probs]
+        return token_ids[rows, choices]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('captioning_module', '0004_rename_image_path_image_file_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='image',
+            name='clip_text',
+        ),
+    ]
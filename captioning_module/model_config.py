@@ -1,14 +1,56 @@
 import os
 
+from decouple import config
+
 BLIP_MODEL_ID = "Salesforce/blip-image-captioning-large"
-# BLIP_MODEL_ID = "Salesforce/blip-image-captioning-base"
+# 가벼운 BLIP-base (선택). export 해 두면 large와 함께 불러와, 부하가 높을 때 base로 응답합니다.
+BLIP_BASE_MODEL_ID = "Salesforce/blip-image-captioning-base"
 
 FILE_DIR = os.path.dirname(os.path.abspath(__file__))
-BLIP_MODEL_DIR = os.path.join(
-    FILE_DIR, 
-    # "blip_openvino_base",
-    "blip_openvino",
-)
-BLIP_MODEL_PATH = os.path.join(
-    BLIP_MODEL_DIR, "blip_caption.xml"
+BLIP_MODEL_DIR = os.path.join(FILE_DIR, "blip_openvino")
+BLIP_BASE_MODEL_DIR = os.path.join(FILE_DIR, "blip_openvino_base")
+
+# 모델 등급(tier) → (HF 모델 id, IR 디렉터리). 기본 등급은 large입니다.
+BLIP_TIER_LARGE = "large"
+BLIP_TIER_BASE = "base"
+BLIP_TIERS = {
+    BLIP_TIER_LARGE: (BLIP_MODEL_ID, BLIP_MODEL_DIR),
+    BLIP_TIER_BASE: (BLIP_BASE_MODEL_ID, BLIP_BASE_MODEL_DIR),
+}
+# IR 파일 이름 (BLIP_MODEL_DIR 기준)
+BLIP_FUSED_IR = "blip_caption.xml"
+# 비전 인코더 / 텍스트 디코더 분리 IR (있으면 우선 사용, 이미지 임베딩 추출 가능)
+BLIP_VISION_IR = "blip_vision.xml"
+BLIP_DECODER_IR = "blip_text_decoder.xml"
+BLIP_MODEL_PATH = os.path.join(BLIP_MODEL_DIR, BLIP_FUSED_IR)
+BLIP_VISION_MODEL_PATH = os.path.join(BLIP_MODEL_DIR, BLIP_VISION_IR)
+BLIP_DECODER_MODEL_PATH = os.path.join(BLIP_MODEL_DIR, BLIP_DECODER_IR)
+# 저장된 임베딩이 어떤 모델/출력에서 나왔는지 구분하는 이름 (모델이 바뀌면 기존 임베딩과 섞지 않음)
+def embedding_model_name(model_id: str) -> str:
+    return f"{model_id}:vision-pooled"
+
+
+BLIP_EMBEDDING_MODEL = embedding_model_name(BLIP_MODEL_ID)
+
+# 디코더 토큰 헤드: 그래프 안에서 마지막 위치 logits의 top-k만 계산해 받음 (1 = greedy, 0 = 전체 logits 사용)
+# 1보다 크면 다시 생성(temperature > 0) 시 top-k 후보에서 샘플링할 수 있습니다.
+BLIP_DECODER_TOP_K = config("BLIP_DECODER_TOP_K", default=1, cast=int)
+
+# 등급 자동 선택 (요청에 quality/fast를 지정하지 않은 경우)
+# 처리 중인 요청 수가 DEGRADE 이상이거나 large의 최근 지연(EWMA)이 SLO를 넘으면 base로 낮추고,
+# 처리 중인 요청 수가 RECOVER 이하로 줄어들면 다시 large로 돌아갑니다. (최소 HOLD초 동안은 유지)
+BLIP_TIER_LATENCY_SLO_MS = config("BLIP_TIER_LATENCY_SLO_MS", default=3000, cast=int)
+BLIP_TIER_DEGRADE_QUEUE_DEPTH = config("BLIP_TIER_DEGRADE_QUEUE_DEPTH", default=4, cast=int)
+BLIP_TIER_RECOVER_QUEUE_DEPTH = config("BLIP_TIER_RECOVER_QUEUE_DEPTH", default=0, cast=int)
+BLIP_TIER_MIN_HOLD_SECONDS = config("BLIP_TIER_MIN_HOLD_SECONDS", default=10.0, cast=float)
+
+# 비전 인코더 출력 저장소 (같은 사진의 재생성/재시도 시 인코더를 건너뜀). 최대 크기(MB)가 0이면 사용 안 함
+# 한 디렉터리는 한 프로세스만 사용하므로, 워커가 여러 개면 첫 워커만 저장소를 사용합니다.
+VISION_FEATURE_STORE_DIR = config(
+    "VISION_FEATURE_STORE_DIR", default=os.path.join(FILE_DIR, "vision_features")
 )
+VISION_FEATURE_STORE_MAX_MB = config("VISION_FEATURE_STORE_MAX_MB", default=512, cast=int)
+
+# --- 로컬 번역 모델 (영어 → 한국어, OpenVINO) ---
+TRANSLATION_MODEL_ID = "Helsinki-NLP/opus-mt-tc-big-en-ko"
+TRANSLATION_MODEL_DIR = os.path.join(FILE_DIR, "translator_openvino")
@@ -0,0 +1,49 @@
+# captioning_module/phash.py
+
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+# dHash 크기: (HASH_SIZE + 1) × HASH_SIZE 흑백 썸네일 → HASH_SIZE² 비트 (기본 64비트)
+HASH_SIZE = 8
+HASH_HEX_LENGTH = HASH_SIZE * HASH_SIZE // 4
+# 해시 계산용 JPEG draft 디코딩 크기. 이 크기 이상을 유지하는 가장 작은 배율(1/2, 1/4, 1/8)로 디코딩합니다.
+HASH_DECODE_SIZE = 64
+
+
+def load_image(image_bytes: bytes) -> Image.Image:
+    """이미지 바이트열을 원본 해상도의 RGB 이미지로 디코딩합니다. (BLIP 입력용)"""
+    return Image.open(BytesIO(image_bytes)).convert("RGB")
+
+
+def dhash(image: Image.Image, hash_size: int = HASH_SIZE) -> str:
+    """
+    difference hash(dHash)를 16진수 문자열로 반환합니다.
+    흑백 (hash_size + 1) × hash_size 썸네일에서 가로로 이웃한 픽셀의 밝기 증감을 비트로 기록하므로,
+    크기 조정/재압축/약간의 밝기 변화에는 거의 바뀌지 않습니다.
+    """
+    thumbnail = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+
+def image_hash(image_bytes: bytes, hash_size: int = HASH_SIZE) -> str:
+    """
+    이미지 바이트열의 dHash를 계산합니다.
+    JPEG는 draft 모드로 축소 디코딩(흑백, 최대 1/8)하므로 원본 디코딩보다 훨씬 빠릅니다.
+    draft 디코딩은 해시에만 사용하므로 BLIP이 보는 픽셀은 바뀌지 않고, 근접 중복이면 원본 디코딩도 하지 않습니다.
+    """
+    image = Image.open(BytesIO(image_bytes))
+    if image.format == "JPEG":
+        image.draft("L", (HASH_DECODE_SIZE, HASH_DECODE_SIZE))
+    return dhash(image, hash_size)
+
+
+def hamming_distance(a: str, b: str) -> int:
+    """두 해시(16진수 문자열)의 서로 다른 비트 수"""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
@@ -0,0 +1,88 @@
+# captioning_module/preprocess_spec.py
+"""
+BLIP 전처리/토크나이저 명세 (blip_preprocess.json + tokenizer.json)
+
+export_blip_to_openvino.py가 IR 옆에 저장하고, 런타임(ImageCaptioner)은 이 파일만 읽습니다.
+따라서 서버 시작 시 transformers(및 torch)를 import 하거나 HF 캐시에 접근하지 않고,
+'tokenizers' 패키지의 fast tokenizer만 불러옵니다.
+
+이 모듈은 export 스크립트(captioning_module 디렉터리에서 실행)에서도 import 하므로
+패키지 상대 import를 사용하지 않습니다.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+PREPROCESS_SPEC_FILE = "blip_preprocess.json"
+TOKENIZER_FILE = "tokenizer.json"
+SPEC_VERSION = 1
+
+
+def build_preprocess_spec(processor) -> Dict[str, Any]:
+    """BlipProcessor에서 런타임에 필요한 값만 뽑아 명세(dict)를 만듭니다."""
+    image_processor = processor.image_processor
+    tokenizer = processor.tokenizer
+
+    size = image_processor.size
+    if isinstance(size, dict):
+        height, width = int(size["height"]), int(size["width"])
+    else:
+        height = width = int(size)
+
+    bos_token_id = tokenizer.bos_token_id
+    if bos_token_id is None:
+        # 혹시 bos_token이 없는 토크나이저면 cls/pad 중 하나 사용
+        bos_token_id = tokenizer.cls_token_id or tokenizer.pad_token_id
+
+    return {
+        "version": SPEC_VERSION,
+        "image_height": height,
+        "image_width": width,
+        "resample": int(getattr(image_processor, "resample", 3)),  # 3 = PIL BICUBIC
+        "rescale_factor": float(getattr(image_processor, "rescale_factor", 1 / 255)),
+        "image_mean": [float(v) for v in image_processor.image_mean],
+        "image_std": [float(v) for v in image_processor.image_std],
+        "bos_token_id": bos_token_id,
+        "eos_token_id": tokenizer.eos_token_id,
+        "pad_token_id": tokenizer.pad_token_id,
+        "sep_token_id": tokenizer.sep_token_id,
+        "tokenizer_file": TOKENIZER_FILE,
+    }
+
+
+def save_preprocess_spec(processor, output_dir) -> None:
+    """명세와 fast tokenizer(tokenizer.json)를 output_dir에 저장합니다."""
+    spec = build_preprocess_spec(processor)
+    with open(os.path.join(output_dir, PREPROCESS_SPEC_FILE), "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2)
+    processor.tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+
+
+def load_preprocess_spec(model_dir: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """
+    (명세, tokenizers.Tokenizer)를 반환합니다. 명세 파일이 없으면 None (이전 export 결과)
+    """
+    spec_path = os.path.join(model_dir, PREPROCESS_SPEC_FILE)
+    if not os.path.exists(spec_path):
+        return None
+
+    from tokenizers import Tokenizer
+
+    with open(spec_path, encoding="utf-8") as f:
+        spec = json.load(f)
+    tokenizer = Tokenizer.from_file(os.path.join(model_dir, spec.get("tokenizer_file", TOKENIZER_FILE)))
+    return spec, tokenizer
+
+
+# transformers의 clean_up_tokenization과 같은 규칙 (구두점 앞 공백, 축약형 정리)
+_CLEAN_UP_RULES = (
+    (" .", "."), (" ?", "?"), (" !", "!"), (" ,", ","), (" ' ", "'"),
+    (" n't", "n't"), (" 'm", "'m"), (" 's", "'s"), (" 've", "'ve"), (" 're", "'re"),
+)
+
+
+def clean_up_tokenization(text: str) -> str:
+    for old, new in _CLEAN_UP_RULES:
+        text = text.replace(old, new)
+    return text
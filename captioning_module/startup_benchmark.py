@@ -0,0 +1,107 @@
+# captioning_module/startup_benchmark.py
+"""
+워커 시작 비용(시간, 최대 RSS) 측정
+
+사용법:
+    python -m captioning_module.startup_benchmark
+    python -m captioning_module.startup_benchmark --model-dir captioning_module/blip_openvino --repeat 5
+
+항목마다 새 파이썬 프로세스를 띄워 import/초기화 시간과 최대 RSS, 그리고 무거운 패키지
+(transformers, torch, google.generativeai, openai)가 로드되었는지를 출력합니다.
+모델이 있으면 캡션 1장(caption)과 조건부 캡션 포함(caption+prompts) 시간도 측정합니다.
+변경 전/후 커밋에서 각각 실행해 비교합니다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from .model_config import BLIP_MODEL_DIR
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("transformers", "torch", "google.generativeai", "openai")
+
+# Django 뷰 모듈 (요청 처리 전까지 openai/google.generativeai를 불러오지 않아야 함)
+VIEWS_IMPORT = (
+    "import os, django\n"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')\n"
+    "django.setup()\n"
+    "import captioning_module.views"
+)
+
+_MEASURE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def _targets(model_dir: str) -> Dict[str, str]:
+    targets = {
+        "config": "import app.core.config",
+        "llm_service": "import app.services.llm_service",
+        "views": VIEWS_IMPORT,
+    }
+    if os.path.isdir(model_dir):
+        targets["captioner"] = (
+            "from captioning_module.image_captioner import ImageCaptioner\n"
+            f"ImageCaptioner({model_dir!r})"
+        )
+        # 조건부 캡션 비용: 두 항목의 차이가 접두어(BLIP_CONDITIONAL_PROMPTS)를 추가로 디코딩하는 시간/메모리입니다.
+        for name, prompts in (("caption", "()"), ("caption+prompts", "settings.BLIP_CONDITIONAL_PROMPTS")):
+            targets[name] = (
+                "from PIL import Image\n"
+                "from app.core.config import settings\n"
+                "from captioning_module.image_captioner import ImageCaptioner\n"
+                f"captioner = ImageCaptioner({model_dir!r})\n"
+                f"captioner.get_blip_analyze_with_prompts(Image.new('RGB', (384, 384), 'gray'), {prompts})"
+            )
+    return targets
+
+
+def measure(body: str) -> Dict:
+    code = _MEASURE.format(body=body, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(model_dir: str, repeat: int) -> None:
+    if not os.path.isdir(model_dir):
+        print(f"Warning: {model_dir} not found. Skipping captioner startup.")
+
+    for name, body in _targets(model_dir).items():
+        try:
+            samples: List[Dict] = [measure(body) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"{name:16s} failed: {e}")
+            continue
+        seconds = statistics.median(sample["seconds"] for sample in samples)
+        rss = statistics.median(sample["max_rss_mb"] for sample in samples)
+        loaded = ", ".join(samples[0]["loaded"]) or "-"
+        print(f"{name:16s} {seconds:6.2f} s  {rss:7.1f} MB  loaded: {loaded}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워커 시작 시간/메모리 측정")
+    parser.add_argument("--model-dir", default=BLIP_MODEL_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.model_dir, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
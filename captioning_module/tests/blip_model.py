@@ -0,0 +1,81 @@
+# captioning_module/tests/blip_model.py
+"""
+테스트용 작은 랜덤 BLIP 모델 (분리 IR + 전처리 명세 + tokenizer.json)
+
+torch/transformers 없이 OpenVINO opset으로 비전 인코더/텍스트 디코더와 입출력 형태만 같은 모델을 만듭니다.
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+
+from captioning_module.model_config import BLIP_DECODER_IR, BLIP_VISION_IR
+from captioning_module.preprocess_spec import save_preprocess_spec
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[DEC]"]
+WORDS = ["a", "dog", "on", "the", "beach", "photography", "of", "mood", "is", ",", "."]
+VOCAB = {token: i for i, token in enumerate(SPECIAL_TOKENS + WORDS)}
+IMAGE_SIZE = 8
+
+
+def build_tokenizer() -> Tokenizer:
+    tokenizer = Tokenizer(models.WordPiece(VOCAB, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.decoder = decoders.WordPiece()
+    tokenizer.add_special_tokens(SPECIAL_TOKENS)
+    return tokenizer
+
+
+def fake_processor(tokenizer: Tokenizer):
+    """build_preprocess_spec이 읽는 BlipProcessor 속성만 흉내 냅니다."""
+    return SimpleNamespace(
+        image_processor=SimpleNamespace(
+            size={"height": IMAGE_SIZE, "width": IMAGE_SIZE},
+            resample=3,
+            rescale_factor=1 / 255,
+            image_mean=[0.5, 0.5, 0.5],
+            image_std=[0.25, 0.25, 0.25],
+        ),
+        tokenizer=SimpleNamespace(
+            bos_token_id=VOCAB["[DEC]"],
+            eos_token_id=VOCAB["[SEP]"],
+            pad_token_id=VOCAB["[PAD]"],
+            cls_token_id=VOCAB["[CLS]"],
+            sep_token_id=VOCAB["[SEP]"],
+            backend_tokenizer=tokenizer,
+        ),
+    )
+
+
+def build_random_blip_model(model_dir, hidden=8, seed=0) -> None:
+    rng = np.random.default_rng(seed)
+    vocab_size = len(VOCAB)
+
+    # 비전 인코더: (1, 3, H, W) → image_embeds (1, H*W, hidden), pooled (1, hidden)
+    pixel_values = ops.parameter([-1, 3, IMAGE_SIZE, IMAGE_SIZE], ov.Type.f32, name="pixel_values")
+    patches = ops.transpose(
+        ops.reshape(pixel_values, ops.constant([0, 3, -1]), True), ops.constant([0, 2, 1])
+    )
+    projection = ops.constant(rng.standard_normal((3, hidden)).astype(np.float32))
+    image_embeds = ops.matmul(patches, projection, False, False)
+    pooled = ops.reduce_mean(image_embeds, ops.constant([1]), False)
+    vision = ov.Model([image_embeds, pooled], [pixel_values])
+
+    # 텍스트 디코더: (input_ids, image_embeds) → logits (1, seq, vocab)
+    input_ids = ops.parameter([-1, -1], ov.Type.i64, name="input_ids")
+    states = ops.parameter([-1, -1, hidden], ov.Type.f32, name="image_embeds")
+    embeddings = ops.constant(rng.standard_normal((vocab_size, hidden)).astype(np.float32))
+    context = ops.reduce_mean(states, ops.constant([1]), True)
+    # 앞쪽 토큰 누적합: 실제 디코더처럼 causal이고, 각 위치의 출력이 접두어 전체에 따라 달라집니다.
+    prefix_sum = ops.cumsum(ops.gather(embeddings, input_ids, 0), ops.constant(1, ov.Type.i64))
+    hidden_states = ops.add(prefix_sum, context)
+    lm_head = ops.constant(rng.standard_normal((hidden, vocab_size)).astype(np.float32))
+    decoder = ov.Model([ops.matmul(hidden_states, lm_head, False, False)], [input_ids, states])
+
+    ov.save_model(vision, os.path.join(model_dir, BLIP_VISION_IR))
+    ov.save_model(decoder, os.path.join(model_dir, BLIP_DECODER_IR))
+    save_preprocess_spec(fake_processor(build_tokenizer()), model_dir)
@@ -0,0 +1,168 @@
+# captioning_module/tests/test_async_view.py
+
+import asyncio
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from PIL import Image as PILImage
+
+from captioning_module import startup_benchmark, views
+from captioning_module.models import DailyTokenUsage, Image
+from captioning_module.tier_router import CaptionTierRouter
+
+
+def make_jpeg():
+    buffer = BytesIO()
+    PILImage.new("RGB", (32, 32), "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class FakeCompletions:
+    """LLM 응답을 기다리는 동안 동시에 처리 중인 요청 수를 기록하는 가짜 AsyncOpenAI"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="바닷가의 하루"))],
+            usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3),
+        )
+
+
+class AsyncImageCaptioningViewTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("captioning_module:image-captioning-async")
+        self.completions = FakeCompletions()
+        client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        captioner = SimpleNamespace(get_blip_analyze=lambda image_data: "a beach")
+        router = CaptionTierRouter({"large": captioner})
+        for patcher in (
+            mock.patch.object(CaptionTierRouter, "get_tier_router", return_value=router),
+            mock.patch.object(views, "get_async_chatgpt_client", return_value=client),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _post(self, name, **data):
+        upload = BytesIO(make_jpeg())
+        upload.name = name
+        return await self.async_client.post(
+            self.url, {"file": upload, "file_info": "여름 휴가", **data}
+        )
+
+    async def test_concurrent_requests_share_the_worker(self):
+        """
+        동시에 들어온 요청들이 LLM 응답을 함께 기다리고(겹쳐 실행), 모두 저장되는지 테스트합니다.
+        """
+        responses = await asyncio.gather(*(self._post(f"{i}.jpg") for i in range(4)))
+
+        self.assertEqual([response.status_code for response in responses], [201] * 4)
+        self.assertEqual(responses[0].json()["data"]["blip_text"], "a beach")
+        self.assertEqual(responses[0].json()["data"]["model_tier"], "large")
+        self.assertGreater(self.completions.max_in_flight, 1)
+
+        self.assertEqual(await Image.objects.acount(), 4)
+        usage = await DailyTokenUsage.objects.aget()
+        self.assertEqual((usage.input_tokens, usage.output_tokens), (28, 12))
+
+    async def test_quality_parameter(self):
+        """base IR이 없으면 fast를 요청해도 large로 처리하고, 알 수 없는 값은 400으로 응답하는지 테스트합니다."""
+        response = await self._post("fast.jpg", quality="fast")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["model_tier"], "large")
+
+        response = await self._post("best.jpg", quality="best")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_router_is_resolved_off_the_event_loop(self):
+        """첫 요청의 모델 컴파일이 이벤트 루프를 막지 않도록, 라우터를 추론 스레드에서 가져오는지 테스트합니다."""
+        router = CaptionTierRouter.get_tier_router()
+        callers = []
+
+        def get_tier_router():
+            callers.append(threading.current_thread())
+            return router
+
+        with mock.patch.object(CaptionTierRouter, "get_tier_router", side_effect=get_tier_router):
+            response = await self._post("first.jpg")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(callers), 1)
+        self.assertIsNot(callers[0], threading.current_thread())
+        self.assertTrue(callers[0].name.startswith("blip-inference"))
+
+    async def test_missing_api_key_is_rejected_before_inference(self):
+        """ChatGPT 키가 없으면 BLIP 추론을 시작하지 않고 바로 500으로 응답하는지 테스트합니다."""
+        with mock.patch.object(views, "get_async_chatgpt_client", return_value=None), mock.patch.object(
+            views, "analyze_image_async"
+        ) as analyze:
+            response = await self._post("nokey.jpg")
+
+        self.assertEqual(response.status_code, 500)
+        analyze.assert_not_called()
+        self.assertEqual(await Image.objects.acount(), 0)
+
+    async def test_missing_file(self):
+        response = await self.async_client.post(self.url, {})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncChatgptClientTest(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(views._async_chatgpt_clients, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_uses_pool_settings(self):
+        """AsyncOpenAI가 SDK 기본 httpx 클라이언트가 아닌, 공유 풀 설정으로 만든 클라이언트를 사용하는지 테스트합니다."""
+        sentinel = object()
+
+        async def create():
+            return views.get_async_chatgpt_client()
+
+        with mock.patch.object(views, "chatgpt_api_key", "sk-test"), mock.patch.object(
+            views, "new_async_http_client", return_value=sentinel
+        ), mock.patch("openai.AsyncOpenAI") as async_openai:
+            asyncio.run(create())
+
+        self.assertIs(async_openai.call_args.kwargs["http_client"], sentinel)
+
+    def test_clients_of_closed_loops_are_closed(self):
+        """닫힌 루프의 클라이언트를 버릴 때 close()로 커넥션을 정리하는지 테스트합니다."""
+        stale = mock.AsyncMock()
+        closed_loop = asyncio.new_event_loop()
+        closed_loop.close()
+        views._async_chatgpt_clients[closed_loop] = stale
+
+        async def create():
+            client = views.get_async_chatgpt_client()
+            await asyncio.sleep(0)
+            return client
+
+        with mock.patch.object(views, "chatgpt_api_key", "sk-test"), mock.patch("openai.AsyncOpenAI"):
+            asyncio.run(create())
+
+        stale.close.assert_awaited_once()
+        self.assertNotIn(closed_loop, views._async_chatgpt_clients)
+
+
+class ViewsImportTest(SimpleTestCase):
+
+    def test_openai_is_not_imported_at_module_load(self):
+        """뷰 모듈을 불러오기만 해서는 openai SDK를 import 하지 않는지 (새 프로세스에서) 테스트합니다."""
+        sample = startup_benchmark.measure(startup_benchmark.VIEWS_IMPORT)
+        self.assertNotIn("openai", sample["loaded"])
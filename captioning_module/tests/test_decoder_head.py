@@ -0,0 +1,79 @@
+# captioning_module/tests/test_decoder_head.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import openvino as ov
+from PIL import Image
+
+from captioning_module.decoder_head import add_token_head
+from captioning_module.image_captioner import ImageCaptioner
+from captioning_module.model_config import BLIP_DECODER_IR
+from captioning_module.tests.blip_model import build_random_blip_model
+
+
+class DecoderHeadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        build_random_blip_model(self.model_dir)
+        patcher = mock.patch.object(ImageCaptioner, "_this", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_captioner(self, top_k):
+        return ImageCaptioner(
+            self.model_dir, device="CPU", feature_store_dir=None, decoder_top_k=top_k
+        )
+
+    def test_head_matches_host_top_k(self):
+        """그래프 안에서 행마다 자기 위치의 top-k를 고른 결과가 전체 logits에서 고른 결과와 같은지 테스트합니다."""
+        core = ov.Core()
+        decoder = core.read_model(os.path.join(self.model_dir, BLIP_DECODER_IR))
+        full = core.compile_model(decoder, "CPU")
+        head = core.compile_model(add_token_head(decoder, top_k=3), "CPU")
+
+        rng = np.random.default_rng(0)
+        input_ids = rng.integers(0, 16, size=(2, 5)).astype(np.int64)
+        image_embeds = rng.standard_normal((2, 64, 8)).astype(np.float32)
+        positions = np.array([4, 1], dtype=np.int64)
+
+        logits = full({0: input_ids, 1: image_embeds})[0]
+        values, token_ids = head({0: input_ids, 1: image_embeds, 2: positions}).values()
+        self.assertEqual(token_ids.shape, (2, 3))
+        for row, position in enumerate(positions):
+            expected = np.argsort(logits[row, position])[::-1][:3]
+            np.testing.assert_array_equal(token_ids[row], expected)
+            np.testing.assert_allclose(values[row], logits[row, position, expected], rtol=1e-5)
+
+    def test_greedy_head_keeps_captions(self):
+        """
+        greedy 헤드(k=1)를 붙여도 기존 전체 logits 방식과 같은 캡션이 나오는지 테스트합니다. (조건부 배치 포함)
+        """
+        image = Image.new("RGB", (20, 20), (30, 60, 220))
+        prompts = ["a photography of", "the mood is"]
+        baseline = self.make_captioner(0)
+        greedy = self.make_captioner(1)
+
+        self.assertIsNone(baseline.token_ids_output)
+        self.assertEqual(greedy.decoder_model.output(1).get_partial_shape().to_string(), "[?,1]")
+        self.assertEqual(
+            greedy.get_blip_analyze_with_prompts(image, prompts)[:2],
+            baseline.get_blip_analyze_with_prompts(image, prompts)[:2],
+        )
+
+    def test_top_k_sampling_uses_head_candidates(self):
+        captioner = self.make_captioner(3)
+        image = Image.new("RGB", (20, 20), (120, 10, 10))
+        with mock.patch.object(captioner, "_select_tokens", wraps=captioner._select_tokens) as select:
+            caption = captioner.get_blip_analyze(image, temperature=1.0)
+        self.assertIsInstance(caption, str)
+        outputs = select.call_args.args[0]
+        self.assertEqual(outputs[captioner.token_ids_output].shape[1], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
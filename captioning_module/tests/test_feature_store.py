@@ -0,0 +1,139 @@
+# captioning_module/tests/test_feature_store.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from captioning_module.feature_store import VisionFeatureStore
+from captioning_module.image_captioner import ImageCaptioner
+from captioning_module.tests.blip_model import build_random_blip_model
+
+EMBEDS_SHAPE = (1, 4, 8)
+SLOT_BYTES = 2 * (4 * 8 + 8)
+
+
+def features(seed):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal(EMBEDS_SHAPE).astype(np.float32), rng.standard_normal(8).astype(np.float32)
+
+
+class VisionFeatureStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def open_store(self, slots=3, version="v1"):
+        store = VisionFeatureStore(self.directory, slots * SLOT_BYTES, version)
+        self.addCleanup(store.close)
+        return store
+
+    def test_round_trip_and_lru_eviction(self):
+        """가득 차면 가장 오래 사용하지 않은 항목부터 덮어쓰는지 테스트합니다."""
+        store = self.open_store(slots=2)
+        store.put(b"a" * 16, *features(0))
+        store.put(b"b" * 16, *features(1))
+        self.assertEqual(store.capacity, 2)
+
+        embeds, pooled = store.get(b"a" * 16)  # a를 최근 사용으로
+        np.testing.assert_allclose(embeds, features(0)[0], atol=1e-2)
+        np.testing.assert_allclose(pooled, features(0)[1], atol=1e-2)
+
+        store.put(b"c" * 16, *features(2))
+        self.assertIsNone(store.get(b"b" * 16))
+        self.assertIsNotNone(store.get(b"a" * 16))
+        self.assertIsNotNone(store.get(b"c" * 16))
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, "features.f16")), 2 * SLOT_BYTES)
+
+    def test_persists_entries_and_lru_order(self):
+        store = self.open_store()
+        for i, key in enumerate((b"a", b"b", b"c")):
+            store.put(key * 16, *features(i))
+        store.get(b"a" * 16)
+        store.close()
+
+        reopened = self.open_store()
+        self.assertEqual(len(reopened), 3)
+        reopened.put(b"d" * 16, *features(3))  # 가장 오래된 b가 제거됨
+        self.assertIsNone(reopened.get(b"b" * 16))
+        np.testing.assert_allclose(reopened.get(b"a" * 16)[0], features(0)[0], atol=1e-2)
+
+    def test_model_version_change_discards_features(self):
+        store = self.open_store(version="v1")
+        store.put(b"a" * 16, *features(0))
+        store.close()
+        self.assertEqual(len(self.open_store(version="v2")), 0)
+
+    def test_interrupted_write_is_not_served(self):
+        """키를 쓰기 전에 중단된 슬롯(키가 지워진 상태)은 다시 열었을 때 조회되지 않는지 테스트합니다."""
+        store = self.open_store()
+        store.put(b"a" * 16, *features(0))
+        store._keys[store._slots[b"a" * 16]] = 0
+        store.close()
+        self.assertIsNone(self.open_store().get(b"a" * 16))
+
+    def test_data_is_flushed_before_key_is_published(self):
+        """
+        덮어쓰는 슬롯의 키 삭제 → 데이터 → 새 키 순서로 디스크에 기록되는지 테스트합니다.
+        (데이터를 flush 하는 시점에 그 슬롯의 키가 디스크에 지워진 상태여야 함)
+        """
+        store = self.open_store(slots=1)
+        store.put(b"a" * 16, *features(0))
+        flushed = []
+
+        def record(array):
+            flushed.append((os.path.basename(array.filename), bytes(store._keys[0])))
+
+        with mock.patch.object(np.memmap, "flush", autospec=True, side_effect=record):
+            store.put(b"b" * 16, *features(1))  # 하나뿐인 슬롯(a)을 덮어씀
+
+        empty = bytes(16)
+        self.assertEqual(flushed, [("keys.u8", empty), ("features.f16", empty)])
+        self.assertEqual(bytes(store._keys[0]), b"b" * 16)
+
+    def test_second_process_cannot_share_directory(self):
+        self.open_store()
+        with self.assertRaises(OSError):
+            VisionFeatureStore(self.directory, SLOT_BYTES, "v1")
+
+
+class CaptionerFeatureStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.store_dir = tempfile.mkdtemp()
+        build_random_blip_model(self.model_dir)
+        patcher = mock.patch.object(ImageCaptioner, "_this", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_captioner(self):
+        captioner = ImageCaptioner(self.model_dir, device="CPU", feature_store_dir=self.store_dir)
+        self.addCleanup(captioner.feature_store.close)
+        return captioner
+
+    def test_regeneration_skips_encoder(self):
+        """
+        같은 사진을 다시 캡션하면(재시작 후 포함) 비전 인코더 없이 같은 결과가 나오는지 테스트합니다.
+        """
+        image = Image.new("RGB", (24, 24), (10, 200, 90))
+        captioner = self.make_captioner()
+        with mock.patch.object(captioner, "_encode_image", wraps=captioner._encode_image) as encode:
+            first, first_embedding = captioner.get_blip_analyze(image, return_embedding=True)
+            second, second_embedding = captioner.get_blip_analyze(image, return_embedding=True)
+        self.assertEqual(encode.call_count, 1)
+        self.assertEqual(first, second)
+        np.testing.assert_allclose(first_embedding, second_embedding, rtol=1e-6)
+        captioner.feature_store.close()
+
+        restarted = self.make_captioner()
+        with mock.patch.object(restarted, "_encode_image") as encode:
+            self.assertEqual(restarted.get_blip_analyze(image), first)
+        encode.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
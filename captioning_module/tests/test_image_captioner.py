@@ -0,0 +1,113 @@
+# captioning_module/tests/test_image_captioner.py
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from captioning_module.image_captioner import ImageCaptioner
+from captioning_module.preprocess_spec import clean_up_tokenization, load_preprocess_spec
+from captioning_module.tests.blip_model import VOCAB, build_random_blip_model
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_image(color=(200, 120, 40)):
+    return Image.new("RGB", (32, 24), color)
+
+
+class ImageCaptionerSpecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        build_random_blip_model(self.model_dir)
+        patcher = mock.patch.object(ImageCaptioner, "_this", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.captioner = ImageCaptioner(self.model_dir, device="CPU", feature_store_dir=None)
+
+    def test_loads_preprocess_spec(self):
+        """export 명세의 이미지 크기/정규화 값과 토큰 id를 사용하는지 테스트합니다."""
+        self.assertEqual((self.captioner.image_height, self.captioner.image_width), (8, 8))
+        self.assertEqual(self.captioner.bos_token_id, VOCAB["[DEC]"])
+        self.assertEqual(self.captioner.eos_token_id, VOCAB["[SEP]"])
+
+        pixel_values = self.captioner._preprocess(make_image((255, 255, 255)))
+        self.assertEqual(pixel_values.shape, (1, 3, 8, 8))
+        np.testing.assert_allclose(pixel_values, 2.0)  # (1.0 - 0.5) / 0.25
+
+    def test_caption_decodes_without_special_tokens(self):
+        caption, embedding = self.captioner.get_blip_analyze(make_image(), return_embedding=True)
+        self.assertIsInstance(caption, str)
+        self.assertNotIn("[DEC]", caption)
+        self.assertNotIn("[SEP]", caption)
+        self.assertAlmostEqual(float(np.linalg.norm(embedding)), 1.0, places=5)
+
+    def test_prompted_captions_share_one_encoder_pass(self):
+        """
+        접두어별 조건부 캡션을 한 배치로 만들 때 비전 인코더는 한 번만 실행되고,
+        길이가 다른 접두어(오른쪽 pad)도 한 장씩 디코딩한 결과와 같은지 테스트합니다.
+        """
+        image = make_image()
+        prompts = ["a photography of", "the mood is", "dog"]
+        with mock.patch.object(
+            self.captioner, "_encode_image", wraps=self.captioner._encode_image
+        ) as encode:
+            caption, details, embedding = self.captioner.get_blip_analyze_with_prompts(image, prompts)
+        self.assertEqual(encode.call_count, 1)
+        self.assertEqual(list(details), prompts)
+        self.assertEqual(caption, self.captioner.get_blip_analyze(image))
+        self.assertIsNotNone(embedding)
+
+        bos = self.captioner.bos_token_id
+        for prompt in prompts:
+            prefix = [bos] + self.captioner.tokenizer.encode(prompt, add_special_tokens=False).ids
+            single, _ = self.captioner._generate_captions(
+                image, [prefix], ImageCaptioner.MAX_TOKEN, [ImageCaptioner.CONDITIONAL_MIN_TOKEN]
+            )
+            self.assertEqual(details[prompt], single[0])
+            self.assertTrue(details[prompt].startswith(prompt))
+
+    def test_prompts_are_skipped_without_split_model(self):
+        """단일 IR만 있으면 조건부 캡션 없이 기본 캡션 한 행만 디코딩하는지 테스트합니다."""
+        with mock.patch.object(self.captioner, "split_model", False), mock.patch.object(
+            self.captioner, "_generate_captions", return_value=(["a dog"], None)
+        ) as generate:
+            caption, details, embedding = self.captioner.get_blip_analyze_with_prompts(
+                make_image(), ["the mood is"]
+            )
+        self.assertEqual((caption, details, embedding), ("a dog", {}, None))
+        self.assertEqual(generate.call_args.args[1], [[self.captioner.bos_token_id]])
+
+    def test_clean_up_tokenization(self):
+        self.assertEqual(clean_up_tokenization("a dog , on the beach ."), "a dog, on the beach.")
+        self.assertEqual(clean_up_tokenization("it ' s the dog 's"), "it's the dog's")
+
+    def test_missing_spec(self):
+        self.assertIsNone(load_preprocess_spec(tempfile.mkdtemp()))
+
+    def test_runtime_does_not_import_transformers(self):
+        """
+        명세가 있으면 캡셔너를 만들고 추론해도 transformers/torch를 import 하지 않는지 새 프로세스에서 테스트합니다.
+        """
+        code = (
+            "import sys\n"
+            "from PIL import Image\n"
+            "from captioning_module.image_captioner import ImageCaptioner\n"
+            f"captioner = ImageCaptioner({self.model_dir!r}, device='CPU', feature_store_dir=None)\n"
+            "captioner.get_blip_analyze(Image.new('RGB', (16, 16)))\n"
+            "print(sorted(m for m in ('transformers', 'torch') if m in sys.modules))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
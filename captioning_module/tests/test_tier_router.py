@@ -0,0 +1,139 @@
+# captioning_module/tests/test_tier_router.py
+
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from captioning_module.image_captioner import ImageCaptioner
+from captioning_module.tests.blip_model import build_random_blip_model
+from captioning_module.tier_router import CaptionTierRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_router(clock, **kwargs):
+    captioners = {"large": SimpleNamespace(name="large"), "base": SimpleNamespace(name="base")}
+    options = dict(latency_slo=2.0, degrade_queue_depth=3, recover_queue_depth=0, min_hold_seconds=5.0)
+    options.update(kwargs)
+    return CaptionTierRouter(captioners, clock=clock, **options)
+
+
+class CaptionTierRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.router = make_router(self.clock)
+
+    def test_explicit_quality(self):
+        self.assertEqual(self.router.choose("quality"), "large")
+        self.assertEqual(self.router.choose("fast"), "base")
+        self.assertEqual(self.router.choose(None), "large")
+        with self.assertRaises(ValueError):
+            self.router.choose("best")
+
+        with self.router.serve("fast") as (tier, captioner):
+            self.assertEqual((tier, captioner.name), ("base", "base"))
+            self.assertEqual(self.router.in_flight, 1)
+        self.assertEqual(self.router.in_flight, 0)
+
+    def test_fast_without_base_uses_large(self):
+        router = CaptionTierRouter({"large": SimpleNamespace()}, degrade_queue_depth=0)
+        self.assertEqual(router.choose("fast"), "large")
+        self.assertEqual(router.choose("auto"), "large")
+
+    def test_degrades_under_queue_depth_with_hysteresis(self):
+        """
+        처리 중인 요청이 degrade 기준에 닿으면 base로 낮추고, recover 기준(0)까지 줄고
+        최소 유지 시간이 지나야 large로 돌아가는지 테스트합니다.
+        """
+        tiers = []
+        with self.router.serve() as (first, _), self.router.serve() as (second, _), \
+                self.router.serve() as (third, _):
+            tiers = [first, second, third]
+            self.assertEqual(self.router.choose(), "base")  # 처리 중 3개 → 낮춤
+        self.assertEqual(tiers, ["large", "large", "large"])
+
+        # 요청이 줄어도 유지 시간 전에는 base를 유지합니다.
+        self.assertEqual(self.router.choose(), "base")
+        self.clock.now = 6.0
+        with self.router.serve() as (tier, _):
+            self.assertEqual(tier, "large")
+            # 요청 1개가 처리 중이면 아직 degrade 기준(3) 아래이므로 large를 유지합니다.
+            self.assertEqual(self.router.choose(), "large")
+
+    def test_degrades_when_large_latency_exceeds_slo(self):
+        with self.router.serve() as (tier, _):
+            self.clock.now += 3.0  # SLO(2초)를 넘는 large 요청
+        self.assertEqual(tier, "large")
+        self.assertAlmostEqual(self.router.latency["large"], 3.0)
+        self.assertEqual(self.router.choose(), "base")
+
+        # 한가해지면 이전 측정값을 버리고 large로 돌아갑니다.
+        self.clock.now += 5.0
+        self.assertEqual(self.router.choose(), "large")
+        self.assertIsNone(self.router.latency["large"])
+
+    def test_failed_request_is_not_timed(self):
+        with self.assertRaises(RuntimeError):
+            with self.router.serve("quality"):
+                self.clock.now += 10.0
+                raise RuntimeError("inference failed")
+        self.assertIsNone(self.router.latency["large"])
+        self.assertEqual(self.router.in_flight, 0)
+
+
+class CaptionerTierInstancesTest(unittest.TestCase):
+
+    def test_two_captioners_side_by_side(self):
+        """등급별 캡셔너를 함께 만들 수 있고, 임베딩 모델 이름이 등급마다 다른지 테스트합니다."""
+        large_dir, base_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        build_random_blip_model(large_dir, seed=0)
+        build_random_blip_model(base_dir, seed=1)
+        large = ImageCaptioner(large_dir, "test/blip-large", device="CPU", feature_store_dir=None)
+        base = ImageCaptioner(base_dir, "test/blip-base", device="CPU", feature_store_dir=None)
+
+        self.assertIsNot(large.decoder_model, base.decoder_model)
+        self.assertEqual(large.embedding_model, "test/blip-large:vision-pooled")
+        self.assertEqual(base.embedding_model, "test/blip-base:vision-pooled")
+
+
+class TierRouterSingletonTest(unittest.TestCase):
+
+    def test_concurrent_first_calls_load_models_once(self):
+        """여러 스레드가 동시에 처음 호출해도 모델을 한 번만 불러오는지 테스트합니다."""
+        loads = []
+
+        def slow_captioner():
+            loads.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return SimpleNamespace()
+
+        with mock.patch.object(CaptionTierRouter, "_this", None), mock.patch.object(
+            ImageCaptioner, "get_image_captioner", side_effect=slow_captioner
+        ), mock.patch("captioning_module.tier_router.os.path.isdir", return_value=False):
+            routers = []
+            threads = [
+                threading.Thread(target=lambda: routers.append(CaptionTierRouter.get_tier_router()))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(len(routers), 4)
+        self.assertTrue(all(router is routers[0] for router in routers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# captioning_module/tests/test_token_budget.py
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+
+from captioning_module import token_budget
+from captioning_module.models import DailyTokenUsage
+
+
+def record_usage_retrying_locks(input_tokens, output_tokens):
+    """
+    테스트 DB(SQLite 공유 캐시 메모리 DB)는 잠금을 기다리지 않고 바로 'table is locked'를 냅니다.
+    실패한 문장은 반영되지 않으므로, 실제 DB의 잠금 대기처럼 다시 시도합니다.
+    """
+    while True:
+        try:
+            return token_budget.record_usage(input_tokens, output_tokens)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            time.sleep(0.001)
+
+
+class TokenBudgetTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_record_usage_keeps_every_increment(self):
+        """
+        여러 스레드가 동시에 사용량을 기록해도(첫 행 생성 경쟁 포함) 증가분이 사라지지 않는지 테스트합니다.
+        """
+        workers, repeats = 8, 10
+        barrier = threading.Barrier(workers)
+        errors = []
+
+        def work():
+            try:
+                barrier.wait()
+                for _ in range(repeats):
+                    record_usage_retrying_locks(3, 2)
+            except Exception as e:  # pragma: no cover - 실패 시 원인 표시용
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        usage = DailyTokenUsage.objects.get()
+        self.assertEqual(
+            (usage.input_tokens, usage.output_tokens),
+            (3 * workers * repeats, 2 * workers * repeats),
+        )
+
+    def test_budget_check_uses_cached_total(self):
+        """예산 확인이 캐시된 사용량을 쓰고, 기록한 사용량이 캐시에 바로 반영되는지 테스트합니다."""
+        self.assertTrue(token_budget.has_budget())
+        token_budget.record_usage(token_budget.DAILY_TOKEN_LIMIT - 10, 0)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(token_budget.get_today_usage(), token_budget.DAILY_TOKEN_LIMIT - 10)
+            self.assertTrue(token_budget.has_budget(5))
+            self.assertFalse(token_budget.has_budget(10))
@@ -0,0 +1,137 @@
+# captioning_module/tests/test_translator.py
+
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+from transformers import PreTrainedTokenizerFast
+
+from captioning_module.translator import KoreanTranslator
+
+VOCAB = {
+    "<pad>": 0, "</s>": 1, "<unk>": 2,
+    "a": 3, "dog": 4, "on": 5, "the": 6, "beach": 7, "개": 8, "해변": 9,
+}
+
+
+def build_tokenizer():
+    tokenizer = Tokenizer(models.WordLevel(VOCAB, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="$A </s>", special_tokens=[("</s>", VOCAB["</s>"])]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, pad_token="<pad>", eos_token="</s>", unk_token="<unk>"
+    )
+
+
+def build_random_ir_model(model_dir, hidden=8, seed=0):
+    """
+    torch 없이 OpenVINO opset으로 인코더/디코더 형태만 같은 작은 랜덤 모델을 만듭니다.
+    """
+    rng = np.random.default_rng(seed)
+    vocab_size = len(VOCAB)
+
+    input_ids = ops.parameter([-1, -1], ov.Type.i64, name="input_ids")
+    attention_mask = ops.parameter([-1, -1], ov.Type.i64, name="attention_mask")
+    embeddings = ops.constant(rng.standard_normal((vocab_size, hidden)).astype(np.float32))
+    encoder = ov.Model([ops.gather(embeddings, input_ids, 0)], [input_ids, attention_mask])
+
+    decoder_ids = ops.parameter([-1, -1], ov.Type.i64, name="decoder_input_ids")
+    states = ops.parameter([-1, -1, hidden], ov.Type.f32, name="encoder_hidden_states")
+    states_mask = ops.parameter([-1, -1], ov.Type.i64, name="encoder_attention_mask")
+    decoder_embeddings = ops.constant(
+        rng.standard_normal((vocab_size, hidden)).astype(np.float32)
+    )
+    # 패딩 위치를 제외한 인코더 상태 평균 (실제 모델의 encoder_attention_mask 역할)
+    mask = ops.unsqueeze(ops.convert(states_mask, ov.Type.f32), ops.constant([2]))
+    context = ops.divide(
+        ops.reduce_sum(ops.multiply(states, mask), ops.constant([1]), True),
+        ops.reduce_sum(mask, ops.constant([1]), True),
+    )
+    hidden_states = ops.add(ops.gather(decoder_embeddings, decoder_ids, 0), context)
+    lm_head = ops.constant(rng.standard_normal((hidden, vocab_size)).astype(np.float32))
+    decoder = ov.Model(
+        [ops.matmul(hidden_states, lm_head, False, False)],
+        [decoder_ids, states, states_mask],
+    )
+
+    ov.save_model(encoder, os.path.join(model_dir, "translator_encoder.xml"))
+    ov.save_model(decoder, os.path.join(model_dir, "translator_decoder.xml"))
+    build_tokenizer().save_pretrained(model_dir)
+    with open(os.path.join(model_dir, "translator_config.json"), "w") as f:
+        json.dump({"decoder_start_token_id": 0, "eos_token_id": 1, "pad_token_id": 0}, f)
+
+
+class KoreanTranslatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        build_random_ir_model(self.model_dir)
+        self.translator = KoreanTranslator(self.model_dir, device="CPU")
+
+    def test_batch_matches_single_translation(self):
+        """
+        배치 번역 결과가 문장별 단일 번역 결과와 같은지 테스트합니다. (패딩이 결과에 영향을 주지 않아야 함)
+        """
+        texts = ["a dog on the beach", "the dog", "beach"]
+        batch = self.translator.translate_batch(texts)
+
+        single = KoreanTranslator(self.model_dir, device="CPU")
+        self.assertEqual(batch, [single.translate(text) for text in texts])
+
+    def test_cache_skips_inference_and_deduplicates(self):
+        """
+        캐시된 문장과 중복 문장은 추론 없이 결과를 재사용하는지 테스트합니다.
+        """
+        with mock.patch.object(
+            self.translator, "_generate", wraps=self.translator._generate
+        ) as generate:
+            first = self.translator.translate_batch(["a dog", "a dog", ""])
+            self.assertEqual(generate.call_args.args[0], ["a dog"])
+            self.assertEqual(first[0], first[1])
+            self.assertEqual(first[2], "")
+
+            self.assertEqual(self.translator.translate("a dog"), first[0])
+            self.assertEqual(generate.call_count, 1)
+
+
+@unittest.skipUnless(importlib.util.find_spec("torch"), "torch is required for export")
+class TranslatorExportTest(unittest.TestCase):
+
+    def test_export_random_marian_model(self):
+        """
+        랜덤 초기화된 작은 Marian 모델을 내보낸 IR로 번역이 동작하는지 테스트합니다.
+        """
+        from transformers import MarianConfig, MarianMTModel
+        from captioning_module.export_translator_to_openvino import export_translator
+
+        tokenizer = build_tokenizer()
+        config = MarianConfig(
+            vocab_size=len(VOCAB),
+            d_model=16,
+            encoder_layers=1,
+            decoder_layers=1,
+            encoder_attention_heads=2,
+            decoder_attention_heads=2,
+            encoder_ffn_dim=32,
+            decoder_ffn_dim=32,
+            max_position_embeddings=64,
+            pad_token_id=0,
+            eos_token_id=1,
+            decoder_start_token_id=0,
+        )
+        model_dir = tempfile.mkdtemp()
+        export_translator(MarianMTModel(config), tokenizer, model_dir)
+
+        translator = KoreanTranslator(model_dir, device="CPU")
+        result = translator.translate_batch(["a dog on the beach", "the dog"])
+        self.assertEqual(len(result), 2)
+        self.assertTrue(all(isinstance(text, str) for text in result))
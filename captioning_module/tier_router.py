@@ -0,0 +1,147 @@
+# captioning_module/tier_router.py
+"""
+BLIP 모델 등급(large / base) 선택
+
+두 등급의 IR을 함께 불러 두고, 요청마다 어느 캡셔너로 처리할지 정합니다.
+
+- quality="quality" → large, quality="fast" → base (base IR이 없으면 large)
+- quality="auto"(기본) → 처리 중인 요청 수와 large의 최근 지연으로 자동 선택
+  처리 중인 요청이 BLIP_TIER_DEGRADE_QUEUE_DEPTH개 이상이거나 large 지연(EWMA)이 SLO를 넘으면 base로 낮추고,
+  처리 중인 요청이 BLIP_TIER_RECOVER_QUEUE_DEPTH개 이하로 줄면 (최소 유지 시간 후) large로 돌아갑니다.
+  두 기준이 다르므로 경계 근처에서 등급이 요청마다 바뀌지 않습니다. (히스테리시스)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .image_captioner import ImageCaptioner
+from .model_config import (
+    BLIP_TIER_BASE,
+    BLIP_TIER_DEGRADE_QUEUE_DEPTH,
+    BLIP_TIER_LARGE,
+    BLIP_TIER_LATENCY_SLO_MS,
+    BLIP_TIER_MIN_HOLD_SECONDS,
+    BLIP_TIER_RECOVER_QUEUE_DEPTH,
+    BLIP_TIERS,
+)
+
+QUALITY_AUTO = "auto"
+# API의 quality 값 → 모델 등급
+QUALITY_TIERS = {"quality": BLIP_TIER_LARGE, "fast": BLIP_TIER_BASE}
+QUALITY_CHOICES = (QUALITY_AUTO, *QUALITY_TIERS)
+
+
+class CaptionTierRouter:
+
+    _this = None
+    _create_lock = threading.Lock()
+
+    @classmethod
+    def get_tier_router(cls):
+        """
+        싱글톤 인스턴스 반환. large는 공유 캡셔너를 사용하고, base IR이 export 되어 있으면 함께 불러옵니다.
+        첫 호출은 모델을 컴파일하므로 오래 걸립니다. 이벤트 루프가 아닌 스레드에서 호출하세요.
+        여러 스레드가 동시에 처음 호출해도 모델은 한 번만 불러옵니다.
+        """
+        if cls._this is None:
+            with cls._create_lock:
+                if cls._this is None:
+                    captioners = {BLIP_TIER_LARGE: ImageCaptioner.get_image_captioner()}
+                    base_id, base_dir = BLIP_TIERS[BLIP_TIER_BASE]
+                    if os.path.isdir(base_dir):
+                        captioners[BLIP_TIER_BASE] = ImageCaptioner(base_dir, base_id)
+                    else:
+                        print(f"Warning: {base_dir} not found. Every caption is served by BLIP-large.")
+                    cls._this = cls(captioners)
+        return cls._this
+
+    def __init__(
+        self,
+        captioners: Dict[str, ImageCaptioner],
+        latency_slo: float = BLIP_TIER_LATENCY_SLO_MS / 1000,
+        degrade_queue_depth: int = BLIP_TIER_DEGRADE_QUEUE_DEPTH,
+        recover_queue_depth: int = BLIP_TIER_RECOVER_QUEUE_DEPTH,
+        min_hold_seconds: float = BLIP_TIER_MIN_HOLD_SECONDS,
+        ewma_alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if BLIP_TIER_LARGE not in captioners:
+            raise ValueError("CaptionTierRouter requires a BLIP-large captioner")
+        self.captioners = captioners
+        self.latency_slo = latency_slo
+        self.degrade_queue_depth = degrade_queue_depth
+        self.recover_queue_depth = recover_queue_depth
+        self.min_hold_seconds = min_hold_seconds
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.in_flight = 0  # 현재 처리 중(대기 포함)인 캡션 요청 수
+        self.latency: Dict[str, Optional[float]] = {tier: None for tier in captioners}  # 등급별 지연 EWMA(초)
+        self.degraded = False
+        self._changed_at = 0.0
+
+    # ----------------------------------------------------
+    # 등급 선택
+    # ----------------------------------------------------
+    def _auto_tier(self) -> str:
+        if BLIP_TIER_BASE not in self.captioners:
+            return BLIP_TIER_LARGE
+        now = self._clock()
+        depth = self.in_flight
+        latency = self.latency[BLIP_TIER_LARGE]
+        if not self.degraded:
+            if depth >= self.degrade_queue_depth or (latency is not None and latency > self.latency_slo):
+                self.degraded = True
+                self._changed_at = now
+                print(f"[INFO] BLIP tier: large -> base (in flight {depth}, large latency {latency})")
+        elif depth <= self.recover_queue_depth and now - self._changed_at >= self.min_hold_seconds:
+            self.degraded = False
+            self._changed_at = now
+            # 과부하 중에 측정한 large 지연은 버리고, 복귀 후 요청으로 다시 측정합니다.
+            self.latency[BLIP_TIER_LARGE] = None
+            print(f"[INFO] BLIP tier: base -> large (in flight {depth})")
+        return BLIP_TIER_BASE if self.degraded else BLIP_TIER_LARGE
+
+    def _resolve(self, quality: Optional[str]) -> str:
+        if not quality or quality == QUALITY_AUTO:
+            return self._auto_tier()
+        tier = QUALITY_TIERS.get(quality)
+        if tier is None:
+            raise ValueError(f"Unknown quality '{quality}' ({', '.join(QUALITY_CHOICES)})")
+        return tier if tier in self.captioners else BLIP_TIER_LARGE
+
+    def choose(self, quality: Optional[str] = None) -> str:
+        """이번 요청을 처리할 등급 이름을 반환합니다. (알 수 없는 quality 값이면 ValueError)"""
+        with self._lock:
+            return self._resolve(quality)
+
+    @contextmanager
+    def serve(self, quality: Optional[str] = None) -> Iterator[Tuple[str, ImageCaptioner]]:
+        """
+        (등급 이름, 캡셔너)를 돌려주고, 블록이 끝날 때까지 처리 중인 요청으로 셉니다.
+        정상 종료한 요청의 소요 시간(대기 포함)은 그 등급의 지연 EWMA에 반영합니다.
+
+            with caption_router.serve(quality) as (tier, captioner):
+                caption = await run_in_threadpool(captioner.get_blip_analyze, image)
+        """
+        with self._lock:
+            tier = self._resolve(quality)
+            self.in_flight += 1
+        started = self._clock()
+        try:
+            yield tier, self.captioners[tier]
+            self._record_latency(tier, self._clock() - started)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _record_latency(self, tier: str, elapsed: float) -> None:
+        with self._lock:
+            previous = self.latency[tier]
+            if previous is None:
+                self.latency[tier] = elapsed
+            else:
+                self.latency[tier] = previous + self.ewma_alpha * (elapsed - previous)
@@ -0,0 +1,72 @@
+# captioning_module/token_budget.py
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DailyTokenUsage
+
+# --- 일일 토큰 제한 설정 ---
+DAILY_TOKEN_LIMIT = 50000
+
+# 사용량 조회 결과를 캐시에 두는 시간(초). 이 시간 동안 예산 확인은 DB를 조회하지 않습니다.
+# (다른 프로세스의 사용량은 최대 이 시간만큼 늦게 반영되므로, 제한을 약간 넘을 수 있습니다)
+BUDGET_CACHE_SECONDS = 5
+
+
+def _cache_key(date) -> str:
+    return f"daily-token-usage:{date.isoformat()}"
+
+
+def get_today_usage() -> int:
+    """
+    오늘 사용한 토큰 수(입력 + 출력)를 반환합니다. 짧은 시간 캐시된 값을 사용합니다.
+    """
+    today = timezone.localdate()
+    key = _cache_key(today)
+    total = cache.get(key)
+    if total is None:
+        row = (
+            DailyTokenUsage.objects.filter(date=today)
+            .values_list("input_tokens", "output_tokens")
+            .first()
+        )
+        total = sum(row) if row else 0
+        cache.set(key, total, BUDGET_CACHE_SECONDS)
+    return total
+
+
+def has_budget(estimated_tokens: int = 0) -> bool:
+    """예상 사용량을 더해도 일일 제한 미만이면 True"""
+    return get_today_usage() + estimated_tokens < DAILY_TOKEN_LIMIT
+
+
+def record_usage(input_tokens: int, output_tokens: int) -> None:
+    """
+    오늘 사용량에 토큰 수를 원자적으로 더합니다.
+
+    읽고-수정하고-저장(usage.save())하는 대신 UPDATE ... SET input_tokens = input_tokens + n
+    한 번으로 처리하므로, 동시 요청이 서로의 증가분을 덮어쓰지 않습니다.
+    """
+    today = timezone.localdate()
+    increments = {
+        "input_tokens": F("input_tokens") + input_tokens,
+        "output_tokens": F("output_tokens") + output_tokens,
+    }
+    updated = DailyTokenUsage.objects.filter(date=today).update(**increments)
+    if not updated:
+        # 오늘 첫 요청: 행을 만듭니다. 다른 요청이 먼저 만들었다면(unique 위반) 다시 UPDATE 합니다.
+        try:
+            with transaction.atomic():
+                DailyTokenUsage.objects.create(
+                    date=today, input_tokens=input_tokens, output_tokens=output_tokens
+                )
+        except IntegrityError:
+            DailyTokenUsage.objects.filter(date=today).update(**increments)
+
+    # 이 프로세스의 캐시에도 바로 반영합니다. (캐시가 없으면 다음 조회 때 DB에서 읽음)
+    try:
+        cache.incr(_cache_key(today), input_tokens + output_tokens)
+    except ValueError:
+        pass
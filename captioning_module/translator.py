@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import openvino as ov
+
+from .model_config import TRANSLATION_MODEL_DIR
+
+
+class KoreanTranslator:
+    """
+    OpenVINO로 로컬 실행하는 영어 → 한국어 seq2seq 번역기 (BLIP 캡션 번역용)
+    LLM 왕복 없이 짧은 캡션을 수 ms 안에 번역하며, 결과는 LRU 캐시에 보관합니다.
+    """
+
+    MAX_NEW_TOKENS = 64
+    MAX_INPUT_TOKENS = 128
+    CACHE_SIZE = 1024
+
+    _this = None
+
+    @classmethod
+    def get_translator(cls):
+        """
+        싱글톤 인스턴스 반환
+        """
+        if cls._this is None:
+            cls._this = cls()   # 최초 1회만 생성
+        return cls._this
+
+    def __init__(
+        self,
+        model_dir: str = TRANSLATION_MODEL_DIR,
+        device: str = "AUTO",
+        cache_size: int = CACHE_SIZE,
+    ):
+        """
+        export_translator_to_openvino.py가 저장한 인코더/디코더 IR과 토크나이저를 불러옵니다.
+        """
+        # 토크나이저 로딩에만 transformers를 사용하므로, 이 번역기를 쓸 때만 import 합니다.
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, "translator_config.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        self.decoder_start_token_id = int(config["decoder_start_token_id"])
+        self.eos_token_id = int(config["eos_token_id"])
+        self.pad_token_id = int(config["pad_token_id"])
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        core = ov.Core()
+        self.encoder = core.compile_model(
+            core.read_model(os.path.join(model_dir, "translator_encoder.xml")), device
+        )
+        self.decoder = core.compile_model(
+            core.read_model(os.path.join(model_dir, "translator_decoder.xml")), device
+        )
+        self.encoder_output = self.encoder.output(0)
+        self.decoder_output = self.decoder.output(0)
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # compiled_model 호출은 내부 infer request를 공유하므로 동시 호출을 직렬화합니다.
+        self._infer_lock = threading.Lock()
+
+        print(f"TRANSLATION_MODEL_DIR: {model_dir}")
+        print("[Singleton] OpenVINO Translator Loaded")
+
+    # ----------------------------------------------------
+    # 번역
+    # ----------------------------------------------------
+    def translate(self, text: str) -> str:
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        여러 문장을 한 번의 인코더/디코더 배치로 번역합니다. 캐시에 있는 문장은 건너뜁니다.
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = OrderedDict()  # 원문 → 결과를 채울 인덱스 목록
+
+        with self._cache_lock:
+            for i, text in enumerate(texts):
+                key = text.strip()
+                if not key:
+                    results[i] = ""
+                elif key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = self._cache[key]
+                else:
+                    pending.setdefault(key, []).append(i)
+
+        if pending:
+            t0 = time.perf_counter()
+            sources = list(pending)
+            translations = self._generate(sources)
+            print(
+                f"[PROFILE] Translation ({len(sources)} texts): "
+                f"{(time.perf_counter() - t0) * 1000:.1f} ms"
+            )
+
+            with self._cache_lock:
+                for source, translated in zip(sources, translations):
+                    self._cache[source] = translated
+                    self._cache.move_to_end(source)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                    for i in pending[source]:
+                        results[i] = translated
+
+        return results
+
+    # ----------------------------------------------------
+    # 내부 기능
+    # ----------------------------------------------------
+    def _generate(self, sources: List[str]) -> List[str]:
+        encoded = self.tokenizer(
+            sources,
+            return_tensors="np",
+            padding=True,
+            truncation=True,
+            max_length=self.MAX_INPUT_TOKENS,
+        )
+        input_ids = encoded["input_ids"].astype(np.int64)
+        attention_mask = encoded["attention_mask"].astype(np.int64)
+        batch_size = input_ids.shape[0]
+
+        decoder_ids = np.full((batch_size, 1), self.decoder_start_token_id, dtype=np.int64)
+        finished = np.zeros(batch_size, dtype=bool)
+
+        with self._infer_lock:
+            hidden = self.encoder([input_ids, attention_mask])[self.encoder_output]
+
+            for _ in range(self.MAX_NEW_TOKENS):
+                logits = self.decoder([decoder_ids, hidden, attention_mask])[
+                    self.decoder_output
+                ]
+                next_token_logits = logits[:, -1, :]
+                # pad 토큰은 생성하지 않습니다 (Marian 기본 생성 설정과 동일)
+                next_token_logits[:, self.pad_token_id] = -np.inf
+                next_ids = next_token_logits.argmax(axis=-1).astype(np.int64)
+                next_ids = np.where(finished, self.pad_token_id, next_ids)
+
+                decoder_ids = np.concatenate([decoder_ids, next_ids[:, None]], axis=1)
+                finished |= next_ids == self.eos_token_id
+                if finished.all():
+                    break
+
+        return [
+            text.strip()
+            for text in self.tokenizer.batch_decode(decoder_ids, skip_special_tokens=True)
+        ]
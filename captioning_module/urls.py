@@ -1,10 +1,13 @@
 # captioning_module/urls.py
 
 from django.urls import path
-from .views import ImageCaptioningView
+from django.views.decorators.csrf import csrf_exempt
+from .views import AsyncImageCaptioningView, ImageCaptioningView
 
 app_name = 'captioning_module' # <-- 이 줄을 추가합니다.
 
 urlpatterns = [
     path('images/caption/', ImageCaptioningView.as_view(), name='image-captioning'),
-]
\ No newline at end of file
+    # 비동기 뷰 (ASGI 서버에서 실행: uvicorn main.asgi:application)
+    path('images/caption/async/', csrf_exempt(AsyncImageCaptioningView.as_view()), name='image-captioning-async'),
+]
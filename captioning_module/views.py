@@ -1,18 +1,22 @@
+import asyncio
 import os
-import openai
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import ImageSerializer
-from .models import Image, DailyTokenUsage
+from .models import Image
+from .token_budget import DAILY_TOKEN_LIMIT, get_today_usage, has_budget, record_usage
 from decouple import config
-from django.utils import timezone
-import google.generativeai as genai
 from PIL import Image as PILImage, ImageFile  # ImageFile 모듈을 가져옵니다.
 from io import BytesIO
 import json
-from .model import image_captioner
+from .tier_router import QUALITY_CHOICES, CaptionTierRouter
+from app.core.http_pool import get_sync_http_client, new_async_http_client
 
 # --- 이미지 파일 처리 설정 ---
 # 잘린 이미지 파일도 처리할 수 있도록 설정합니다.
@@ -22,23 +26,111 @@ print(
 )
 
 # --- API 키 설정 ---
-try:
-    gemini_api_key = config("GEMINI_API_KEY")
-    genai.configure(api_key=gemini_api_key)
-    print("Gemini API configured successfully.")
-except Exception as e:
-    print(f"Error configuring Gemini API: {e}")
-    gemini_api_key = None
+# google.generativeai는 import 비용이 커서, Gemini를 처음 사용할 때 불러옵니다. (get_gemini_model)
+gemini_api_key = config("GEMINI_API_KEY", default=None)
+if not gemini_api_key:
+    print("Warning: GEMINI_API_KEY not found.")
 
-try:
-    openai.api_key = config("CHATGPT_API_KEY")
-    print("ChatGPT API configured successfully.")
-except Exception as e:
-    print(f"Error configuring ChatGPT API: {e}")
-    openai.api_key = None
+# openai SDK도 import 비용이 커서, ChatGPT를 처음 호출할 때 불러옵니다. (get_chatgpt_client, get_async_chatgpt_client)
+chatgpt_api_key = config("CHATGPT_API_KEY", default=None)
+if not chatgpt_api_key:
+    print("Warning: CHATGPT_API_KEY not found.")
 
-# --- 일일 토큰 제한 설정 ---
-DAILY_TOKEN_LIMIT = 50000
+_chatgpt_client = None
+
+
+def get_chatgpt_client():
+    """
+    동기 뷰용 OpenAI 클라이언트. 모듈 전역 클라이언트 대신, 공유 커넥션 풀(keep-alive, HTTP/2)을 사용하는
+    클라이언트를 처음 사용할 때 한 번만 만듭니다. 키가 없으면 None을 반환합니다.
+    """
+    global _chatgpt_client
+    if _chatgpt_client is None and chatgpt_api_key:
+        import openai
+
+        _chatgpt_client = openai.OpenAI(api_key=chatgpt_api_key, http_client=get_sync_http_client())
+    return _chatgpt_client
+
+
+# 비동기 뷰용 AsyncOpenAI 클라이언트. httpx 비동기 커넥션 풀은 이벤트 루프에 묶이므로,
+# 루프마다 하나씩 만들어 재사용합니다. (ASGI에서는 루프가 하나라 클라이언트도 하나입니다)
+_async_chatgpt_clients = {}
+# 버린 클라이언트를 닫는 작업 (작업이 끝나기 전에 GC 되지 않도록 참조를 보관)
+_client_close_tasks = set()
+
+
+async def _close_async_chatgpt_client(client):
+    try:
+        await client.close()
+    except Exception as e:
+        print(f"Warning: failed to close AsyncOpenAI client of a closed event loop: {e}")
+
+
+def get_async_chatgpt_client():
+    if not chatgpt_api_key:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_chatgpt_clients.get(loop)
+    if client is None:
+        import openai
+
+        # 닫힌 루프(WSGI에서 요청마다 만들어지는 루프)의 클라이언트는 버리고, 소켓이 남지 않도록 닫습니다.
+        for closed in [key for key in _async_chatgpt_clients if key.is_closed()]:
+            task = loop.create_task(_close_async_chatgpt_client(_async_chatgpt_clients.pop(closed)))
+            _client_close_tasks.add(task)
+            task.add_done_callback(_client_close_tasks.discard)
+        # SDK 기본 httpx 클라이언트 대신 공유 풀과 같은 설정(커넥션 제한, keep-alive, HTTP/2)을 사용합니다.
+        client = openai.AsyncOpenAI(api_key=chatgpt_api_key, http_client=new_async_http_client())
+        _async_chatgpt_clients[loop] = client
+    return client
+
+
+# BLIP 추론은 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+# 컴파일된 OpenVINO 모델(등급별 1개)을 공유하므로 기본값은 추론 1개씩 순서대로 실행합니다.
+CAPTION_INFERENCE_WORKERS = config("CAPTION_INFERENCE_WORKERS", default=1, cast=int)
+_inference_executor = ThreadPoolExecutor(
+    max_workers=CAPTION_INFERENCE_WORKERS, thread_name_prefix="blip-inference"
+)
+
+
+def analyze_image(image_data, quality=None):
+    """
+    BLIP 캡션을 만들어 LLM 프롬프트 함수가 쓰는 형태로 반환합니다.
+    quality(auto/quality/fast)로 모델 등급을 고르며, 실제로 사용한 등급을 model_tier로 함께 반환합니다.
+    """
+    with CaptionTierRouter.get_tier_router().serve(quality) as (tier, captioner):
+        caption = captioner.get_blip_analyze(image_data)
+    return {"file_description": caption, "model_tier": tier}
+
+
+async def analyze_image_async(image_data, quality=None):
+    loop = asyncio.get_running_loop()
+    # 첫 요청에서는 모델 컴파일이 일어나므로, 라우터도 이벤트 루프가 아닌 추론 스레드에서 가져옵니다.
+    router = await loop.run_in_executor(_inference_executor, CaptionTierRouter.get_tier_router)
+    # 추론 스레드 풀에서 기다리는 시간도 처리 중인 요청으로 세어 등급 선택에 반영합니다.
+    with router.serve(quality) as (tier, captioner):
+        caption = await loop.run_in_executor(
+            _inference_executor, captioner.get_blip_analyze, image_data
+        )
+    return {"file_description": caption, "model_tier": tier}
+
+
+def invalid_quality(quality):
+    return bool(quality) and quality not in QUALITY_CHOICES
+
+
+# Gemini 모델 객체는 호출마다 만들지 않고 재사용합니다.
+_gemini_model = None
+
+
+def get_gemini_model():
+    global _gemini_model
+    if _gemini_model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=gemini_api_key)
+        _gemini_model = genai.GenerativeModel("gemini-1.5-flash")
+    return _gemini_model
 
 
 # 프롬프트 생성 함수: 문자열을 반환하도록 수정
@@ -67,10 +159,7 @@ def set_test_prompt(original_caption, file_info):
 
 # --- LLM 연동 및 토큰 사용량 체크 함수 (Gemini) ---
 def get_refined_caption_with_gemini(original_caption, file_info):
-    today = timezone.localdate()
-    usage, _ = DailyTokenUsage.objects.get_or_create(date=today)
-
-    if usage.input_tokens + usage.output_tokens >= DAILY_TOKEN_LIMIT:
+    if not has_budget():
         print("토큰 사용량이 일일 제한에 도달했습니다.")
         return "일일 토큰 사용량 제한에 도달했습니다. 내일 다시 시도해주세요."
 
@@ -78,24 +167,19 @@ def get_refined_caption_with_gemini(original_caption, file_info):
     prompt = set_prompt(original_caption, file_info)
 
     estimated_input_tokens = len(prompt.split()) * 2
-    if (
-        usage.input_tokens + usage.output_tokens + estimated_input_tokens
-        >= DAILY_TOKEN_LIMIT
-    ):
+    if not has_budget(estimated_input_tokens):
         print("예상 토큰 사용량으로 인해 일일 제한에 도달했습니다.")
         return "일일 토큰 사용량 제한에 도달했습니다. 내일 다시 시도해주세요."
 
     try:
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = get_gemini_model()
         response = model.generate_content(prompt)
         refined_caption = response.text
 
-        usage.input_tokens += estimated_input_tokens
-        usage.output_tokens += len(refined_caption.split()) * 2
-        usage.save()
+        record_usage(estimated_input_tokens, len(refined_caption.split()) * 2)
 
         # 토큰 사용량 출력
-        current_total = usage.input_tokens + usage.output_tokens
+        current_total = get_today_usage()
         remaining_tokens = DAILY_TOKEN_LIMIT - current_total
         print(f"현재 Gemini 토큰 사용량: {current_total} / {DAILY_TOKEN_LIMIT}")
         print(f"남은 토큰: {remaining_tokens}")
@@ -106,28 +190,9 @@ def get_refined_caption_with_gemini(original_caption, file_info):
         return f"LLM API 호출 실패: {e}"
 
 
-# --- LLM 연동 및 토큰 사용량 체크 함수 (ChatGPT) ---
-def get_refined_caption_with_chatgpt(original_caption, file_info):
-    today = timezone.localdate()
-    usage, _ = DailyTokenUsage.objects.get_or_create(date=today)
-
-    # ChatGPT는 토큰 사용량을 좀 더 정확하게 계산할 수 있지만, 여기서는 간략하게 처리합니다.
-    estimated_tokens = 200  # 예시로 고정값 사용
-
-    if usage.input_tokens + usage.output_tokens + estimated_tokens >= DAILY_TOKEN_LIMIT:
-        print("토큰 사용량이 일일 제한에 도달했습니다.")
-        return "일일 토큰 사용량 제한에 도달했습니다. 내일 다시 시도해주세요."
-
-    # 프롬프트 생성 함수 호출
-    prompt = set_test_prompt(original_caption, file_info)
-
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """
+# --- ChatGPT 요청 메시지 (동기/비동기 뷰가 함께 사용) ---
+CHATGPT_MODEL = "gpt-4o"
+CHATGPT_SYSTEM_PROMPT = """
                     You are a guide who warmly and vividly describes photos for visually impaired people.
                     Using the information below, write 1–3 sentences that, based on the visual background, include vivid details of people/animals’ actions, atmosphere, and emotions.
                     Save as Korean.
@@ -143,21 +208,41 @@ def get_refined_caption_with_chatgpt(original_caption, file_info):
 
                     Output example:
                     “{Start with mood/atmosphere} {Describe people and actions}, {Describe background}. {End with an emotional touch}”
-                    """,
-                },
-                {"role": "user", "content": prompt},
-            ],
+                    """
+
+
+def chatgpt_messages(prompt):
+    return [
+        {"role": "system", "content": CHATGPT_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+# --- LLM 연동 및 토큰 사용량 체크 함수 (ChatGPT) ---
+def get_refined_caption_with_chatgpt(original_caption, file_info):
+    # ChatGPT는 토큰 사용량을 좀 더 정확하게 계산할 수 있지만, 여기서는 간략하게 처리합니다.
+    estimated_tokens = 200  # 예시로 고정값 사용
+
+    if not has_budget(estimated_tokens):
+        print("토큰 사용량이 일일 제한에 도달했습니다.")
+        return "일일 토큰 사용량 제한에 도달했습니다. 내일 다시 시도해주세요."
+
+    # 프롬프트 생성 함수 호출
+    prompt = set_test_prompt(original_caption, file_info)
+
+    try:
+        response = get_chatgpt_client().chat.completions.create(
+            model=CHATGPT_MODEL,
+            messages=chatgpt_messages(prompt),
             temperature=0.2,  # 낮은 온도로 일관성 있는 답변 유도
         )
         refined_caption = response.choices[0].message.content
 
         # 실제 토큰 사용량 업데이트 (API 응답에서 토큰 정보를 가져올 수 있습니다)
-        usage.input_tokens += response.usage.prompt_tokens
-        usage.output_tokens += response.usage.completion_tokens
-        usage.save()
+        record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
 
         # 토큰 사용량 출력
-        current_total = usage.input_tokens + usage.output_tokens
+        current_total = get_today_usage()
         remaining_tokens = DAILY_TOKEN_LIMIT - current_total
         print(f"현재 ChatGPT 토큰 사용량: {current_total} / {DAILY_TOKEN_LIMIT}")
         print(f"남은 토큰: {remaining_tokens}")
@@ -168,6 +253,41 @@ def get_refined_caption_with_chatgpt(original_caption, file_info):
         return f"ChatGPT API 호출 실패: {e}"
 
 
+async def get_refined_caption_with_chatgpt_async(original_caption, file_info):
+    """
+    get_refined_caption_with_chatgpt의 비동기 버전입니다.
+    LLM 응답을 기다리는 동안 워커(이벤트 루프)가 다른 요청을 처리할 수 있습니다.
+    """
+    estimated_tokens = 200  # 예시로 고정값 사용
+
+    if not await sync_to_async(has_budget)(estimated_tokens):
+        print("토큰 사용량이 일일 제한에 도달했습니다.")
+        return "일일 토큰 사용량 제한에 도달했습니다. 내일 다시 시도해주세요."
+
+    prompt = set_test_prompt(original_caption, file_info)
+
+    try:
+        response = await get_async_chatgpt_client().chat.completions.create(
+            model=CHATGPT_MODEL,
+            messages=chatgpt_messages(prompt),
+            temperature=0.2,
+        )
+        refined_caption = response.choices[0].message.content
+
+        await sync_to_async(record_usage)(
+            response.usage.prompt_tokens, response.usage.completion_tokens
+        )
+
+        current_total = await sync_to_async(get_today_usage)()
+        print(f"현재 ChatGPT 토큰 사용량: {current_total} / {DAILY_TOKEN_LIMIT}")
+        print(f"남은 토큰: {DAILY_TOKEN_LIMIT - current_total}")
+
+        return refined_caption
+    except Exception as e:
+        print(f"Error calling ChatGPT API: {e}")
+        return f"ChatGPT API 호출 실패: {e}"
+
+
 class ImageCaptioningView(APIView):
     def post(self, request, *args, **kwargs):
         file = request.FILES.get("file")
@@ -182,15 +302,36 @@ class ImageCaptioningView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        quality = request.data.get("quality")
+        if invalid_quality(quality):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": f"quality must be one of {', '.join(QUALITY_CHOICES)}",
+                    "data": {},
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # --- 사용할 LLM을 선택합니다. ("gemini" 또는 "chatgpt") ---
         llm_choice = "chatgpt"
+        # LLM을 호출할 수 없으면 BLIP 추론을 실행하기 전에 거절합니다.
+        if llm_choice == "chatgpt" and not chatgpt_api_key:
+            return Response(
+                {
+                    "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "message": "ChatGPT API key is not configured.",
+                    "data": {},
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
         try:
             # 파일을 한 번만 읽어 변수에 저장합니다.
             image_data = file.read()
 
             # 이제 파일 객체 대신 `image_data`를 전달합니다.
-            analysis_result = image_captioner.analyze_image(image_data)
+            analysis_result = analyze_image(image_data, quality)
 
             blip_text = analysis_result.get("file_description", "캡션 생성 실패")
 
@@ -228,15 +369,6 @@ class ImageCaptioningView(APIView):
                 file_info,
             )
         elif llm_choice == "chatgpt":
-            if not openai.api_key:
-                return Response(
-                    {
-                        "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        "message": "ChatGPT API key is not configured.",
-                        "data": {},
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
             refined_caption = get_refined_caption_with_chatgpt(
                 analysis_result, file_info
             )
@@ -268,7 +400,7 @@ class ImageCaptioningView(APIView):
                 {
                     "status": status.HTTP_201_CREATED,
                     "message": "Captioning successful",
-                    "data": serializer.data,
+                    "data": {**serializer.data, "model_tier": analysis_result["model_tier"]},
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -281,3 +413,82 @@ class ImageCaptioningView(APIView):
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+
+def _json_response(status_code, message, data=None):
+    return JsonResponse(
+        {"status": status_code, "message": message, "data": data or {}},
+        status=status_code,
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+def _save_caption(data_to_save):
+    serializer = ImageSerializer(data=data_to_save)
+    if serializer.is_valid():
+        serializer.save()
+        return True, serializer.data
+    return False, serializer.errors
+
+
+class AsyncImageCaptioningView(View):
+    """
+    ImageCaptioningView의 비동기 버전입니다. (ASGI 서버에서 실행)
+
+    BLIP 추론은 추론 전용 스레드 풀로, LLM 호출은 AsyncOpenAI로 처리하므로
+    요청 하나가 추론과 LLM 응답을 기다리는 동안 워커를 점유하지 않습니다.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        file = request.FILES.get("file")
+        if not file:
+            return _json_response(
+                status.HTTP_400_BAD_REQUEST, "File or file information is missing"
+            )
+        quality = request.POST.get("quality")
+        if invalid_quality(quality):
+            return _json_response(
+                status.HTTP_400_BAD_REQUEST,
+                f"quality must be one of {', '.join(QUALITY_CHOICES)}",
+            )
+        # LLM을 호출할 수 없으면 BLIP 추론(추론 스레드 풀 점유)을 시작하기 전에 거절합니다.
+        if get_async_chatgpt_client() is None:
+            return _json_response(
+                status.HTTP_500_INTERNAL_SERVER_ERROR, "ChatGPT API key is not configured."
+            )
+
+        try:
+            image_data = file.read()
+            analysis_result = await analyze_image_async(image_data, quality)
+            blip_text = analysis_result.get("file_description", "캡션 생성 실패")
+        except OSError as e:
+            print(f"WARNING: An OSError occurred. The file may be truncated: {e}")
+            return _json_response(
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "파일 분석 중 오류 발생: 파일이 손상되었을 수 있습니다.",
+            )
+        except Exception as e:
+            print(f"Error analyzing file with new model: {e}")
+            return _json_response(
+                status.HTTP_500_INTERNAL_SERVER_ERROR, f"파일 분석 중 오류 발생: {e}"
+            )
+
+        file_info = request.POST.get("file_info", "사용자 음성 없음")
+        refined_caption = await get_refined_caption_with_chatgpt_async(
+            analysis_result, file_info
+        )
+
+        data_to_save = {
+            "file": file.name,
+            "refined_caption": refined_caption,
+            "blip_text": blip_text,
+            "file_info": file_info,
+            "latitude": request.POST.get("latitude"),
+            "longitude": request.POST.get("longitude"),
+            "location": request.POST.get("location"),
+        }
+        saved, data = await sync_to_async(_save_caption)(data_to_save)
+        if saved:
+            data = {**data, "model_tier": analysis_result["model_tier"]}
+            return _json_response(status.HTTP_201_CREATED, "Captioning successful", data)
+        return _json_response(status.HTTP_400_BAD_REQUEST, "Invalid data", data)